@@ -12,9 +12,14 @@ ARES_REQUEST_TIMEOUT = 15  # seconds
 ARES_DEFAULT_PAGE_SIZE = 10
 ARES_MAX_PAGE_SIZE = 100
 
+# Batch detail lookup: ICOs per request; misses are fetched from ARES in
+# search calls of ARES_MAX_PAGE_SIZE ICOs each.
+ARES_BATCH_MAX_ICOS = 1000
+
 # Cache TTLs
 ARES_SEARCH_CACHE_TTL = 900   # 15 minutes
 ARES_DETAIL_CACHE_TTL = 3600  # 1 hour
+ARES_MISSING_CACHE_TTL = 300  # 5 minutes — ICOs ARES did not find (batch lookup)
 
 # DB freshness: records older than this trigger background refresh
 ARES_DB_FRESHNESS_TTL = timedelta(hours=24)
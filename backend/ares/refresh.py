@@ -0,0 +1,135 @@
+"""
+Background refresh of stale ARES records.
+
+A detail request served from a stale DB record schedules a refresh from the
+ARES API. Refreshes run on a small per-process thread pool rather than a
+thread per request, and are deduplicated twice:
+
+- within the process, an ICO already queued or running is not queued again;
+- across processes (gunicorn workers), a short-lived cache marker records
+  that some worker is refreshing the ICO.
+
+The queue is bounded (ARES_REFRESH_QUEUE_SIZE); refreshes past it are
+dropped — the next stale hit schedules them again. Outcomes are counted in
+the cache, shared by all workers (refresh_metrics()).
+"""
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# How long an in-flight marker outlives a refresh that never cleans up
+# (e.g. the worker was killed mid-request).
+IN_FLIGHT_TIMEOUT = 120
+
+QUEUED = "queued"
+DONE = "done"
+DROPPED = "dropped"
+THROTTLED = "throttled"
+FAILED = "failed"
+METRICS = (QUEUED, DONE, DROPPED, THROTTLED, FAILED)
+
+
+class RefreshExecutor:
+    """
+    Bounded, deduplicating executor for background refreshes.
+
+    `refresh(ico)` callables return True when the record was refreshed and
+    False when the outbound throttle did not allow it.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    def schedule(self, ico: str, refresh: Callable[[str], bool]) -> bool:
+        """
+        Queue a refresh of `ico` unless one is already pending here or in
+        another process, or the queue is full.
+
+        Returns True if the refresh was queued.
+        """
+        with self._lock:
+            if ico in self._pending:
+                return False
+            if len(self._pending) >= self.max_queue:
+                _count(DROPPED)
+                logger.info("ARES refresh queue full, dropped %s", ico)
+                return False
+            if not cache.add(_in_flight_key(ico), 1, IN_FLIGHT_TIMEOUT):
+                return False
+            self._pending.add(ico)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ares-refresh"
+                )
+        _count(QUEUED)
+        self._pool.submit(self._run, ico, refresh)
+        return True
+
+    def queue_depth(self) -> int:
+        """Refreshes queued or running in this process."""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self, ico: str, refresh: Callable[[str], bool]) -> None:
+        try:
+            _count(DONE if refresh(ico) else THROTTLED)
+        except Exception:
+            _count(FAILED)
+            logger.warning("Background refresh failed for %s", ico, exc_info=True)
+        finally:
+            cache.delete(_in_flight_key(ico))
+            with self._lock:
+                self._pending.discard(ico)
+            close_old_connections()
+
+
+_executor: RefreshExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> RefreshExecutor:
+    """The process-wide refresh executor."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = RefreshExecutor(
+                max_workers=settings.ARES_REFRESH_WORKERS,
+                max_queue=settings.ARES_REFRESH_QUEUE_SIZE,
+            )
+        return _executor
+
+
+def refresh_metrics() -> dict:
+    """Refresh outcome counts across all processes, plus this process's queue depth."""
+    counts = cache.get_many([_metric_key(name) for name in METRICS])
+    metrics = {name: counts.get(_metric_key(name), 0) for name in METRICS}
+    metrics["queueDepth"] = get_executor().queue_depth()
+    return metrics
+
+
+def _count(name: str) -> None:
+    key = _metric_key(name)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def _in_flight_key(ico: str) -> str:
+    return f"ares:refresh:{ico}"
+
+
+def _metric_key(name: str) -> str:
+    return f"ares:refresh:metrics:{name}"
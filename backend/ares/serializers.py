@@ -4,6 +4,8 @@ Field names use camelCase to match the TypeScript entity types exactly.
 """
 from rest_framework import serializers
 
+from .constants import ARES_BATCH_MAX_ICOS
+
 
 # --- Input serializers (request validation) ---
 
@@ -30,6 +32,14 @@ class SearchRequestSerializer(serializers.Serializer):
     location = SearchLocationSerializer(required=False)
 
 
+class BatchRequestSerializer(serializers.Serializer):
+    icos = serializers.ListField(
+        child=serializers.RegexField(r"^\d{1,8}$"),
+        min_length=1,
+        max_length=ARES_BATCH_MAX_ICOS,
+    )
+
+
 # --- Output serializers (response shape) ---
 
 
@@ -149,3 +159,13 @@ class EconomicSubjectSerializer(serializers.Serializer):
 class AresSearchResultSerializer(serializers.Serializer):
     totalCount = serializers.IntegerField()
     economicSubjects = EconomicSubjectSerializer(many=True)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    ico = serializers.CharField()
+    economicSubject = EconomicSubjectSerializer(allow_null=True)
+    pending = serializers.BooleanField()
+
+
+class AresBatchResultSerializer(serializers.Serializer):
+    results = BatchItemSerializer(many=True)
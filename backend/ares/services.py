@@ -4,7 +4,6 @@ Pattern: validate -> L1 Redis -> L2 DB -> throttle -> L3 API -> persist -> cache
 """
 import logging
 import re
-import threading
 
 from django.utils import timezone
 
@@ -12,9 +11,16 @@ from core.exceptions import ExternalAPIError
 from core.services.cache import CacheService
 from core.throttles import GlobalOutboundThrottle
 from .client import AresClient, ares_client
-from .constants import ARES_DETAIL_CACHE_TTL, ARES_SEARCH_CACHE_TTL, ARES_DB_FRESHNESS_TTL
+from .constants import (
+    ARES_DB_FRESHNESS_TTL,
+    ARES_DETAIL_CACHE_TTL,
+    ARES_MAX_PAGE_SIZE,
+    ARES_MISSING_CACHE_TTL,
+    ARES_SEARCH_CACHE_TTL,
+)
 from .models import EconomicSubject
 from .parser import parse_economic_subject, parse_search_result, to_search_request
+from .refresh import get_executor
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +43,15 @@ class AresService:
 
     def search(self, params: dict) -> dict:
         request_body = to_search_request(params)
-        cache_hash = self.cache.hash_params(request_body)
-
-        cached = self.cache.get("search", cache_hash)
-        if cached is not None:
-            return cached
+        return self.cache.get_or_compute(
+            lambda: self._search_api(request_body),
+            "search",
+            self.cache.hash_params(request_body),
+            ttl=ARES_SEARCH_CACHE_TTL,
+        )
 
+    def _search_api(self, request_body: dict) -> dict:
+        """Run a search against ARES; seeds the detail cache and the DB."""
         if not self.outbound_throttle.allow():
             raise ExternalAPIError(
                 "ARES rate limit reached. Please try again in a minute.",
@@ -53,8 +62,6 @@ class AresService:
         raw = self.client.search(request_body)
         result = parse_search_result(raw)
 
-        self.cache.set(result, "search", cache_hash, ttl=ARES_SEARCH_CACHE_TTL)
-
         for subject in result.get("economicSubjects", []):
             ico_id = subject.get("icoId")
             if ico_id:
@@ -78,11 +85,16 @@ class AresService:
                 "ICO must be 8 digits.", status_code=400, service_name="ares"
             )
 
-        # L1: Redis hot cache
-        cached = self.cache.get("detail", normalized)
-        if cached is not None:
-            return cached
+        # L1: Redis hot cache; concurrent misses are coalesced into one lookup
+        return self.cache.get_or_compute(
+            lambda: self._load_detail(normalized),
+            "detail",
+            normalized,
+            ttl=ARES_DETAIL_CACHE_TTL,
+        )
 
+    def _load_detail(self, normalized: str) -> dict:
+        """L2 (DB) then L3 (ARES API) lookup for a Redis miss."""
         # L2: DB persistent cache
         db_record = EconomicSubject.objects.filter(
             ico=normalized,
@@ -90,7 +102,6 @@ class AresService:
 
         if db_record and db_record.raw_data:
             result = parse_economic_subject(db_record.raw_data)
-            self.cache.set(result, "detail", normalized, ttl=ARES_DETAIL_CACHE_TTL)
 
             # If stale, trigger non-blocking background refresh
             if self._is_stale(db_record):
@@ -108,12 +119,97 @@ class AresService:
 
         raw = self.client.get_by_ico(normalized)
         result = parse_economic_subject(raw)
-
-        self.cache.set(result, "detail", normalized, ttl=ARES_DETAIL_CACHE_TTL)
         self._persist_detail(normalized, result, raw)
 
         return result
 
+    # ── get_many — batched 3-tier lookup ──────────────────────
+
+    def get_many(self, icos: list[str]) -> list[dict]:
+        """
+        Details of several ICOs, in request order.
+
+        Each tier is queried once for all remaining ICOs: one Redis MGET, one
+        `ico__in` DB query, then ARES searches filtered by ICO list (up to
+        ARES_MAX_PAGE_SIZE per call, each taking an outbound throttle slot).
+        ICOs ARES did not find are remembered for ARES_MISSING_CACHE_TTL and
+        not searched again meanwhile. Once the throttle is exhausted no more
+        searches are made; the ICOs left are returned as pending.
+
+        Returns:
+            [{"ico": ..., "economicSubject": dict | None, "pending": bool}, ...]
+            — one item per distinct ICO; economicSubject is None when ARES does
+            not know the ICO, or, with pending set, when it was not asked yet.
+        """
+        normalized = list(dict.fromkeys(ico.zfill(8) for ico in icos))
+        invalid = [ico for ico in normalized if not re.match(r"^\d{8}$", ico)]
+        if invalid:
+            raise ExternalAPIError(
+                f"ICO must be 8 digits: {', '.join(invalid)}",
+                status_code=400,
+                service_name="ares",
+            )
+
+        # L1: Redis, one MGET
+        found = self.cache.get_many("detail", normalized)
+
+        # L2: DB, one query
+        misses = [ico for ico in normalized if ico not in found]
+        if misses:
+            from_db = self._load_many_from_db(misses)
+            self.cache.set_many("detail", from_db, ttl=ARES_DETAIL_CACHE_TTL)
+            found.update(from_db)
+
+        # L3: ARES search by ICO list, in chunks, skipping recent not-founds
+        misses = [ico for ico in normalized if ico not in found]
+        if misses:
+            missing = self.cache.get_many("missing", misses)
+            misses = [ico for ico in misses if ico not in missing]
+        pending = set()
+        for start in range(0, len(misses), ARES_MAX_PAGE_SIZE):
+            if not self.outbound_throttle.allow():
+                pending.update(misses[start:])
+                logger.info("ARES rate limit reached; %d ICOs left pending", len(pending))
+                break
+            chunk = misses[start : start + ARES_MAX_PAGE_SIZE]
+            from_api = self._search_icos(chunk)
+            self.cache.set_many("detail", from_api, ttl=ARES_DETAIL_CACHE_TTL)
+            self.cache.set_many(
+                "missing",
+                {ico: True for ico in chunk if ico not in from_api},
+                ttl=ARES_MISSING_CACHE_TTL,
+            )
+            found.update(from_api)
+
+        return [
+            {"ico": ico, "economicSubject": found.get(ico), "pending": ico in pending}
+            for ico in normalized
+        ]
+
+    def _load_many_from_db(self, icos: list[str]) -> dict[str, dict]:
+        """L2 for get_many; schedules background refreshes of stale records."""
+        found = {}
+        for record in EconomicSubject.objects.filter(ico__in=icos).exclude(raw_data={}):
+            found[record.ico] = parse_economic_subject(record.raw_data)
+            if self._is_stale(record):
+                self._schedule_background_refresh(record.ico)
+        return found
+
+    def _search_icos(self, icos: list[str]) -> dict[str, dict]:
+        """
+        L3 for get_many: one ARES search for up to ARES_MAX_PAGE_SIZE ICOs.
+
+        The caller takes the outbound throttle slot.
+        """
+        raw = self.client.search({"ico": icos, "start": 0, "pocet": len(icos)})
+        result = parse_search_result(raw)
+        self._persist_search_results(result, raw.get("ekonomickeSubjekty", []))
+        return {
+            subject["icoId"].zfill(8): subject
+            for subject in result["economicSubjects"]
+            if subject.get("icoId")
+        }
+
     # ── freshness ─────────────────────────────────────────────
 
     def _is_stale(self, record: EconomicSubject) -> bool:
@@ -125,23 +221,23 @@ class AresService:
     # ── background refresh ────────────────────────────────────
 
     def _schedule_background_refresh(self, ico: str) -> None:
-        """Spawn a daemon thread to refresh stale ARES data without blocking."""
-        thread = threading.Thread(
-            target=self._refresh_from_api, args=(ico,), daemon=True,
-        )
-        thread.start()
+        """Queue a non-blocking refresh of stale ARES data (see ares.refresh)."""
+        get_executor().schedule(ico, self._refresh_from_api)
 
-    def _refresh_from_api(self, ico: str) -> None:
-        """Background thread: fetch fresh data and update DB + Redis."""
-        try:
-            if not self.outbound_throttle.allow():
-                return  # Don't block on rate limit in background
-            raw = self.client.get_by_ico(ico)
-            result = parse_economic_subject(raw)
-            self.cache.set(result, "detail", ico, ttl=ARES_DETAIL_CACHE_TTL)
-            self._persist_detail(ico, result, raw)
-        except Exception:
-            logger.warning("Background refresh failed for %s", ico, exc_info=True)
+    def _refresh_from_api(self, ico: str) -> bool:
+        """
+        Background worker: fetch fresh data and update DB + Redis.
+
+        Returns False without calling ARES if the outbound throttle is
+        exhausted; errors propagate to the executor, which logs them.
+        """
+        if not self.outbound_throttle.allow():
+            return False  # Don't block on rate limit in background
+        raw = self.client.get_by_ico(ico)
+        result = parse_economic_subject(raw)
+        self.cache.set(result, "detail", ico, ttl=ARES_DETAIL_CACHE_TTL)
+        self._persist_detail(ico, result, raw)
+        return True
 
     # ── persistence ───────────────────────────────────────────
 
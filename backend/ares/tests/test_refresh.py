@@ -0,0 +1,117 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+
+from ares.refresh import RefreshExecutor, _in_flight_key, refresh_metrics
+from ares.services import AresService
+
+
+def _drain(executor):
+    executor._pool.shutdown(wait=True)
+    executor._pool = None
+
+
+def _blocking_refresh():
+    release = threading.Event()
+    calls = []
+
+    def refresh(ico):
+        calls.append(ico)
+        release.wait(5)
+        return True
+
+    return refresh, release, calls
+
+
+class TestRefreshExecutor:
+    def test_runs_refresh_and_counts_done(self):
+        executor = RefreshExecutor(max_workers=2, max_queue=10)
+        refresh = MagicMock(return_value=True)
+
+        assert executor.schedule("27082440", refresh) is True
+        _drain(executor)
+
+        refresh.assert_called_once_with("27082440")
+        metrics = refresh_metrics()
+        assert metrics["queued"] == 1
+        assert metrics["done"] == 1
+        assert executor.queue_depth() == 0
+        assert cache.get(_in_flight_key("27082440")) is None
+
+    def test_pending_ico_is_not_queued_twice(self):
+        executor = RefreshExecutor(max_workers=2, max_queue=10)
+        refresh, release, calls = _blocking_refresh()
+
+        assert executor.schedule("27082440", refresh) is True
+        assert executor.schedule("27082440", refresh) is False
+        release.set()
+        _drain(executor)
+
+        assert calls == ["27082440"]
+        assert refresh_metrics()["queued"] == 1
+
+    def test_refresh_in_flight_in_another_process_is_skipped(self):
+        executor = RefreshExecutor(max_workers=2, max_queue=10)
+        cache.add(_in_flight_key("27082440"), 1, 60)
+        refresh = MagicMock(return_value=True)
+
+        assert executor.schedule("27082440", refresh) is False
+        refresh.assert_not_called()
+
+    def test_full_queue_drops_refresh(self):
+        executor = RefreshExecutor(max_workers=1, max_queue=1)
+        refresh, release, calls = _blocking_refresh()
+
+        assert executor.schedule("27082440", refresh) is True
+        assert executor.schedule("00000001", refresh) is False
+        release.set()
+        _drain(executor)
+
+        assert calls == ["27082440"]
+        assert refresh_metrics()["dropped"] == 1
+        # The dropped ICO was never marked in flight, so it can be retried.
+        assert cache.get(_in_flight_key("00000001")) is None
+
+    def test_throttled_and_failed_refreshes_are_counted(self):
+        executor = RefreshExecutor(max_workers=2, max_queue=10)
+
+        executor.schedule("00000001", MagicMock(return_value=False))
+        executor.schedule("00000002", MagicMock(side_effect=RuntimeError("boom")))
+        _drain(executor)
+
+        metrics = refresh_metrics()
+        assert metrics["throttled"] == 1
+        assert metrics["failed"] == 1
+        assert cache.get(_in_flight_key("00000002")) is None
+        assert executor.queue_depth() == 0
+
+
+class TestAresServiceRefresh:
+    def test_stale_hit_schedules_on_shared_executor(self):
+        service = AresService(client=MagicMock())
+        executor = MagicMock()
+
+        with patch("ares.services.get_executor", return_value=executor):
+            service._schedule_background_refresh("27082440")
+
+        executor.schedule.assert_called_once_with("27082440", service._refresh_from_api)
+
+    def test_refresh_reports_throttle_without_calling_ares(self):
+        client = MagicMock()
+        service = AresService(client=client)
+
+        with patch.object(service.outbound_throttle, "allow", return_value=False):
+            assert service._refresh_from_api("27082440") is False
+
+        client.get_by_ico.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_refresh_updates_cache(self):
+        client = MagicMock()
+        client.get_by_ico.return_value = {"ico": "27082440", "obchodniJmeno": "Alza.cz a.s."}
+        service = AresService(client=client)
+
+        assert service._refresh_from_api("27082440") is True
+        assert service.cache.get("detail", "27082440") is not None
@@ -7,6 +7,7 @@ from django.utils import timezone
 from company.models import Company
 from core.exceptions import ExternalAPIError
 from ares.models import EconomicSubject
+from ares.parser import parse_economic_subject
 from ares.services import AresService
 
 
@@ -333,3 +334,140 @@ class TestAresSearchPersistence:
 
         company = Company.objects.get(ico="27082440")
         assert company.name == "Full Detail Name"  # NOT overwritten by search summary
+
+
+def _raw_subject(ico, name):
+    return {"ico": ico, "icoId": ico, "obchodniJmeno": name}
+
+
+@pytest.mark.django_db
+class TestAresServiceGetMany:
+    def test_results_follow_request_order_across_tiers(self):
+        mock_client = MagicMock()
+        mock_client.search.return_value = {
+            "pocetCelkem": 1,
+            "ekonomickeSubjekty": [_raw_subject("00000003", "API s.r.o.")],
+        }
+        service = AresService(client=mock_client)
+        service.cache.set(
+            parse_economic_subject(_raw_subject("00000001", "Cache s.r.o.")),
+            "detail",
+            "00000001",
+        )
+        EconomicSubject.objects.create(
+            ico="00000002",
+            business_name="DB s.r.o.",
+            raw_data=_raw_subject("00000002", "DB s.r.o."),
+        )
+
+        results = service.get_many(["3", "00000002", "99999999", "00000001", "00000002"])
+
+        assert [r["ico"] for r in results] == ["00000003", "00000002", "99999999", "00000001"]
+        names = [
+            r["economicSubject"]["records"][0]["businessName"] if r["economicSubject"] else None
+            for r in results
+        ]
+        assert names == ["API s.r.o.", "DB s.r.o.", None, "Cache s.r.o."]
+        # Only the ICOs missing from cache and DB went to ARES, in one call.
+        mock_client.search.assert_called_once_with(
+            {"ico": ["00000003", "99999999"], "start": 0, "pocet": 2}
+        )
+        mock_client.get_by_ico.assert_not_called()
+
+    def test_each_tier_is_queried_once(self, django_assert_num_queries):
+        mock_client = MagicMock()
+        service = AresService(client=mock_client)
+        for i in range(1, 6):
+            ico = f"{i:08d}"
+            EconomicSubject.objects.create(
+                ico=ico, business_name=f"Firma {i}", raw_data=_raw_subject(ico, f"Firma {i}")
+            )
+
+        with django_assert_num_queries(1):
+            results = service.get_many([f"{i:08d}" for i in range(1, 6)])
+
+        assert all(r["economicSubject"] for r in results)
+        mock_client.search.assert_not_called()
+        # The DB hits were cached: the second batch needs no query.
+        with django_assert_num_queries(0):
+            service.get_many([f"{i:08d}" for i in range(1, 6)])
+
+    def test_misses_are_fetched_in_chunks_and_persisted(self):
+        mock_client = MagicMock()
+        mock_client.search.side_effect = lambda body: {
+            "pocetCelkem": len(body["ico"]),
+            "ekonomickeSubjekty": [_raw_subject(ico, f"Firma {ico}") for ico in body["ico"]],
+        }
+        service = AresService(client=mock_client)
+
+        results = service.get_many([f"{i:08d}" for i in range(1, 151)])
+
+        assert len(results) == 150
+        assert [len(call.args[0]["ico"]) for call in mock_client.search.call_args_list] == [100, 50]
+        assert EconomicSubject.objects.count() == 150
+
+    def test_stale_db_records_schedule_refresh(self):
+        EconomicSubject.objects.create(
+            ico="27082440", business_name="Alza.cz a.s.", raw_data=MOCK_DETAIL_RESPONSE
+        )
+        EconomicSubject.objects.update(updated_at=timezone.now() - timedelta(hours=25))
+        service = AresService(client=MagicMock())
+
+        with patch.object(service, "_schedule_background_refresh") as mock_refresh:
+            service.get_many(["27082440"])
+
+        mock_refresh.assert_called_once_with("27082440")
+
+    def test_throttle_leaves_remaining_icos_pending(self):
+        """Hits and chunks already fetched are returned; the rest is pending."""
+        mock_client = MagicMock()
+        mock_client.search.side_effect = lambda body: {
+            "pocetCelkem": len(body["ico"]),
+            "ekonomickeSubjekty": [_raw_subject(ico, f"Firma {ico}") for ico in body["ico"]],
+        }
+        service = AresService(client=mock_client)
+        EconomicSubject.objects.create(
+            ico="99999999", business_name="DB s.r.o.", raw_data=_raw_subject("99999999", "DB")
+        )
+        icos = ["99999999", *(f"{i:08d}" for i in range(1, 151))]
+
+        with patch.object(service.outbound_throttle, "allow", side_effect=[True, False]):
+            results = service.get_many(icos)
+
+        assert mock_client.search.call_count == 1
+        resolved = [r["ico"] for r in results if r["economicSubject"]]
+        pending = [r["ico"] for r in results if r["pending"]]
+        assert resolved == icos[:101]
+        assert pending == icos[101:]
+        assert not any(r["economicSubject"] for r in results if r["pending"])
+
+    def test_throttled_batch_does_not_raise(self):
+        service = AresService(client=MagicMock())
+
+        with patch.object(service.outbound_throttle, "allow", return_value=False):
+            results = service.get_many(["27082440"])
+
+        assert results == [{"ico": "27082440", "economicSubject": None, "pending": True}]
+        service.client.search.assert_not_called()
+
+    def test_unknown_icos_are_not_searched_again(self):
+        """An ICO ARES did not find is remembered and costs no throttle slot."""
+        mock_client = MagicMock()
+        mock_client.search.return_value = {"pocetCelkem": 0, "ekonomickeSubjekty": []}
+        service = AresService(client=mock_client)
+
+        first = service.get_many(["99999999"])
+        with patch.object(service.outbound_throttle, "allow") as mock_allow:
+            second = service.get_many(["99999999"])
+
+        assert first == second == [{"ico": "99999999", "economicSubject": None, "pending": False}]
+        mock_client.search.assert_called_once()
+        mock_allow.assert_not_called()
+
+    def test_invalid_ico_rejected(self):
+        service = AresService(client=MagicMock())
+
+        with pytest.raises(ExternalAPIError) as exc_info:
+            service.get_many(["27082440", "12ab"])
+
+        assert exc_info.value.status_code == 400
@@ -128,3 +128,42 @@ class TestAresSubjectDetailView:
 
         assert response.status_code == 404
         assert response.data["error"] == "Economic subject not found"
+
+
+@pytest.mark.django_db
+class TestAresSubjectBatchView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/v1/ares/subjects/batch/"
+
+    @patch("ares.views.AresService")
+    def test_batch_success(self, MockService):
+        MockService.return_value.get_many.return_value = [
+            {"ico": "27082440", "economicSubject": MOCK_DETAIL_RESULT, "pending": False},
+            {"ico": "99999999", "economicSubject": None, "pending": False},
+            {"ico": "00000001", "economicSubject": None, "pending": True},
+        ]
+
+        response = self.client.post(
+            self.url, {"icos": ["27082440", "99999999", "00000001"]}, format="json"
+        )
+
+        assert response.status_code == 200
+        MockService.return_value.get_many.assert_called_once_with(
+            ["27082440", "99999999", "00000001"]
+        )
+        assert [r["ico"] for r in response.data["results"]] == [
+            "27082440", "99999999", "00000001",
+        ]
+        assert response.data["results"][0]["economicSubject"]["icoId"] == "27082440"
+        assert response.data["results"][1]["economicSubject"] is None
+        assert [r["pending"] for r in response.data["results"]] == [False, False, True]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [{}, {"icos": []}, {"icos": ["12ab"]}, {"icos": ["1"] * 1001}],
+    )
+    def test_batch_invalid_request(self, payload):
+        response = self.client.post(self.url, payload, format="json")
+
+        assert response.status_code == 400
@@ -6,6 +6,11 @@ app_name = "ares"
 
 urlpatterns = [
     path("search/", views.AresSearchView.as_view(), name="search"),
+    path(
+        "subjects/batch/",
+        views.AresSubjectBatchView.as_view(),
+        name="subject-batch",
+    ),
     path(
         "subjects/<str:ico>/",
         views.AresSubjectDetailView.as_view(),
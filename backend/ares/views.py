@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .serializers import (
+    AresBatchResultSerializer,
+    BatchRequestSerializer,
     EconomicSubjectSerializer,
     SearchRequestSerializer,
     AresSearchResultSerializer,
@@ -59,3 +61,36 @@ class AresSubjectDetailView(APIView):
         result = service.get_by_ico(ico)
 
         return Response(EconomicSubjectSerializer(result).data)
+
+
+class AresSubjectBatchView(APIView):
+    @extend_schema(
+        tags=["ARES"],
+        summary="Get ARES subjects by a list of ICOs",
+        description=(
+            "Retrieve the details of up to 1000 economic subjects at once. "
+            "Results follow the order of the requested ICOs (duplicates are "
+            "returned once); economicSubject is null for ICOs unknown to ARES. "
+            "Uses the same 3-tier cache as the single-subject endpoint, with "
+            "ARES itself queried for at most 100 ICOs per call. When the ARES "
+            "rate limit is reached, the ICOs not looked up yet are returned "
+            "with pending=true; request them again later."
+        ),
+        request=BatchRequestSerializer,
+        responses={200: AresBatchResultSerializer},
+        examples=[
+            OpenApiExample(
+                "Batch lookup",
+                value={"icos": ["27082440", "00027006"]},
+                request_only=True,
+            ),
+        ],
+    )
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = AresService()
+        results = service.get_many(serializer.validated_data["icos"])
+
+        return Response(AresBatchResultSerializer({"results": results}).data)
@@ -0,0 +1,85 @@
+"""
+Measure name-search latency of the Justice entity and Company hub searches.
+
+Runs the same service calls as /justice/entities/search/ and
+/companies/search/ with caching disabled, and reports median and p95.
+
+Usage:
+    python manage.py search_benchmark --name skoda
+    python manage.py search_benchmark --name skoda --match similar --runs 50
+    python manage.py search_benchmark --name skoda --unaccent --explain
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from company.models import Company
+from company.services import CompanyService
+from core.services.search import MATCH_MODES, filter_by_name, trigram_search_available
+from justice.models import Entity
+from justice.services import JusticeService
+
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class Command(BaseCommand):
+    help = "Benchmark name search latency for the Justice and Company search endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--name", required=True, help="Search text")
+        parser.add_argument(
+            "--match", choices=MATCH_MODES, default="contains", help="Match mode"
+        )
+        parser.add_argument(
+            "--unaccent", action="store_true", help="Ignore diacritics"
+        )
+        parser.add_argument(
+            "--runs", type=int, default=20, help="Timed runs per search (default: 20)"
+        )
+        parser.add_argument(
+            "--explain", action="store_true", help="Print the query plans"
+        )
+
+    def handle(self, *args, **options):
+        params = {
+            "name": options["name"],
+            "match": options["match"],
+            "unaccent": options["unaccent"],
+        }
+        self.stdout.write(
+            "Trigram search: "
+            + ("enabled" if trigram_search_available() else "not installed (icontains fallback)")
+        )
+
+        searches = [
+            (
+                "justice entities",
+                Entity,
+                lambda: JusticeService().search_entities({**params, "status": "all"}),
+            ),
+            ("companies", Company, lambda: CompanyService().search(params)),
+        ]
+        with override_settings(CACHES=NO_CACHE):
+            for label, model, search in searches:
+                search()  # warm-up
+                timings = []
+                for _ in range(options["runs"]):
+                    start = time.perf_counter()
+                    result = search()
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                self.stdout.write(
+                    f"  {label}: {result['totalCount']} matches, "
+                    f"median {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms"
+                )
+                if options["explain"]:
+                    qs = filter_by_name(
+                        model.objects.all(),
+                        params["name"],
+                        match=params["match"],
+                        unaccent=params["unaccent"],
+                    )
+                    self.stdout.write(qs.explain())
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from core.services.search import create_name_search_index, drop_name_search_index
+
+INDEX_NAME = "company_company_name_trgm"
+
+
+def create_index(apps, schema_editor):
+    create_name_search_index(schema_editor, "company_company", INDEX_NAME)
+
+
+def drop_index(apps, schema_editor):
+    drop_name_search_index(schema_editor, INDEX_NAME)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_company_employee_category_company_latest_revenue_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-17 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(models.OrderBy(models.F('latest_revenue'), descending=True, nulls_last=True), models.F('name'), models.F('id'), name='idx_company_revenue_name_id'),
+        ),
+    ]
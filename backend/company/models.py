@@ -28,6 +28,14 @@ class Company(models.Model):
                 fields=["legal_form", "region_code"],
                 name="idx_company_form_region",
             ),
+            # Search ordering; serves keyset pagination on
+            # (latest_revenue DESC NULLS LAST, name, id).
+            models.Index(
+                models.F("latest_revenue").desc(nulls_last=True),
+                "name",
+                "id",
+                name="idx_company_revenue_name_id",
+            ),
         ]
 
     def __str__(self):
@@ -1,6 +1,10 @@
 """DRF serializers for Company API. camelCase to match frontend."""
 from rest_framework import serializers
 
+from core.services.search import MATCH_MODES
+
+from .services import COMPANY_BATCH_MAX_ICOS
+
 
 class CompanySourcesSerializer(serializers.Serializer):
     justice = serializers.DictField(allow_null=True)
@@ -16,8 +20,27 @@ class CompanyDetailSerializer(serializers.Serializer):
     updatedAt = serializers.CharField()
 
 
+class CompanyBatchRequestSerializer(serializers.Serializer):
+    icos = serializers.ListField(
+        child=serializers.RegexField(r"^\d{1,8}$"),
+        min_length=1,
+        max_length=COMPANY_BATCH_MAX_ICOS,
+    )
+
+
+class CompanyBatchItemSerializer(serializers.Serializer):
+    ico = serializers.CharField()
+    company = CompanyDetailSerializer(allow_null=True)
+
+
+class CompanyBatchResultSerializer(serializers.Serializer):
+    results = CompanyBatchItemSerializer(many=True)
+
+
 class CompanySearchRequestSerializer(serializers.Serializer):
     name = serializers.CharField(required=False, allow_blank=True)
+    match = serializers.ChoiceField(choices=MATCH_MODES, required=False)
+    unaccent = serializers.BooleanField(required=False)
     ico = serializers.CharField(required=False, allow_blank=True)
     legalForm = serializers.CharField(required=False)
     regionCode = serializers.IntegerField(required=False)
@@ -28,6 +51,7 @@ class CompanySearchRequestSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=["active", "inactive", "all"], required=False)
     offset = serializers.IntegerField(required=False, min_value=0)
     limit = serializers.IntegerField(required=False, min_value=1, max_value=100)
+    cursor = serializers.CharField(required=False)
 
 
 class CompanySummarySerializer(serializers.Serializer):
@@ -44,6 +68,8 @@ class CompanySummarySerializer(serializers.Serializer):
 
 class CompanySearchResultSerializer(serializers.Serializer):
     totalCount = serializers.IntegerField()
+    totalCountExact = serializers.BooleanField(default=True)
     offset = serializers.IntegerField()
     limit = serializers.IntegerField()
+    nextCursor = serializers.CharField(allow_null=True)
     companies = CompanySummarySerializer(many=True)
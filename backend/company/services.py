@@ -3,76 +3,110 @@ Company hub business logic — unified lookup across data sources.
 """
 from core.exceptions import ExternalAPIError
 from core.services.cache import CacheService
+from core.services.counting import count_results
+from core.services.pagination import InvalidCursor, SortKey, keyset_page
+from core.services.search import filter_by_name, relevance_keys
+from ares.models import EconomicSubject
+from justice.models import Entity
 from .models import Company
 
 COMPANY_DETAIL_CACHE_TTL = 900  # 15 minutes
+COMPANY_BATCH_MAX_ICOS = 1000
+
+# Cache namespaces invalidated as a whole when a Justice sync changes data.
+CACHE_VERSIONED_NAMESPACES = ("count",)
+
+# Search result order: highest revenue first (unknown revenue last), then name.
+# Keyset pagination continues from the last (latest_revenue, name, id).
+COMPANY_SEARCH_ORDERING = (
+    SortKey("latest_revenue", descending=True, nullable=True),
+    SortKey("name"),
+    SortKey("id"),
+)
 
 
 class CompanyService:
     def __init__(self):
-        self.cache = CacheService(prefix="company", default_ttl=COMPANY_DETAIL_CACHE_TTL)
+        self.cache = CacheService(
+            prefix="company",
+            default_ttl=COMPANY_DETAIL_CACHE_TTL,
+            versioned=CACHE_VERSIONED_NAMESPACES,
+        )
 
     def get_by_ico(self, ico: str) -> dict:
         """Return unified company data from all linked sources."""
         normalized = ico.zfill(8)
+        return self.cache.get_or_compute(
+            lambda: self._build_detail(normalized),
+            "detail",
+            normalized,
+            ttl=COMPANY_DETAIL_CACHE_TTL,
+        )
 
-        cached = self.cache.get("detail", normalized)
-        if cached is not None:
-            return cached
+    def get_many(self, icos: list[str]) -> list[dict]:
+        """
+        Unified data of several companies, in request order.
 
-        try:
-            company = Company.objects.get(ico=normalized)
-        except Company.DoesNotExist:
+        Cached details are read with one MGET; the rest are built with three
+        queries in total (see _build_details) and cached with one MSET.
+
+        Returns:
+            [{"ico": ..., "company": dict | None}, ...] — one item per distinct
+            ICO; None for ICOs not in the hub.
+        """
+        normalized = list(dict.fromkeys(ico.zfill(8) for ico in icos))
+        found = self.cache.get_many("detail", normalized)
+        misses = [ico for ico in normalized if ico not in found]
+        if misses:
+            built = self._build_details(misses)
+            self.cache.set_many("detail", built, ttl=COMPANY_DETAIL_CACHE_TTL)
+            found.update(built)
+        return [{"ico": ico, "company": found.get(ico)} for ico in normalized]
+
+    def _build_detail(self, normalized: str) -> dict:
+        detail = self._build_details([normalized]).get(normalized)
+        if detail is None:
             raise ExternalAPIError(
                 "Company not found.", status_code=404, service_name="company"
             )
+        return detail
 
-        # Justice data
-        justice_entity = (
-            company.justice_entities
-            .order_by("-updated_at")
-            .first()
-        )
-        justice_data = None
-        if justice_entity:
-            justice_data = {
-                "ico": justice_entity.ico,
-                "name": justice_entity.name,
-                "legalFormCode": justice_entity.legal_form_code,
-                "legalFormName": justice_entity.legal_form_name,
-                "courtName": justice_entity.court_name,
-                "fileReference": justice_entity.file_reference,
-                "registrationDate": (
-                    justice_entity.registration_date.isoformat()
-                    if justice_entity.registration_date else None
-                ),
-                "deletionDate": (
-                    justice_entity.deletion_date.isoformat()
-                    if justice_entity.deletion_date else None
-                ),
-                "isActive": justice_entity.is_active,
-            }
-
-        # ARES data
-        ares_record = company.ares_records.first()
-        ares_data = None
-        if ares_record and ares_record.raw_data:
-            ares_data = ares_record.raw_data
-
-        result = {
-            "ico": company.ico,
-            "name": company.name,
-            "isActive": company.is_active,
-            "sources": {
-                "justice": justice_data,
-                "ares": ares_data,
-            },
-            "createdAt": company.created_at.isoformat(),
-            "updatedAt": company.updated_at.isoformat(),
+    def _build_details(self, icos: list[str]) -> dict[str, dict]:
+        """
+        Details of the companies with the given ICOs, keyed by ICO.
+
+        Three queries whatever the number of companies: the companies, their
+        latest Justice entities and their ARES records (one per company each,
+        via DISTINCT ON).
+        """
+        companies = list(Company.objects.filter(ico__in=icos))
+        if not companies:
+            return {}
+        ids = [company.pk for company in companies]
+
+        # Justice data: the most recently updated entity per company
+        justice_entities = {
+            entity.company_id: entity
+            for entity in Entity.objects.filter(company_id__in=ids)
+            .order_by("company_id", "-updated_at", "-id")
+            .distinct("company_id")
+        }
+        # ARES data: the first record per company
+        ares_records = {
+            record.company_id: record
+            for record in EconomicSubject.objects.filter(company_id__in=ids)
+            .order_by("company_id", "id")
+            .distinct("company_id")
         }
 
-        self.cache.set(result, "detail", normalized, ttl=COMPANY_DETAIL_CACHE_TTL)
-        return result
+        return {
+            company.ico: _render_detail(
+                company,
+                justice_entities.get(company.pk),
+                ares_records.get(company.pk),
+            )
+            for company in companies
+        }
 
     def search(self, params: dict) -> dict:
         """Multi-parameter search across denormalized Company fields."""
@@ -81,7 +115,12 @@ class CompanyService:
         if ico := params.get("ico"):
             qs = qs.filter(ico=ico.zfill(8))
         if name := params.get("name"):
-            qs = qs.filter(name__icontains=name)
+            qs = filter_by_name(
+                qs,
+                name,
+                match=params.get("match", "contains"),
+                unaccent=params.get("unaccent", False),
+            )
         if legal_form := params.get("legalForm"):
             qs = qs.filter(legal_form=legal_form)
         if region_code := params.get("regionCode"):
@@ -99,15 +138,26 @@ class CompanyService:
         elif params.get("status") == "inactive":
             qs = qs.filter(is_active=False)
 
-        total = qs.count()
+        total, total_exact = count_results(qs, self.cache, params)
         offset = params.get("offset", 0)
         limit = params.get("limit", 25)
-        companies = qs.order_by("-latest_revenue", "name")[offset:offset + limit]
+        try:
+            companies, next_cursor = keyset_page(
+                qs,
+                relevance_keys(qs, *COMPANY_SEARCH_ORDERING),
+                limit,
+                cursor=params.get("cursor"),
+                offset=offset,
+            )
+        except InvalidCursor as e:
+            raise ExternalAPIError(str(e), status_code=400, service_name="company")
 
         return {
             "totalCount": total,
+            "totalCountExact": total_exact,
             "offset": offset,
             "limit": limit,
+            "nextCursor": next_cursor,
             "companies": [
                 {
                     "ico": c.ico,
@@ -123,3 +173,41 @@ class CompanyService:
                 for c in companies
             ],
         }
+
+
+def _render_detail(company, justice_entity, ares_record) -> dict:
+    justice_data = None
+    if justice_entity:
+        justice_data = {
+            "ico": justice_entity.ico,
+            "name": justice_entity.name,
+            "legalFormCode": justice_entity.legal_form_code,
+            "legalFormName": justice_entity.legal_form_name,
+            "courtName": justice_entity.court_name,
+            "fileReference": justice_entity.file_reference,
+            "registrationDate": (
+                justice_entity.registration_date.isoformat()
+                if justice_entity.registration_date else None
+            ),
+            "deletionDate": (
+                justice_entity.deletion_date.isoformat()
+                if justice_entity.deletion_date else None
+            ),
+            "isActive": justice_entity.is_active,
+        }
+
+    ares_data = None
+    if ares_record and ares_record.raw_data:
+        ares_data = ares_record.raw_data
+
+    return {
+        "ico": company.ico,
+        "name": company.name,
+        "isActive": company.is_active,
+        "sources": {
+            "justice": justice_data,
+            "ares": ares_data,
+        },
+        "createdAt": company.created_at.isoformat(),
+        "updatedAt": company.updated_at.isoformat(),
+    }
@@ -1,6 +1,8 @@
 import pytest
 from django.core.cache import cache
 
+from core.tests.cache_backends import serialized_cache  # noqa: F401
+
 
 @pytest.fixture(autouse=True)
 def clear_cache():
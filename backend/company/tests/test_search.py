@@ -1,8 +1,15 @@
 import pytest
 from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from company.models import Company
 from company.services import CompanyService
+from core.exceptions import ExternalAPIError
+from core.services.pagination import SortKey
+from core.services.search import filter_by_name, relevance_keys
 
 
 def _create_company(**overrides):
@@ -119,3 +126,152 @@ class TestCompanySearch:
 
         all_results = service.search({})
         assert all_results["totalCount"] == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("serialized_cache")
+class TestCompanySearchCursor:
+    def _walk(self, params):
+        service = CompanyService()
+        icos = []
+        cursor = None
+        while True:
+            result = service.search({**params, **({"cursor": cursor} if cursor else {})})
+            icos.extend(c["ico"] for c in result["companies"])
+            cursor = result["nextCursor"]
+            if cursor is None:
+                return icos
+
+    def test_cursor_walks_revenue_order_with_unknown_revenue_last(self):
+        _create_company(ico="11111111", name="B", latest_revenue=Decimal(100))
+        _create_company(ico="22222222", name="A", latest_revenue=None)
+        _create_company(ico="33333333", name="C", latest_revenue=Decimal(900))
+        _create_company(ico="44444444", name="A", latest_revenue=Decimal(100))
+        _create_company(ico="55555555", name="B", latest_revenue=None)
+
+        icos = self._walk({"limit": 2})
+
+        assert icos == ["33333333", "44444444", "11111111", "22222222", "55555555"]
+
+    def test_cursor_matches_offset_pages(self):
+        for i in range(7):
+            _create_company(ico=f"1000000{i}", name=f"Co {i}", latest_revenue=Decimal(i % 3))
+
+        offset_icos = [c["ico"] for c in CompanyService().search({"limit": 100})["companies"]]
+
+        assert self._walk({"limit": 3}) == offset_icos
+
+    def test_cursor_uses_row_value_comparison(self):
+        _create_company(ico="11111111", latest_revenue=None)
+        _create_company(ico="22222222", latest_revenue=None)
+
+        first = CompanyService().search({"limit": 1})
+        with CaptureQueriesContext(connection) as ctx:
+            CompanyService().search({"limit": 1, "cursor": first["nextCursor"]})
+
+        page_sql = ctx.captured_queries[-1]["sql"]
+        assert "OFFSET" not in page_sql
+        assert '("company_company"."name", "company_company"."id") > ' in page_sql
+
+    def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(ExternalAPIError) as exc_info:
+            CompanyService().search({"cursor": "W10"})  # "[]": wrong key length
+
+        assert exc_info.value.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("serialized_cache")
+class TestCompanySearchCount:
+    def test_small_result_count_is_exact(self):
+        _create_company(ico="11111111")
+        _create_company(ico="22222222")
+
+        result = CompanyService().search({})
+
+        assert result["totalCount"] == 2
+        assert result["totalCountExact"] is True
+
+    def test_count_is_shared_across_pages(self):
+        for i in range(3):
+            _create_company(ico=f"1000000{i}")
+        CompanyService().search({"limit": 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = CompanyService().search({"limit": 1, "offset": 2})
+
+        assert result["totalCount"] == 3
+        assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+
+    def test_count_namespace_bump_invalidates_counts(self):
+        _create_company(ico="11111111")
+        CompanyService().search({})
+        _create_company(ico="22222222")
+
+        assert CompanyService().search({})["totalCount"] == 1
+        CompanyService().cache.bump("count")
+        assert CompanyService().search({})["totalCount"] == 2
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="needs EXPLAIN estimates")
+    def test_large_result_count_is_estimated(self, settings):
+        settings.SEARCH_EXACT_COUNT_THRESHOLD = 2
+        for i in range(5):
+            _create_company(ico=f"1000000{i}")
+
+        result = CompanyService().search({})
+
+        assert result["totalCountExact"] is False
+        assert result["totalCount"] >= 3
+
+
+@pytest.mark.django_db
+class TestCompanyNameSearch:
+    def test_search_by_name_contains(self):
+        _create_company(ico="11111111", name="Škoda Auto a.s.")
+        _create_company(ico="22222222", name="Tatra a.s.")
+
+        result = CompanyService().search({"name": "auto"})
+
+        assert [c["ico"] for c in result["companies"]] == ["11111111"]
+
+    def test_search_by_name_prefix(self):
+        _create_company(ico="11111111", name="Alfa s.r.o.")
+        _create_company(ico="22222222", name="Beta Alfa s.r.o.")
+
+        result = CompanyService().search({"name": "alf", "match": "prefix"})
+
+        assert [c["ico"] for c in result["companies"]] == ["11111111"]
+
+
+class TestTrigramNameSearchSql:
+    """SQL shape of the trigram path (needs pg_trgm to execute, not to compile)."""
+
+    @pytest.fixture(autouse=True)
+    def trigram_available(self):
+        with patch("core.services.search.trigram_search_available", return_value=True):
+            yield
+
+    def test_contains_uses_unaccented_ilike_with_accent_recheck(self):
+        qs = filter_by_name(Company.objects.all(), "50%_off")
+        sql = str(qs.query)
+
+        assert "immutable_unaccent" in sql
+        assert " ILIKE " in sql
+        assert "%50\\%\\_off%" in sql  # wildcards in user input are escaped
+        assert "LIKE" in sql.split(" ILIKE ", 1)[1]  # exact-accent recheck
+
+    def test_unaccent_mode_has_no_accent_recheck(self):
+        qs = filter_by_name(Company.objects.all(), "skoda", unaccent=True)
+        sql = str(qs.query)
+
+        assert sql.count("LIKE") == 1
+        assert "immutable_unaccent" in sql
+
+    def test_similar_ranks_by_similarity(self):
+        qs = filter_by_name(Company.objects.all(), "skoda", match="similar")
+        qs = qs.order_by(*(key.order_by() for key in relevance_keys(qs, SortKey("name"))))
+        sql = str(qs.query)
+
+        assert "SIMILARITY(immutable_unaccent" in sql
+        assert "name_similarity" in sql
+        assert sql.split("ORDER BY")[1].split(",")[0].endswith("DESC")
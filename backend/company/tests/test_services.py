@@ -52,3 +52,64 @@ class TestCompanyServiceGetByIco:
         service = CompanyService()
         result = service.get_by_ico("123456")
         assert result["ico"] == "00123456"
+
+
+@pytest.mark.django_db
+class TestCompanyServiceGetMany:
+    def _create(self, ico, with_sources=True):
+        company = Company.objects.create(ico=ico, name=f"Firma {ico}")
+        if with_sources:
+            Entity.objects.create(
+                ico=ico, name=f"Firma {ico}", company=company, dataset_id="sro-actual-praha-2023",
+            )
+            Entity.objects.create(
+                ico=ico, name=f"Firma {ico} nova", company=company, dataset_id="sro-actual-praha-2024",
+            )
+            EconomicSubject.objects.create(
+                ico=ico, business_name=f"Firma {ico}", company=company, raw_data={"icoId": ico},
+            )
+        return company
+
+    def test_results_follow_request_order(self):
+        self._create("00000001")
+        self._create("00000002", with_sources=False)
+
+        results = CompanyService().get_many(["2", "99999999", "00000001", "00000002"])
+
+        assert [r["ico"] for r in results] == ["00000002", "99999999", "00000001"]
+        assert results[0]["company"]["sources"] == {"justice": None, "ares": None}
+        assert results[1]["company"] is None
+        assert results[2]["company"]["sources"]["ares"] == {"icoId": "00000001"}
+
+    def test_uses_latest_justice_entity(self):
+        self._create("00000001")
+
+        result = CompanyService().get_many(["00000001"])[0]["company"]
+
+        assert result["sources"]["justice"]["name"] == "Firma 00000001 nova"
+        assert result == CompanyService().get_by_ico("00000001")
+
+    def test_three_queries_for_any_number_of_companies(self, django_assert_num_queries):
+        icos = [f"{i:08d}" for i in range(1, 21)]
+        for ico in icos:
+            self._create(ico)
+        service = CompanyService()
+
+        with django_assert_num_queries(3):
+            results = service.get_many(icos)
+        assert all(r["company"]["sources"]["justice"] for r in results)
+
+        # Served from the cache the second time.
+        with django_assert_num_queries(0):
+            assert service.get_many(icos) == results
+
+    def test_only_uncached_companies_are_loaded(self, django_assert_num_queries):
+        self._create("00000001")
+        self._create("00000002")
+        service = CompanyService()
+        service.get_by_ico("00000001")
+
+        with django_assert_num_queries(3):
+            results = service.get_many(["00000001", "00000002"])
+
+        assert [r["company"]["ico"] for r in results] == ["00000001", "00000002"]
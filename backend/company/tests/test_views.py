@@ -69,3 +69,29 @@ class TestCompanySearchView:
 
         assert response.status_code == 200
         assert response.json()["totalCount"] == 2
+
+
+@pytest.mark.django_db
+class TestCompanyBatchView:
+    def test_batch(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+
+        client = Client()
+        response = client.post(
+            "/api/v1/companies/batch/",
+            {"icos": ["12345678", "99999999"]},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["ico"] for r in results] == ["12345678", "99999999"]
+        assert results[0]["company"]["name"] == "Test s.r.o."
+        assert results[1]["company"] is None
+
+    def test_batch_rejects_invalid_icos(self):
+        client = Client()
+        response = client.post(
+            "/api/v1/companies/batch/", {"icos": ["12ab"]}, content_type="application/json"
+        )
+        assert response.status_code == 400
@@ -3,5 +3,6 @@ from . import views
 
 urlpatterns = [
     path("search/", views.CompanySearchView.as_view(), name="company-search"),
+    path("batch/", views.CompanyBatchView.as_view(), name="company-batch"),
     path("<str:ico>/", views.CompanyDetailView.as_view(), name="company-detail"),
 ]
@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .serializers import (
+    CompanyBatchRequestSerializer,
+    CompanyBatchResultSerializer,
     CompanyDetailSerializer,
     CompanySearchRequestSerializer,
     CompanySearchResultSerializer,
@@ -26,6 +28,27 @@ class CompanyDetailView(APIView):
         return Response(CompanyDetailSerializer(result).data)
 
 
+class CompanyBatchView(APIView):
+    @extend_schema(
+        tags=["Companies"],
+        summary="Get unified companies by a list of ICOs",
+        description=(
+            "Retrieve up to 1000 unified company records at once. Results follow "
+            "the order of the requested ICOs (duplicates are returned once); "
+            "company is null for ICOs not in the hub."
+        ),
+        request=CompanyBatchRequestSerializer,
+        responses={200: CompanyBatchResultSerializer},
+    )
+    def post(self, request):
+        serializer = CompanyBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = CompanyService()
+        results = service.get_many(serializer.validated_data["icos"])
+        return Response(CompanyBatchResultSerializer({"results": results}).data)
+
+
 class CompanySearchView(APIView):
     @extend_schema(
         tags=["Companies"],
@@ -36,6 +59,22 @@ class CompanySearchView(APIView):
         ),
         parameters=[
             OpenApiParameter(name="name", description="Company name (partial match)", required=False, type=str),
+            OpenApiParameter(
+                name="match",
+                description=(
+                    "Name matching: contains (default), prefix, or similar "
+                    "(trigram similarity, best matches first)"
+                ),
+                required=False,
+                type=str,
+                enum=["contains", "prefix", "similar"],
+            ),
+            OpenApiParameter(
+                name="unaccent",
+                description="Ignore diacritics in name matching (skoda finds Škoda)",
+                required=False,
+                type=bool,
+            ),
             OpenApiParameter(name="ico", description="Company identification number", required=False, type=str),
             OpenApiParameter(name="legalForm", description="Legal form code (e.g. 112 = s.r.o.)", required=False, type=str),
             OpenApiParameter(name="regionCode", description="Region code (e.g. 19 = Praha)", required=False, type=int),
@@ -52,6 +91,15 @@ class CompanySearchView(APIView):
             ),
             OpenApiParameter(name="offset", description="Pagination offset (default: 0)", required=False, type=int),
             OpenApiParameter(name="limit", description="Page size, 1-100 (default: 25)", required=False, type=int),
+            OpenApiParameter(
+                name="cursor",
+                description=(
+                    "Keyset pagination: pass nextCursor from the previous page to "
+                    "fetch the next one (offset is then ignored)"
+                ),
+                required=False,
+                type=str,
+            ),
         ],
         responses={200: CompanySearchResultSerializer},
     )
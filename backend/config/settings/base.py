@@ -149,4 +149,28 @@ DEFAULT_FROM_EMAIL = f'{env("MAIL_FROM_NAME", "GTDN")} <{env("MAIL_FROM_ADDRESS"
 FORM_RECIPIENT_EMAIL = env("FORM_RECIPIENT_EMAIL", "")
 TURNSTILE_SECRET_KEY = env("TURNSTILE_SECRET_KEY", "")
 
+# Justice open data: downloaded .xml.gz files are kept here for re-parsing
+# (justice_sync --from-spool). Least recently used files are evicted once the
+# spool grows past JUSTICE_SPOOL_MAX_BYTES.
+JUSTICE_SPOOL_DIR = env("JUSTICE_SPOOL_DIR", str(BASE_DIR / "var" / "justice_spool"))
+JUSTICE_SPOOL_MAX_BYTES = int(env("JUSTICE_SPOOL_MAX_BYTES", str(20 * 1024**3)))  # 20 GiB
+
+# Sbírka listin files proxied by /justice/documents/<id>/ are cached here
+# (least recently used evicted past JUSTICE_DOCUMENT_CACHE_MAX_BYTES).
+JUSTICE_DOCUMENT_CACHE_DIR = env(
+    "JUSTICE_DOCUMENT_CACHE_DIR", str(BASE_DIR / "var" / "justice_documents")
+)
+JUSTICE_DOCUMENT_CACHE_MAX_BYTES = int(
+    env("JUSTICE_DOCUMENT_CACHE_MAX_BYTES", str(5 * 1024**3))  # 5 GiB
+)
+
+# Search endpoints count results exactly up to this many rows; larger totals
+# are planner estimates (reported with totalCountExact: false).
+SEARCH_EXACT_COUNT_THRESHOLD = int(env("SEARCH_EXACT_COUNT_THRESHOLD", "10000"))
+
+# Stale ARES records are refreshed in the background by this many threads per
+# process; refreshes beyond the queue size are dropped until the next stale hit.
+ARES_REFRESH_WORKERS = int(env("ARES_REFRESH_WORKERS", "2"))
+ARES_REFRESH_QUEUE_SIZE = int(env("ARES_REFRESH_QUEUE_SIZE", "100"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -1,16 +1,70 @@
 import hashlib
 import json
+import logging
+import math
+import random
+import time
+from collections.abc import Callable
+from typing import Any
 
 from django.core.cache import cache
 
+logger = logging.getLogger(__name__)
+
+# Entries stay in the cache this long past their TTL, so that while one
+# caller recomputes an expired key the others can be served the stale value.
+STALE_GRACE = 300
+# get_or_compute: how long a recompute lock is held at most, and how long a
+# caller with nothing to serve waits for the lock holder before computing
+# itself.
+COMPUTE_LOCK_TIMEOUT = 30
+COMPUTE_WAIT = 5
+_WAIT_POLL_INTERVAL = 0.05
+
+
+# Envelope keys: the value, its logical expiry (Unix time) and how long it
+# took to compute. A plain dict, since the cache's JSON serializer turns
+# tuples into lists.
+_ENTRY_KEYS = frozenset(("v", "exp", "delta"))
+
+
+def _entry(value, expires_at: float, compute_seconds: float = 0.0) -> dict:
+    """Cache envelope of a value."""
+    return {"v": value, "exp": expires_at, "delta": compute_seconds}
+
+
+def _is_entry(cached) -> bool:
+    return isinstance(cached, dict) and cached.keys() == _ENTRY_KEYS
+
 
 class CacheService:
-    def __init__(self, prefix: str, default_ttl: int = 900):
+    """
+    Namespaced cache access for one service ("ares", "justice", "company").
+
+    The first key part is the namespace ("detail", "search", ...). Namespaces
+    listed in `versioned` carry a generation number in their keys
+    ('justice:search:v17:<hash>'); bump() moves them to a new generation,
+    which invalidates every key of the namespace at once without scanning
+    Redis. Old entries are left to expire.
+
+    Invalidations are counted per namespace (invalidation_counts()).
+
+    get_or_compute() protects expensive keys from cache stampedes: one caller
+    recomputes an expired key while the others get the stale value (or wait
+    briefly for the fresh one), and popular keys are refreshed slightly
+    before they expire.
+    """
+
+    def __init__(self, prefix: str, default_ttl: int = 900, versioned: tuple[str, ...] = ()):
         self.prefix = prefix
         self.default_ttl = default_ttl
+        self.versioned = frozenset(versioned)
 
     def _make_key(self, *parts: str) -> str:
         """Namespaced cache key: 'ares:detail:12345678'."""
+        namespace, *rest = parts
+        if namespace in self.versioned:
+            parts = (namespace, f"v{self.generation(namespace)}", *rest)
         return f"{self.prefix}:{':'.join(parts)}"
 
     def hash_params(self, params: dict) -> str:
@@ -19,7 +73,168 @@ class CacheService:
         return hashlib.sha256(serialized.encode()).hexdigest()[:16]
 
     def get(self, *key_parts: str):
-        return cache.get(self._make_key(*key_parts))
+        entry = cache.get(self._make_key(*key_parts))
+        if _is_entry(entry):
+            return entry["v"] if entry["exp"] > time.time() else None
+        return entry
 
     def set(self, value, *key_parts: str, ttl: int | None = None):
-        cache.set(self._make_key(*key_parts), value, ttl or self.default_ttl)
+        self._store(self._make_key(*key_parts), value, ttl)
+
+    def get_many(self, namespace: str, keys) -> dict:
+        """Fresh values of several keys of a namespace in one round trip (MGET)."""
+        cache_keys = {self._make_key(namespace, key): key for key in keys}
+        now = time.time()
+        found = {}
+        for cache_key, entry in cache.get_many(list(cache_keys)).items():
+            if _is_entry(entry):
+                if entry["exp"] <= now:
+                    continue
+                entry = entry["v"]
+            found[cache_keys[cache_key]] = entry
+        return found
+
+    def set_many(self, namespace: str, values: dict, ttl: int | None = None) -> None:
+        """Store several keys of a namespace in one round trip (MSET)."""
+        if not values:
+            return
+        ttl = ttl or self.default_ttl
+        expires_at = time.time() + ttl
+        cache.set_many(
+            {
+                self._make_key(namespace, key): _entry(value, expires_at)
+                for key, value in values.items()
+            },
+            ttl + STALE_GRACE,
+        )
+
+    def get_or_compute(
+        self,
+        compute: Callable[[], Any],
+        *key_parts: str,
+        ttl: int | Callable[[Any], int] | None = None,
+        beta: float = 1.0,
+    ):
+        """
+        Cached value of a key, computing it on a miss — once across callers.
+
+        A fresh entry is returned as is, except that it is recomputed early
+        with a probability that grows towards its expiry, proportionally to
+        how long it took to compute (XFetch, scaled by `beta`; 0 disables).
+        Recomputation takes a short cache lock (SET NX): the lock holder calls
+        `compute`, everyone else gets the stale entry, or, if there is none,
+        waits up to COMPUTE_WAIT seconds for the holder's result.
+
+        `ttl` may be a function of the computed value, e.g. to keep partial
+        results for a shorter time. Exceptions from `compute` propagate;
+        nothing is cached then.
+        """
+        key = self._make_key(*key_parts)
+        entry = cache.get(key)
+        if entry is not None and not _is_entry(entry):
+            return entry
+        if entry is not None and not _should_recompute(entry, beta):
+            return entry["v"]
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, COMPUTE_LOCK_TIMEOUT):
+            try:
+                return self._compute(compute, key, ttl)
+            finally:
+                cache.delete(lock_key)
+
+        if entry is not None:
+            return entry["v"]
+
+        deadline = time.monotonic() + COMPUTE_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(_WAIT_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["v"] if _is_entry(entry) else entry
+            if cache.get(lock_key) is None:
+                break  # the holder failed; compute ourselves
+        return self._compute(compute, key, ttl)
+
+    def _compute(self, compute: Callable[[], Any], key: str, ttl):
+        start = time.monotonic()
+        value = compute()
+        if callable(ttl):
+            ttl = ttl(value)
+        self._store(key, value, ttl, compute_seconds=time.monotonic() - start)
+        return value
+
+    def _store(self, key: str, value, ttl: int | None, compute_seconds: float = 0.0):
+        ttl = ttl or self.default_ttl
+        entry = _entry(value, time.time() + ttl, compute_seconds)
+        cache.set(key, entry, ttl + STALE_GRACE)
+
+    def generation(self, namespace: str) -> int:
+        """
+        Current generation of a versioned namespace.
+
+        Generations start from the current time rather than 0, so a lost
+        generation key (e.g. evicted by Redis LRU) starts a fresh generation
+        instead of resurrecting entries of an earlier one.
+        """
+        key = self._generation_key(namespace)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), None)
+            generation = cache.get(key)
+        return generation
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate every key of the given versioned namespaces."""
+        for namespace in namespaces:
+            if namespace not in self.versioned:
+                raise ValueError(f"{self.prefix}:{namespace} is not a versioned namespace")
+            key = self._generation_key(namespace)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), None)
+            self._count_invalidations(namespace, 1)
+            logger.info("Cache namespace %s:%s invalidated", self.prefix, namespace)
+
+    def delete_many(self, namespace: str, keys) -> int:
+        """
+        Invalidate individual keys of a namespace, e.g. per-ICO details.
+
+        Returns the number of keys passed.
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        cache.delete_many([self._make_key(namespace, key) for key in keys])
+        self._count_invalidations(namespace, len(keys))
+        return len(keys)
+
+    def invalidation_counts(self, *namespaces: str) -> dict[str, int]:
+        """Invalidations recorded per namespace (bumps count as one)."""
+        counts = cache.get_many([self._metric_key(n) for n in namespaces])
+        return {n: counts.get(self._metric_key(n), 0) for n in namespaces}
+
+    def _count_invalidations(self, namespace: str, count: int) -> None:
+        key = self._metric_key(namespace)
+        if not cache.add(key, count, None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, None)
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:generation"
+
+    def _metric_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:invalidations"
+
+
+def _should_recompute(entry: dict, beta: float) -> bool:
+    """Expired, or picked for early recomputation (XFetch)."""
+    now = time.time()
+    if now >= entry["exp"]:
+        return True
+    if beta <= 0 or entry["delta"] <= 0:
+        return False
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["exp"]
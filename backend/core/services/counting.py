@@ -0,0 +1,73 @@
+"""
+totalCount strategy for the search endpoints.
+
+An exact COUNT(*) over a broad filter (status=active matches most of the
+registry) costs more than fetching the page itself. Counts are therefore
+resolved in steps, cheapest first:
+
+1. A per-filter count cached by an earlier request (same filters, any page).
+2. A bounded exact count — COUNT(*) over at most threshold + 1 rows. Below
+   the threshold this is the exact total.
+3. Above the threshold, PostgreSQL's planner estimate for the query
+   (EXPLAIN), never less than the threshold itself.
+
+Results of steps 2 and 3 are cached per filter, in the service cache's
+versioned "count" namespace. Totals past the threshold are reported with
+totalCountExact: false. A completed dataset sync bumps the namespace so
+cached counts never outlive the data they describe.
+"""
+import json
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+
+from core.services.cache import CacheService
+
+SEARCH_COUNT_CACHE_TTL = 3600  # 1 hour; syncs invalidate earlier
+
+# Request params that select a page rather than the result set.
+PAGINATION_PARAMS = ("offset", "limit", "cursor")
+
+
+def count_results(qs: QuerySet, cache: CacheService, params: dict) -> tuple[int, bool]:
+    """
+    Total number of rows matched by a search.
+
+    Args:
+        qs: The filtered search queryset.
+        cache: The service's cache, with "count" among its versioned
+            namespaces.
+        params: Search params the queryset was built from (pagination params
+            are ignored, so all pages of a search share one count).
+
+    Returns:
+        (count, exact). `exact` is False for estimated or capped totals.
+    """
+    filters = {k: v for k, v in params.items() if k not in PAGINATION_PARAMS}
+    key = ("count", cache.hash_params(filters))
+
+    cached = cache.get(*key)
+    if cached is not None:
+        return cached["count"], cached["exact"]
+
+    threshold = settings.SEARCH_EXACT_COUNT_THRESHOLD
+    count = qs.order_by()[: threshold + 1].count()
+    exact = count <= threshold
+    if not exact:
+        estimate = _planner_estimate(qs)
+        count = max(estimate, count) if estimate is not None else qs.count()
+        exact = estimate is None
+
+    cache.set({"count": count, "exact": exact}, *key, ttl=SEARCH_COUNT_CACHE_TTL)
+    return count, exact
+
+
+def _planner_estimate(qs: QuerySet) -> int | None:
+    """Row estimate of the query plan; None where EXPLAIN cannot provide one."""
+    if connections[qs.db].vendor != "postgresql":
+        return None
+    plan = json.loads(qs.order_by().explain(format="json"))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan["Plan"]["Plan Rows"])
@@ -0,0 +1,174 @@
+"""
+Keyset (cursor) pagination for the search endpoints.
+
+OFFSET pagination makes the database walk and discard every skipped row, so
+deep pages get linearly slower. A keyset page instead continues from the sort
+key of the last row served:
+
+    WHERE (name, id) > ('Alfa s.r.o.', 1234) ORDER BY name, id LIMIT 20
+
+which a composite index on the ordering columns answers directly, at any
+depth. The ordering always ends with the primary key so the key is unique.
+
+The key is handed to clients as an opaque `cursor` string (base64 JSON).
+"""
+import base64
+import binascii
+import json
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import BooleanField, F, Func, Q, QuerySet, Value
+
+
+class SortKey(NamedTuple):
+    """One ordering column: a field or annotation name and its direction."""
+
+    field: str
+    descending: bool = False
+    # Nullable columns are ordered NULLS LAST on every backend, so the rows
+    # without a value come after all the others.
+    nullable: bool = False
+
+    def order_by(self):
+        nulls_last = self.nullable or None
+        if self.descending:
+            return F(self.field).desc(nulls_last=nulls_last)
+        return F(self.field).asc(nulls_last=nulls_last)
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or belongs to a different ordering."""
+
+
+class _RowGreaterThan(Func):
+    """(a, b, ...) > (x, y, ...) — SQL row-value comparison."""
+
+    output_field = BooleanField()
+
+    def __init__(self, columns, values):
+        self.width = len(columns)
+        super().__init__(*columns, *values)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        columns = ", ".join(sqls[: self.width])
+        values = ", ".join(sqls[self.width :])
+        return f"({columns}) > ({values})", params
+
+
+def keyset_page(
+    qs: QuerySet, keys: list[SortKey], limit: int, cursor: str | None = None, offset: int = 0
+) -> tuple[list, str | None]:
+    """
+    Fetch one page of `qs` ordered by `keys`.
+
+    Args:
+        qs: Filtered (unordered) queryset.
+        keys: Ordering, ending with a unique column (the primary key).
+        limit: Page size.
+        cursor: Cursor from a previous page; when given, `offset` is ignored.
+        offset: Legacy OFFSET pagination, used without a cursor.
+
+    Returns:
+        (rows, next_cursor). next_cursor is None on the last page.
+
+    Raises:
+        InvalidCursor: If `cursor` cannot be decoded for this ordering.
+    """
+    qs = qs.order_by(*(key.order_by() for key in keys))
+    if cursor:
+        qs = qs.filter(_after(keys, decode_cursor(cursor, keys, qs.model)))
+        offset = 0
+
+    rows = list(qs[offset : offset + limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([_key_value(rows[-1], key.field) for key in keys])
+
+
+def encode_cursor(values: list) -> str:
+    """Opaque cursor string for a sort key."""
+    payload = json.dumps(
+        [str(v) if isinstance(v, Decimal) else v for v in values],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list[SortKey], model) -> list:
+    """Sort key from a cursor string, converted to the ordering's field types."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor.") from e
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor("Cursor does not match this search.")
+
+    converted = []
+    for key, value in zip(keys, values):
+        if value is None:
+            if not key.nullable:
+                raise InvalidCursor("Cursor does not match this search.")
+            converted.append(None)
+            continue
+        try:
+            field = model._meta.get_field(key.field)
+        except FieldDoesNotExist:
+            # Annotations (e.g. similarity) are floats.
+            field = None
+        try:
+            converted.append(field.to_python(value) if field else float(value))
+        except (ValidationError, TypeError, ValueError) as e:
+            raise InvalidCursor("Cursor does not match this search.") from e
+    return converted
+
+
+def _after(keys: list[SortKey], values: list) -> Q:
+    """
+    Condition selecting the rows that sort after `values`.
+
+    The trailing run of ascending, non-null keys becomes one row-value
+    comparison; keys in front of it (descending or nullable) are expanded as
+    `k after v OR (k = v AND <rest>)`.
+    """
+    split = len(keys)
+    while split > 0 and not keys[split - 1].descending and not keys[split - 1].nullable:
+        split -= 1
+
+    tail = keys[split:]
+    if len(tail) == 1:
+        condition = Q(**{f"{tail[0].field}__gt": values[-1]})
+    elif tail:
+        condition = Q(
+            _RowGreaterThan(
+                [F(key.field) for key in tail],
+                [Value(value) for value in values[split:]],
+            )
+        )
+    else:
+        condition = Q(pk__in=[])
+
+    for key, value in reversed(list(zip(keys[:split], values[:split]))):
+        if value is None:
+            # Inside the NULLS LAST tail: only other NULL rows can follow.
+            condition = Q(**{f"{key.field}__isnull": True}) & condition
+            continue
+        lookup = "lt" if key.descending else "gt"
+        after = Q(**{f"{key.field}__{lookup}": value})
+        if key.nullable:
+            after |= Q(**{f"{key.field}__isnull": True})
+        condition = after | (Q(**{key.field: value}) & condition)
+    return condition
+
+
+def _key_value(row, field: str):
+    return row.pk if field in ("pk", "id") else getattr(row, field)
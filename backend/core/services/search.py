@@ -0,0 +1,176 @@
+"""
+Name search shared by the Justice entity and Company hub search endpoints.
+
+On PostgreSQL with the pg_trgm and unaccent extensions, names are matched
+through a GIN trigram index on immutable_unaccent(name), created by the
+apps' migrations with create_name_search_index(). That single index serves
+every mode:
+
+    contains  — substring match (ILIKE '%query%')
+    prefix    — prefix match (ILIKE 'query%')
+    similar   — trigram similarity (pg_trgm %), ranked by similarity()
+
+contains/prefix matching is diacritics-insensitive on request ("skoda"
+finds "Škoda"); otherwise the index narrows the candidates and an
+exact-accent recheck is applied on top. Similarity always compares the
+unaccented forms.
+
+Without the extensions (e.g. SQLite in tests, or a database where they
+cannot be installed) search falls back to icontains / istartswith, which is
+diacritics-sensitive and unranked.
+"""
+import logging
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import BooleanField, Func, QuerySet, TextField, Value
+
+from core.services.pagination import SortKey
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODES = ("contains", "prefix", "similar")
+
+# Annotation added to "similar" searches; relevance_keys sorts on it.
+SIMILARITY = "name_similarity"
+
+_REQUIRED_EXTENSIONS = ("pg_trgm", "unaccent")
+_available = {}
+
+
+class ImmutableUnaccent(Func):
+    """
+    immutable_unaccent(text): unaccent() with a fixed dictionary, declared
+    IMMUTABLE so that it can be used in an index expression.
+    """
+
+    function = "immutable_unaccent"
+    output_field = TextField()
+
+
+class _ILike(Func):
+    template = "%(expressions)s"
+    arg_joiner = " ILIKE "
+    output_field = BooleanField()
+
+
+class _TrigramMatch(Func):
+    template = "%(expressions)s"
+    arg_joiner = " %% "
+    output_field = BooleanField()
+
+
+def trigram_search_available(using: str = "default") -> bool:
+    """Whether the database has the trigram search support installed."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    key = (using, connection.settings_dict["NAME"])
+    if key not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_extension WHERE extname = ANY(%s)",
+                [list(_REQUIRED_EXTENSIONS)],
+            )
+            installed = cursor.fetchone()[0] == len(_REQUIRED_EXTENSIONS)
+            cursor.execute("SELECT to_regproc('immutable_unaccent') IS NOT NULL")
+            _available[key] = installed and cursor.fetchone()[0]
+    return _available[key]
+
+
+def filter_by_name(
+    qs: QuerySet,
+    query: str,
+    match: str = "contains",
+    unaccent: bool = False,
+    field: str = "name",
+) -> QuerySet:
+    """
+    Filter `qs` to rows whose `field` matches `query`.
+
+    Args:
+        qs: Queryset to filter.
+        query: User-supplied search text.
+        match: One of MATCH_MODES.
+        unaccent: Ignore diacritics ("skoda" matches "Škoda").
+        field: Name column to search.
+
+    Returns:
+        The filtered queryset. "similar" searches are annotated with
+        SIMILARITY; use relevance_keys() to rank by it.
+    """
+    if not trigram_search_available(qs.db):
+        lookup = "istartswith" if match == "prefix" else "icontains"
+        return qs.filter(**{f"{field}__{lookup}": query})
+
+    column = ImmutableUnaccent(field)
+    if match == "similar":
+        needle = ImmutableUnaccent(Value(query))
+        return qs.filter(_TrigramMatch(column, needle)).annotate(
+            **{SIMILARITY: TrigramSimilarity(column, needle)}
+        )
+
+    escaped = _escape_like(query)
+    pattern = f"{escaped}%" if match == "prefix" else f"%{escaped}%"
+    qs = qs.filter(_ILike(column, ImmutableUnaccent(Value(pattern))))
+    if not unaccent:
+        lookup = "istartswith" if match == "prefix" else "icontains"
+        qs = qs.filter(**{f"{field}__{lookup}": query})
+    return qs
+
+
+def relevance_keys(qs: QuerySet, *keys: SortKey) -> list[SortKey]:
+    """Sort keys for a search: similarity (best first) when ranked, then `keys`."""
+    if SIMILARITY in qs.query.annotations:
+        return [SortKey(SIMILARITY, descending=True), *keys]
+    return list(keys)
+
+
+def create_name_search_index(
+    schema_editor, table: str, index_name: str, column: str = "name"
+) -> None:
+    """
+    Migration helper: install pg_trgm/unaccent and the trigram index.
+
+    Skipped (with a warning) on non-PostgreSQL databases and where the
+    extensions are not available, leaving search on the icontains fallback.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_available_extensions WHERE name = ANY(%s)",
+            [list(_REQUIRED_EXTENSIONS)],
+        )
+        if cursor.fetchone()[0] != len(_REQUIRED_EXTENSIONS):
+            logger.warning(
+                "pg_trgm/unaccent not available; %s is not created and name "
+                "search uses the icontains fallback",
+                index_name,
+            )
+            return
+
+    for extension in _REQUIRED_EXTENSIONS:
+        schema_editor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} "
+        f"USING gin (immutable_unaccent({column}) gin_trgm_ops)"
+    )
+    _available.clear()
+
+
+def drop_name_search_index(schema_editor, index_name: str) -> None:
+    """Migration helper: reverse of create_name_search_index (index only)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,44 @@
+"""
+Cache backend and fixture for tests that must see cached values the way
+production reads them back.
+
+LocMemCache pickles values, so any Python object survives a round trip.
+The configured django-redis serializer (JSON) does not: tuples come back as
+lists, Decimals as strings. SerializingLocMemCache passes every value
+written through that serializer.
+"""
+import pytest
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.module_loading import import_string
+
+DEFAULT_SERIALIZER = "django_redis.serializers.json.JSONSerializer"
+
+
+class SerializingLocMemCache(LocMemCache):
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get("OPTIONS", {})
+        self._serializer = import_string(options.get("SERIALIZER", DEFAULT_SERIALIZER))(options)
+
+    def _round_trip(self, value):
+        return self._serializer.loads(self._serializer.dumps(value))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return super().add(key, self._round_trip(value), timeout, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, self._round_trip(value), timeout, version)
+
+
+@pytest.fixture
+def serialized_cache(settings):
+    """Swap the default cache for one using the configured serializer."""
+    options = settings.CACHES["default"].get("OPTIONS", {})
+    serializer = options.get("SERIALIZER", DEFAULT_SERIALIZER)
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "core.tests.cache_backends.SerializingLocMemCache",
+            "OPTIONS": {"SERIALIZER": serializer},
+        }
+    }
@@ -0,0 +1,226 @@
+"""
+Tests for core.services.cache.CacheService — namespacing, versioned
+namespaces, invalidation counters and single-flight get_or_compute. Runs
+against the configured cache; TestSerializedEntries pins values to what
+the configured serializer reads back.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+
+from core.services.cache import CacheService, _entry
+
+from .cache_backends import serialized_cache  # noqa: F401
+
+
+def _service():
+    return CacheService(prefix="test", versioned=("search",))
+
+
+class TestCacheService:
+    def test_plain_namespace_key(self):
+        assert _service()._make_key("detail", "12345678") == "test:detail:12345678"
+
+    def test_versioned_namespace_key_carries_generation(self):
+        service = _service()
+        generation = service.generation("search")
+
+        assert service._make_key("search", "abc") == f"test:search:v{generation}:abc"
+
+    def test_bump_invalidates_whole_namespace(self):
+        service = _service()
+        service.set("page-1", "search", "a")
+        service.set("page-2", "search", "b")
+        service.set("detail", "detail", "12345678")
+
+        service.bump("search")
+
+        assert service.get("search", "a") is None
+        assert service.get("search", "b") is None
+        assert service.get("detail", "12345678") == "detail"
+
+    def test_bump_is_shared_across_instances(self):
+        _service().set("value", "search", "a")
+        _service().bump("search")
+
+        assert _service().get("search", "a") is None
+
+    def test_lost_generation_never_resurrects_old_entries(self):
+        service = _service()
+        service.set("value", "search", "a")
+        old_key = service._make_key("search", "a")
+
+        cache.delete(service._generation_key("search"))
+
+        assert service._make_key("search", "a") != old_key
+        assert service.get("search", "a") is None
+
+    def test_bump_requires_versioned_namespace(self):
+        with pytest.raises(ValueError):
+            _service().bump("detail")
+
+    def test_delete_many_drops_only_given_keys(self):
+        service = _service()
+        service.set("a", "detail", "11111111")
+        service.set("b", "detail", "22222222")
+
+        assert service.delete_many("detail", ["11111111"]) == 1
+
+        assert service.get("detail", "11111111") is None
+        assert service.get("detail", "22222222") == "b"
+
+    def test_invalidation_counts(self):
+        service = _service()
+        service.bump("search")
+        service.bump("search")
+        service.delete_many("detail", ["1", "2", "3"])
+        service.delete_many("detail", [])
+
+        assert service.invalidation_counts("search", "detail", "other") == {
+            "search": 2,
+            "detail": 3,
+            "other": 0,
+        }
+
+
+class TestGetOrCompute:
+    def _put(self, service, value, expires_in, compute_seconds=0.0):
+        key = service._make_key("detail", "x")
+        cache.set(key, _entry(value, time.time() + expires_in, compute_seconds), 600)
+        return key
+
+    def test_miss_computes_once_and_caches(self):
+        service = _service()
+        compute = MagicMock(return_value={"a": 1})
+
+        assert service.get_or_compute(compute, "detail", "x") == {"a": 1}
+        assert service.get_or_compute(compute, "detail", "x") == {"a": 1}
+        assert service.get("detail", "x") == {"a": 1}
+        compute.assert_called_once()
+
+    def test_expired_entry_is_recomputed(self):
+        service = _service()
+        self._put(service, "old", expires_in=-1)
+
+        assert service.get_or_compute(lambda: "new", "detail", "x") == "new"
+
+    def test_stale_entry_served_while_another_caller_recomputes(self):
+        service = _service()
+        key = self._put(service, "old", expires_in=-1)
+        cache.add(f"{key}:lock", 1, 30)
+        compute = MagicMock(return_value="new")
+
+        assert service.get_or_compute(compute, "detail", "x") == "old"
+        compute.assert_not_called()
+
+    def test_waits_for_lock_holder_when_nothing_cached(self):
+        service = _service()
+        key = service._make_key("detail", "x")
+        cache.add(f"{key}:lock", 1, 30)
+        compute = MagicMock(return_value="mine")
+
+        def holder_finishes(_seconds):
+            service.set("theirs", "detail", "x")
+
+        with patch("core.services.cache.time.sleep", side_effect=holder_finishes):
+            assert service.get_or_compute(compute, "detail", "x") == "theirs"
+        compute.assert_not_called()
+
+    def test_computes_itself_when_lock_holder_gives_up(self):
+        service = _service()
+        key = service._make_key("detail", "x")
+        cache.add(f"{key}:lock", 1, 30)
+
+        with patch(
+            "core.services.cache.time.sleep", side_effect=lambda _s: cache.delete(f"{key}:lock")
+        ):
+            assert service.get_or_compute(lambda: "mine", "detail", "x") == "mine"
+
+    def test_compute_error_propagates_and_releases_lock(self):
+        service = _service()
+
+        with pytest.raises(RuntimeError):
+            service.get_or_compute(MagicMock(side_effect=RuntimeError), "detail", "x")
+
+        assert service.get("detail", "x") is None
+        assert service.get_or_compute(lambda: "ok", "detail", "x") == "ok"
+
+    def test_probabilistic_early_recompute(self):
+        service = _service()
+        # 10 s to expiry, but computing took 100 s: XFetch refreshes now.
+        self._put(service, "old", expires_in=10, compute_seconds=100)
+
+        with patch("core.services.cache.random.random", return_value=0.5):
+            assert service.get_or_compute(lambda: "new", "detail", "x") == "new"
+
+    def test_early_recompute_disabled_with_zero_beta(self):
+        service = _service()
+        self._put(service, "old", expires_in=10, compute_seconds=100)
+
+        assert service.get_or_compute(lambda: "new", "detail", "x", beta=0) == "old"
+
+    def test_concurrent_misses_compute_once(self):
+        service = _service()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(service.get_or_compute(compute, "detail", "x"))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+
+class TestBatchAccess:
+    def test_set_many_get_many(self):
+        service = _service()
+        service.set_many("detail", {"a": 1, "b": {"x": 2}})
+
+        assert service.get_many("detail", ["a", "b", "c"]) == {"a": 1, "b": {"x": 2}}
+        assert service.get("detail", "b") == {"x": 2}
+
+    def test_get_many_skips_expired_entries(self):
+        service = _service()
+        cache.set(service._make_key("detail", "old"), _entry("v", time.time() - 1), 60)
+        cache.set(service._make_key("detail", "raw"), "legacy", 60)
+
+        assert service.get_many("detail", ["old", "raw"]) == {"raw": "legacy"}
+
+
+@pytest.mark.usefixtures("serialized_cache")
+class TestSerializedEntries:
+    def test_get_returns_the_value_not_the_envelope(self):
+        service = _service()
+        service.set({"count": 3, "exact": True}, "search", "a")
+
+        assert service.get("search", "a") == {"count": 3, "exact": True}
+
+    def test_get_or_compute_round_trip(self):
+        service = _service()
+        compute = MagicMock(return_value=[1, 2])
+
+        assert service.get_or_compute(compute, "detail", "x") == [1, 2]
+        assert service.get_or_compute(compute, "detail", "x") == [1, 2]
+        compute.assert_called_once()
+
+    def test_get_many_round_trip(self):
+        service = _service()
+        service.set_many("detail", {"a": {"x": 1}})
+
+        assert service.get_many("detail", ["a"]) == {"a": {"x": 1}}
@@ -4,17 +4,31 @@ from rest_framework import serializers
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from ares.refresh import METRICS, refresh_metrics
+
 
 @extend_schema(
     tags=["Health"],
     summary="Health check",
-    description="Verifies Django is running and Redis cache is reachable.",
+    description=(
+        "Verifies Django is running and Redis cache is reachable. Also reports "
+        "ARES background refresh counters (all workers) and the queue depth of "
+        "the answering worker."
+    ),
     responses={
         200: inline_serializer(
             "HealthCheck",
             {
                 "status": serializers.CharField(),
                 "cache": serializers.CharField(),
+                "aresRefresh": inline_serializer(
+                    "AresRefreshMetrics",
+                    {
+                        **{name: serializers.IntegerField() for name in METRICS},
+                        "queueDepth": serializers.IntegerField(),
+                    },
+                    allow_null=True,
+                ),
             },
         )
     },
@@ -22,11 +36,13 @@ from rest_framework.response import Response
 @api_view(["GET"])
 def health_check(request):
     cache_status = "ok"
+    refresh = None
     try:
         cache.set("health_check", "ok", 10)
         if cache.get("health_check") != "ok":
             cache_status = "error"
+        refresh = refresh_metrics()
     except Exception:
         cache_status = "error"
 
-    return Response({"status": "ok", "cache": cache_status})
+    return Response({"status": "ok", "cache": cache_status, "aresRefresh": refresh})
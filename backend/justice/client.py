@@ -5,25 +5,32 @@ JusticeCKANClient:    CKAN Open Data API at dataor.justice.cz (datasets, file do
 JusticePDFClient:     PDF document downloads from or.justice.cz (Sbirka listin).
 JusticeSbirkaClient:  HTML scraping of or.justice.cz for Sbírka listin documents.
 """
-import html as html_module
 import logging
 import re
-from typing import Iterator
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from django.conf import settings
 
 from core.exceptions import ExternalAPIError
 from .constants import (
     DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MAX_RETRIES,
+    DOWNLOAD_MAX_RETRY_AFTER,
+    DOWNLOAD_RETRY_BACKOFF,
     FILE_DOWNLOAD_TIMEOUT,
     JUSTICE_BASE_URL,
     JUSTICE_CKAN_API_URL,
     JUSTICE_FILE_API_URL,
     REQUEST_TIMEOUT,
+    SBIRKA_MAX_CONNECTIONS,
     SBIRKA_REQUEST_TIMEOUT,
 )
+from .parsers import sbirka_html
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +39,9 @@ logger = logging.getLogger(__name__)
 # verification via Django settings for development.
 _VERIFY_SSL = getattr(settings, "JUSTICE_VERIFY_SSL", True)
 
+# "bytes 100-199/1000" (206) or "bytes */1000" (416).
+_CONTENT_RANGE = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)")
+
 
 class JusticeCKANClient:
     """HTTP client for the CKAN Open Data API at dataor.justice.cz."""
@@ -94,23 +104,112 @@ class JusticeCKANClient:
         except (requests.RequestException, ValueError):
             return None
 
-    def download_file_stream(self, filename: str) -> Iterator[bytes]:
-        """GET /api/file/{filename} → streaming byte iterator for .xml.gz files."""
-        try:
-            resp = self.session.get(
-                f"{JUSTICE_FILE_API_URL}/{filename}",
-                timeout=FILE_DOWNLOAD_TIMEOUT,
-                stream=True,
-            )
-            resp.raise_for_status()
-            return resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
-        except requests.HTTPError as e:
-            raise self._map_error(e)
-        except requests.RequestException:
-            raise ExternalAPIError(
-                "Justice file download failed",
-                service_name="justice",
-            )
+    def download_file(
+        self,
+        filename: str,
+        dest_path: str,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> dict | None:
+        """
+        GET /api/file/{filename} into a local spool file.
+
+        Sends If-None-Match / If-Modified-Since from a previous download, so an
+        unchanged file costs a single 304. A dropped connection, a 5xx or a 429
+        (after its Retry-After) is resumed with an HTTP Range request (guarded
+        by If-Range) instead of restarting; other 4xx fail immediately. A
+        206 is appended only if its Content-Range starts at the bytes already
+        written, and a 416 reporting exactly that length means the file was
+        complete; other range answers restart the download from zero.
+
+        Returns:
+            None if the server answered 304 Not Modified, otherwise
+            {"etag", "lastModified", "size"} of the downloaded file.
+        """
+        url = f"{JUSTICE_FILE_API_URL}/{filename}"
+        conditional_headers = {}
+        if etag:
+            conditional_headers["If-None-Match"] = etag
+        if last_modified:
+            conditional_headers["If-Modified-Since"] = last_modified
+
+        meta = {"etag": "", "lastModified": "", "size": 0}
+        attempt = 0
+        with open(dest_path, "wb") as fh:
+            while True:
+                written = fh.tell()
+                headers = conditional_headers
+                if written:
+                    # Weak ETags are not allowed in If-Range.
+                    validator = (
+                        meta["etag"]
+                        if meta["etag"] and not meta["etag"].startswith("W/")
+                        else meta["lastModified"]
+                    )
+                    headers = {"Range": f"bytes={written}-"}
+                    if validator:
+                        headers["If-Range"] = validator
+                try:
+                    resp = self.session.get(
+                        url,
+                        headers=headers,
+                        timeout=FILE_DOWNLOAD_TIMEOUT,
+                        stream=True,
+                    )
+                    try:
+                        if resp.status_code == 304:
+                            return None
+                        if written and resp.status_code in (206, 416):
+                            start, total = _content_range(resp)
+                            if resp.status_code == 416 and total == written:
+                                # The dropped attempt had already received every byte.
+                                break
+                            if resp.status_code == 416 or start != written:
+                                # Resumed at another offset: appending would
+                                # corrupt the file, so start over.
+                                fh.seek(0)
+                                fh.truncate()
+                                raise requests.ConnectionError(
+                                    f"Unusable range response {resp.status_code} "
+                                    f"({resp.headers.get('Content-Range', 'no Content-Range')})"
+                                )
+                        resp.raise_for_status()
+
+                        if written and resp.status_code != 206:
+                            # Range ignored or file changed upstream: start over.
+                            fh.seek(0)
+                            fh.truncate()
+                        if not fh.tell():
+                            meta["etag"] = resp.headers.get("ETag", "")
+                            meta["lastModified"] = resp.headers.get("Last-Modified", "")
+
+                        fh.writelines(resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+                        break
+                    finally:
+                        # Release the connection before any retry.
+                        resp.close()
+                except requests.HTTPError as e:
+                    code = e.response.status_code if e.response is not None else None
+                    if code != 429 and (code is None or code < 500):
+                        raise self._map_error(e)
+                    delay = _retry_after(e.response)
+                except requests.RequestException:
+                    delay = None
+
+                attempt += 1
+                if attempt > DOWNLOAD_MAX_RETRIES:
+                    raise ExternalAPIError(
+                        "Justice file download failed",
+                        service_name="justice",
+                    )
+                logger.warning(
+                    "Download of %s interrupted at %d bytes, resuming (attempt %d)",
+                    filename, fh.tell(), attempt,
+                )
+                time.sleep(DOWNLOAD_RETRY_BACKOFF * attempt if delay is None else delay)
+
+            meta["size"] = fh.tell()
+        return meta
 
     def _map_error(self, error: requests.HTTPError) -> ExternalAPIError:
         code = error.response.status_code if error.response is not None else None
@@ -126,6 +225,30 @@ class JusticeCKANClient:
         )
 
 
+def _content_range(resp) -> tuple[int | None, int | None]:
+    """(first byte, complete length) from a Content-Range header; None if absent."""
+    match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+    if match is None:
+        return None, None
+    start, total = match.groups()
+    return (int(start) if start else None), (int(total) if total.isdigit() else None)
+
+
+def _retry_after(resp) -> float | None:
+    """Seconds to wait per a Retry-After header (capped); None if absent or invalid."""
+    value = resp.headers.get("Retry-After", "").strip()
+    if value.isdigit():
+        return min(float(value), DOWNLOAD_MAX_RETRY_AFTER)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    seconds = (when - datetime.now(UTC)).total_seconds()
+    return min(max(seconds, 0.0), DOWNLOAD_MAX_RETRY_AFTER)
+
+
 class JusticePDFClient:
     """HTTP client for PDF downloads from or.justice.cz (Sbirka listin)."""
 
@@ -166,11 +289,23 @@ class JusticeSbirkaClient:
     1. ICO → subjektId  (search page)
     2. subjektId → document list  (sbírka listin page)
     3. document → file download links  (detail page)
+
+    The session is shared by concurrent threads; its or.justice.cz pool
+    holds at most SBIRKA_MAX_CONNECTIONS connections, and further requests
+    wait for a free one.
     """
 
     def __init__(self):
         self.session = requests.Session()
         self.session.verify = _VERIFY_SSL
+        self.session.mount(
+            JUSTICE_BASE_URL,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=SBIRKA_MAX_CONNECTIONS,
+                pool_block=True,
+            ),
+        )
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (compatible; GTDN-Backend/1.0)",
             "Accept": "text/html",
@@ -191,7 +326,11 @@ class JusticeSbirkaClient:
         return match.group(1) if match else None
 
     def get_document_list(self, subjekt_id: str) -> list[dict]:
-        """Fetch the sbírka listin page and parse the document table."""
+        """
+        Fetch the sbírka listin page and parse the document table.
+
+        Raises ExternalAPIError if the page cannot be fetched.
+        """
         url = f"{JUSTICE_BASE_URL}/ias/ui/vypis-sl-firma"
         try:
             resp = self.session.get(
@@ -200,12 +339,19 @@ class JusticeSbirkaClient:
             )
             resp.raise_for_status()
         except requests.RequestException:
-            return []
+            raise ExternalAPIError(
+                "Failed to fetch document list from justice.cz",
+                service_name="justice",
+            )
 
         return self._parse_document_table(resp.text, subjekt_id)
 
     def get_document_files(self, document_id: str, subjekt_id: str, spis_id: str) -> list[dict]:
-        """Fetch the detail page for a document and extract file download links."""
+        """
+        Fetch the detail page for a document and extract file download links.
+
+        Raises ExternalAPIError if the page cannot be fetched.
+        """
         url = f"{JUSTICE_BASE_URL}/ias/ui/vypis-sl-detail"
         try:
             resp = self.session.get(
@@ -219,7 +365,10 @@ class JusticeSbirkaClient:
             )
             resp.raise_for_status()
         except requests.RequestException:
-            return []
+            raise ExternalAPIError(
+                "Failed to fetch document detail from justice.cz",
+                service_name="justice",
+            )
 
         return self._parse_file_links(resp.text)
 
@@ -242,89 +391,49 @@ class JusticeSbirkaClient:
                 service_name="justice",
             )
 
+        content_type, filename = self._file_metadata(resp)
+        return resp.content, content_type, filename
+
+    def download_to_file(self, download_id: str, dest_path: str) -> tuple[str, str]:
+        """
+        Stream a file by its download UUID to `dest_path`, never holding it
+        in memory.
+
+        Returns: (content_type, filename)
+        """
+        url = f"{JUSTICE_BASE_URL}/ias/content/download"
+        try:
+            with self.session.get(
+                url, params={"id": download_id},
+                timeout=SBIRKA_REQUEST_TIMEOUT,
+                stream=True,
+            ) as resp:
+                resp.raise_for_status()
+                with open(dest_path, "wb") as f:
+                    f.writelines(resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+                return self._file_metadata(resp)
+        except requests.RequestException:
+            raise ExternalAPIError(
+                "Failed to download document from justice.cz",
+                service_name="justice",
+            )
+
+    @staticmethod
+    def _file_metadata(resp) -> tuple[str, str]:
+        """(content_type, filename) of a download response."""
         content_type = resp.headers.get("content-type", "application/octet-stream")
         disposition = resp.headers.get("content-disposition", "")
         filename_match = re.search(r'filename="?([^";\n]+)"?', disposition)
         filename = filename_match.group(1) if filename_match else "document"
-
-        return resp.content, content_type, filename
+        return content_type, filename
 
     def _parse_document_table(self, html: str, subjekt_id: str) -> list[dict]:
         """Parse the sbírka listin HTML table into structured document dicts."""
-        docs = []
-        detail_pattern = re.compile(
-            r'vypis-sl-detail\?dokument=(\d+)&amp;subjektId=\d+&amp;spis=(\d+)'
-        )
-        type_pattern = re.compile(r'class="symbol">([^<]+)</span>')
-        number_pattern = re.compile(
-            r'vypis-sl-detail[^>]*><span>([^<]+)</span>'
-        )
-
-        detail_matches = list(detail_pattern.finditer(html))
-        type_matches = list(type_pattern.finditer(html))
-        number_matches = list(number_pattern.finditer(html))
-
-        for i, detail_match in enumerate(detail_matches):
-            doc_id = detail_match.group(1)
-            spis_id = detail_match.group(2)
-
-            doc_types = []
-            if i < len(type_matches):
-                start_pos = detail_match.end()
-                end_pos = (
-                    detail_matches[i + 1].start()
-                    if i + 1 < len(detail_matches)
-                    else len(html)
-                )
-                for tm in type_matches:
-                    if start_pos <= tm.start() < end_pos:
-                        doc_types.append(tm.group(1))
-
-            doc_number = ""
-            if i < len(number_matches):
-                raw = number_matches[i].group(1)
-                doc_number = html_module.unescape(raw).replace("\xa0", " ").strip()
-
-            docs.append({
-                "documentId": doc_id,
-                "subjektId": subjekt_id,
-                "spisId": spis_id,
-                "documentNumber": doc_number,
-                "documentType": ", ".join(doc_types) if doc_types else "",
-            })
-
-        return docs
+        return list(sbirka_html.iter_document_rows(html, subjekt_id))
 
     def _parse_file_links(self, html: str) -> list[dict]:
         """Parse the detail page HTML to extract download links with metadata."""
-        files = []
-        link_pattern = re.compile(
-            r'download\?id=([a-f0-9-]+)"[^>]*>\s*(?:<[^>]+>)?\s*([^<]+)'
-        )
-        for match in link_pattern.finditer(html):
-            download_id = match.group(1)
-            filename = match.group(2).strip()
-
-            if "GDPR" in filename or "Informace" in filename:
-                continue
-
-            is_xml = filename.lower().endswith(".xml")
-            is_pdf = filename.lower().endswith(".pdf")
-
-            context = html[match.end():match.end() + 100]
-            size_match = re.search(r"\((\d+)\s*kB", context)
-            pages_match = re.search(r"počet stran:\s*(\d+)", context)
-
-            files.append({
-                "downloadId": download_id,
-                "filename": filename,
-                "sizeKb": int(size_match.group(1)) if size_match else None,
-                "pageCount": int(pages_match.group(1)) if pages_match else None,
-                "isXml": is_xml,
-                "isPdf": is_pdf,
-            })
-
-        return files
+        return list(sbirka_html.iter_file_links(html))
 
 
 # Module-level singletons for connection pooling.
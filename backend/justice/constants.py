@@ -15,6 +15,15 @@ JUSTICE_FILE_API_URL = "https://dataor.justice.cz/api/file"
 REQUEST_TIMEOUT = 30  # seconds (metadata API calls)
 FILE_DOWNLOAD_TIMEOUT = 600  # 10 minutes (large .xml.gz files)
 DOWNLOAD_CHUNK_SIZE = 8192  # bytes for streaming downloads
+DOWNLOAD_MAX_RETRIES = 5  # Range-resume attempts after a dropped connection or 429/5xx
+DOWNLOAD_RETRY_BACKOFF = 2  # seconds, multiplied by the attempt number
+DOWNLOAD_MAX_RETRY_AFTER = 60  # seconds; cap on a server's Retry-After
+
+# --- Sync ---
+
+SYNC_BATCH_SIZE = 500  # parsed Subjekts buffered per bulk ingestion batch
+SYNC_DEADLOCK_RETRIES = 3  # dataset load attempts when parallel workers deadlock
+SYNC_DEADLOCK_BACKOFF = 1  # seconds, multiplied by the attempt number
 
 # --- Cache TTLs ---
 
@@ -135,3 +144,11 @@ FACT_TYPE_CODES = {
 SBIRKA_LISTIN_CACHE_TTL = 3600  # 1 hour — document lists don't change often
 SBIRKA_FINANCIAL_CACHE_TTL = 86400 * 30  # 30 days — financial data is immutable once filed
 SBIRKA_REQUEST_TIMEOUT = 15  # seconds per page scrape
+# The stored document index is rechecked against the list page at most this often.
+SBIRKA_INDEX_RECHECK_INTERVAL = 3600
+SBIRKA_PARTIAL_CACHE_TTL = 120  # document lists with failed fetches are retried sooner
+# Document detail pages and XML files of one entity are fetched by this many
+# threads; all requests of the process share at most SBIRKA_MAX_CONNECTIONS
+# connections to or.justice.cz.
+SBIRKA_FETCH_WORKERS = 4
+SBIRKA_MAX_CONNECTIONS = 8
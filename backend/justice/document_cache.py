@@ -0,0 +1,67 @@
+"""
+On-disk cache for Sbírka listin files served by DocumentProxyView.
+
+Files are streamed from or.justice.cz to disk once and then served from
+there, with no upstream request. The layout follows the dataset spool:
+
+    <JUSTICE_DOCUMENT_CACHE_DIR>/
+        objects/<sha256>           file contents, named by their SHA-256
+        refs/<download_id>.json    object + content type, filename, size
+        tmp/                       in-progress downloads
+
+The cache is bounded by JUSTICE_DOCUMENT_CACHE_MAX_BYTES (see
+justice.object_store for eviction).
+"""
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from .object_store import ContentAddressedStore
+
+# Download ids are UUIDs; anything else is rejected before touching the disk.
+_DOWNLOAD_ID_RE = re.compile(r"^[A-Za-z0-9-]{1,64}$")
+
+
+class DocumentCache(ContentAddressedStore):
+    """Content-addressed, size-bounded store of proxied document files."""
+
+    object_label = "cached document"
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None):
+        super().__init__(
+            root or settings.JUSTICE_DOCUMENT_CACHE_DIR,
+            max_bytes if max_bytes is not None else settings.JUSTICE_DOCUMENT_CACHE_MAX_BYTES,
+        )
+
+    @staticmethod
+    def is_valid_id(download_id: str) -> bool:
+        return bool(_DOWNLOAD_ID_RE.match(download_id))
+
+    def get(self, download_id: str) -> dict | None:
+        """
+        Cache entry for a download id, or None if it was never cached or evicted.
+
+        The entry carries "path", "sha256", "size", "contentType", "filename"
+        and "cachedAt" (Unix time). Marks the object as used.
+        """
+        return super().get(download_id)
+
+    def reserve(self) -> str:
+        """Create an empty temporary file for a download inside the cache."""
+        return super().reserve(prefix="document-")
+
+    def commit(self, download_id: str, tmp_path: str, content_type: str, filename: str) -> dict:
+        """
+        Move a finished download into the object store and point the
+        download id's ref at it.
+
+        Returns:
+            The cache entry, as returned by get().
+        """
+        return super().commit(
+            download_id,
+            tmp_path,
+            {"contentType": content_type, "filename": filename, "cachedAt": int(time.time())},
+        )
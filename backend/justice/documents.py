@@ -0,0 +1,113 @@
+"""
+Pre-rendered entity documents.
+
+The entity detail, history, persons and addresses endpoints all render the
+same fact tree. Rendering it means loading every fact, person and address of
+the entity, so instead the sync pipeline renders all four responses once per
+changed entity and stores them in EntityDocument, keyed by ICO. The
+endpoints then serve a single primary-key read.
+
+An ICO whose entity was synced before documents existed (or whose document
+entity was removed) is rendered on first request and stored the same way.
+"""
+from collections import defaultdict
+
+from django.db.models import Max
+
+from .models import Entity, EntityDocument, EntityFact
+from .parser import (
+    parse_address,
+    parse_entity_detail,
+    parse_history_entry,
+    parse_person_with_fact,
+)
+
+
+def build_documents(entities: list) -> list[EntityDocument]:
+    """
+    Render the documents of `entities` in two queries (facts with persons,
+    addresses), whatever their number and fact tree depth.
+    """
+    facts_by_entity = defaultdict(list)
+    facts = (
+        EntityFact.objects.filter(entity__in=entities)
+        .select_related("person")
+        .prefetch_related("addresses")
+        .order_by("registration_date", "id")
+    )
+    for fact in facts:
+        facts_by_entity[fact.entity_id].append(fact)
+
+    return [
+        EntityDocument(
+            ico=entity.ico,
+            entity=entity,
+            document=render_document(entity, facts_by_entity[entity.pk]),
+        )
+        for entity in entities
+    ]
+
+
+def render_document(entity, facts: list) -> dict:
+    """
+    All per-entity API responses, from the entity's whole fact tree.
+
+    `facts` must be ordered by (registration_date, id), as build_documents
+    loads them.
+    """
+    history = sorted(
+        facts,
+        key=lambda f: (
+            f.registration_date is None,
+            f.registration_date,
+            f.deletion_date is None,
+            f.deletion_date,
+            f.id,
+        ),
+    )
+    with_person = [f for f in facts if _has_person(f)]
+    addresses = sorted(
+        (address for fact in facts for address in fact.addresses.all()),
+        key=lambda a: a.id,
+    )
+    return {
+        "detail": parse_entity_detail(entity, facts),
+        "history": [parse_history_entry(f) for f in history],
+        "persons": [parse_person_with_fact(f) for f in with_person],
+        "addresses": [parse_address(a) for a in addresses],
+    }
+
+
+def write_documents(entities: list) -> None:
+    """
+    Render and upsert the documents of `entities`.
+
+    An ICO's document is that of its most recently updated entity, as when it
+    is rendered on demand; entities already superseded by a newer one in
+    another dataset are skipped.
+    """
+    latest = dict(
+        Entity.objects.filter(ico__in={entity.ico for entity in entities})
+        .values("ico")
+        .annotate(latest=Max("updated_at"))
+        .values_list("ico", "latest")
+    )
+    current = [
+        entity for entity in entities
+        if entity.updated_at >= latest.get(entity.ico, entity.updated_at)
+    ]
+    documents = {doc.ico: doc for doc in build_documents(current)}
+    EntityDocument.objects.bulk_create(
+        # In ICO order: parallel sync workers then lock shared rows alike.
+        [documents[ico] for ico in sorted(documents)],
+        update_conflicts=True,
+        unique_fields=["ico"],
+        update_fields=["entity", "document", "updated_at"],
+    )
+
+
+def _has_person(fact) -> bool:
+    try:
+        return fact.person is not None
+    except EntityFact.person.RelatedObjectDoesNotExist:
+        return False
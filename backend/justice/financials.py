@@ -0,0 +1,156 @@
+"""
+Persistent store of financial statements from Sbírka listin.
+
+Financial XMLs are parsed once (parse_financial_xml) and kept as
+FinancialStatement rows keyed by (ico, period end, document id). The
+document endpoint serves stored statements instead of downloading the XML
+again, and each stored statement updates the denormalized
+Company.latest_revenue that company search filters and sorts on.
+
+Revenue is the sum of the income statement's sales rows — "I. Tržby z
+prodeje výrobků a služeb" and "II. Tržby za prodej zboží" — for the current
+period, converted from thousands to CZK. Statements in another currency keep
+their rows but carry no revenue.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from company.models import Company
+from company.services import CompanyService
+
+from .models import FinancialStatement
+
+# VZZ rows summed into revenue (both in the full and abbreviated forms).
+REVENUE_ROWS = (1, 2)
+
+_DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+
+def build_statement(ico: str, document_id: str, parsed: dict) -> FinancialStatement | None:
+    """FinancialStatement for a parse_financial_xml result; None without a period end."""
+    metadata = parsed["metadata"]
+    period_to = parse_period_date(metadata.get("periodTo"))
+    if period_to is None:
+        return None
+    return FinancialStatement(
+        ico=ico,
+        period_to=period_to,
+        document_id=document_id,
+        period_from=parse_period_date(metadata.get("periodFrom")),
+        currency=metadata.get("currency", "CZK"),
+        unit=metadata.get("unit", "thousands"),
+        rozsah_rozvaha=metadata.get("rozsahRozvaha", ""),
+        rozsah_vzz=metadata.get("rozsahVzz", ""),
+        aktiva=parsed["aktiva"],
+        pasiva=parsed["pasiva"],
+        vzz=parsed["vzz"],
+        revenue=_revenue(metadata, parsed["vzz"]),
+    )
+
+
+def to_financial_data(statement: FinancialStatement) -> dict:
+    """A stored statement in the parse_financial_xml shape served by the API."""
+    return {
+        "metadata": {
+            "periodFrom": _format_date(statement.period_from),
+            "periodTo": _format_date(statement.period_to),
+            "currency": statement.currency,
+            "unit": statement.unit,
+            "rozsahRozvaha": statement.rozsah_rozvaha,
+            "rozsahVzz": statement.rozsah_vzz,
+        },
+        "aktiva": statement.aktiva,
+        "pasiva": statement.pasiva,
+        "vzz": statement.vzz,
+    }
+
+
+def store_statements(statements: list[FinancialStatement]) -> int:
+    """
+    Upsert statements and refresh latest_revenue of their companies.
+
+    Returns the number of companies whose latest_revenue changed.
+    """
+    if not statements:
+        return 0
+    FinancialStatement.objects.bulk_create(
+        statements,
+        update_conflicts=True,
+        unique_fields=["ico", "period_to", "document_id"],
+        update_fields=[
+            "period_from",
+            "currency",
+            "unit",
+            "rozsah_rozvaha",
+            "rozsah_vzz",
+            "aktiva",
+            "pasiva",
+            "vzz",
+            "revenue",
+            "updated_at",
+        ],
+    )
+    return refresh_latest_revenue({s.ico for s in statements})
+
+
+def refresh_latest_revenue(icos=None) -> int:
+    """
+    Set Company.latest_revenue from the newest statement with a revenue.
+
+    Args:
+        icos: ICOs to refresh; None refreshes every company with statements.
+
+    Returns:
+        The number of companies whose latest_revenue changed.
+    """
+    statements = FinancialStatement.objects.filter(revenue__isnull=False)
+    if icos is not None:
+        statements = statements.filter(ico__in=icos)
+    latest = dict(
+        statements.order_by("ico", "-period_to", "-id")
+        .distinct("ico")
+        .values_list("ico", "revenue")
+    )
+
+    changed = [
+        company
+        for company in Company.objects.filter(ico__in=latest).only("id", "ico", "latest_revenue")
+        if company.latest_revenue != latest[company.ico]
+    ]
+    for company in changed:
+        company.latest_revenue = latest[company.ico]
+    Company.objects.bulk_update(changed, ["latest_revenue"], batch_size=1000)
+    if changed:
+        # Revenue filters change which companies match a search.
+        CompanyService().cache.bump("count")
+    return len(changed)
+
+
+def parse_period_date(value: str | None) -> date | None:
+    """Period date from the XML (DD.MM.YYYY; YYYY-MM-DD accepted too)."""
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value or "", fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _revenue(metadata: dict, vzz: list[dict]) -> Decimal | None:
+    if metadata.get("currency", "CZK") != "CZK":
+        return None
+    # Rows may carry floats; convert each amount through str() before
+    # summing, so float artifacts (0.1 + 0.2) never reach the money field.
+    values = [
+        Decimal(str(row["current"]))
+        for row in vzz
+        if row["row"] in REVENUE_ROWS and row.get("current") is not None
+    ]
+    if not values:
+        return None
+    multiplier = 1000 if metadata.get("unit", "thousands") == "thousands" else 1
+    return sum(values) * multiplier
+
+
+def _format_date(value: date | None) -> str:
+    return value.strftime("%d.%m.%Y") if value else ""
@@ -0,0 +1,114 @@
+"""
+Django management command for filling the financial statement store.
+
+Fetches the Sbírka listin documents of companies, which stores every parsed
+financial statement XML and updates Company.latest_revenue (see
+justice.financials).
+
+Usage:
+    # Fetch statements of specific companies
+    python manage.py financial_sync --ico 27082440 --ico 00027006
+
+    # Fetch statements of up to 500 companies that have none stored yet,
+    # least recently checked first (repeated runs move on to new companies)
+    python manage.py financial_sync --missing --limit 500
+
+    # Recompute Company.latest_revenue from the stored statements only
+    python manage.py financial_sync --refresh-revenue
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, OuterRef, Subquery
+
+from company.models import Company
+from core.exceptions import ExternalAPIError
+from justice.financials import refresh_latest_revenue
+from justice.models import FinancialStatement, SbirkaSubject
+from justice.services import JusticeService
+
+
+class Command(BaseCommand):
+    help = "Store financial statements from Sbírka listin and update company revenues"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ico", action="append", default=[], help="Company ICO (repeatable)"
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Companies from the Justice registry without stored statements",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Maximum companies fetched with --missing (default: 100)",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between companies, to spare or.justice.cz (default: 1)",
+        )
+        parser.add_argument(
+            "--refresh-revenue",
+            action="store_true",
+            help="Only recompute latest_revenue from stored statements (no network)",
+        )
+
+    def handle(self, *args, **options):
+        if options["refresh_revenue"]:
+            changed = refresh_latest_revenue()
+            self.stdout.write(self.style.SUCCESS(f"Updated revenue of {changed} companies."))
+            return
+
+        icos = [ico.zfill(8) for ico in options["ico"]]
+        if options["missing"]:
+            icos += self._missing_icos(options["limit"])
+        if not icos:
+            raise CommandError("Pass --ico, --missing or --refresh-revenue.")
+
+        service = JusticeService()
+        stored_before = FinancialStatement.objects.count()
+        failed = 0
+        for i, ico in enumerate(dict.fromkeys(icos)):
+            if i and options["delay"]:
+                time.sleep(options["delay"])
+            try:
+                result = service.get_entity_documents(ico)
+            except ExternalAPIError as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"  ✗ {ico}: {e.message}"))
+                continue
+            statements = sum(1 for doc in result["documents"] if doc["financialData"])
+            suffix = " (incomplete)" if result.get("incomplete") else ""
+            self.stdout.write(f"  ✓ {ico}: {statements} financial statements{suffix}")
+
+        stored = FinancialStatement.objects.count() - stored_before
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {stored} new statements stored, {failed} failed.")
+        )
+
+    @staticmethod
+    def _missing_icos(limit: int) -> list[str]:
+        """
+        Companies with a Justice entity and no stored statements.
+
+        Most companies file PDF scans only and never get a statement, so
+        candidates are ordered by when their Sbírka listin was last checked
+        (SbirkaSubject.documents_checked_at): never checked first, then the
+        stalest. Each run thus continues where the previous one stopped.
+        """
+        checked_at = SbirkaSubject.objects.filter(ico=OuterRef("ico")).values(
+            "documents_checked_at"
+        )[:1]
+        return list(
+            Company.objects.filter(justice_entities__isnull=False)
+            .exclude(ico__in=FinancialStatement.objects.values("ico"))
+            .distinct()
+            .annotate(documents_checked_at=Subquery(checked_at))
+            .order_by(F("documents_checked_at").asc(nulls_first=True), "id")
+            .values_list("ico", flat=True)[:limit]
+        )
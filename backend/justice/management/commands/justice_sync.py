@@ -11,12 +11,43 @@ Usage:
     # Force re-sync a specific dataset
     python manage.py justice_sync --dataset sro-actual-praha-2026 --force
 
+    # Larger ingestion batches (fewer, bigger INSERTs)
+    python manage.py justice_sync --legal-form sro --batch-size 2000
+
+    # Load facts, persons and addresses with PostgreSQL COPY
+    python manage.py justice_sync --legal-form sro --loader copy
+
+    # Sync datasets in parallel worker processes
+    python manage.py justice_sync --year 2026 --workers 4
+
+    # Parse each file with 4 parser processes
+    python manage.py justice_sync --dataset sro-actual-praha-2026 --parse-workers 4
+
+    # Re-parse the locally spooled files without any network access
+    python manage.py justice_sync --year 2026 --from-spool
+
     # Dry run — list matching datasets without syncing
     python manage.py justice_sync --type actual --year 2026 --dry-run
 """
+import argparse
+import time
+
 from django.core.management.base import BaseCommand
 
-from justice.services import JusticeSyncService
+from company.services import CompanyService
+from justice.constants import SYNC_BATCH_SIZE
+from justice.services import JusticeService, JusticeSyncService
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts and sizes: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 class Command(BaseCommand):
@@ -45,6 +76,36 @@ class Command(BaseCommand):
             action="store_true",
             help="Re-sync even if file size is unchanged",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=_positive_int,
+            default=SYNC_BATCH_SIZE,
+            help=f"Subjekts per bulk ingestion batch (default: {SYNC_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--loader",
+            type=str,
+            choices=["orm", "copy"],
+            default="orm",
+            help="Row loader: ORM bulk_create or PostgreSQL COPY (default: orm)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=_positive_int,
+            default=1,
+            help="Number of datasets synced in parallel processes (default: 1)",
+        )
+        parser.add_argument(
+            "--parse-workers",
+            type=_positive_int,
+            default=1,
+            help="XML parser processes per dataset (default: 1, parse in-process)",
+        )
+        parser.add_argument(
+            "--from-spool",
+            action="store_true",
+            help="Re-parse previously downloaded files from the local spool (no network)",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -52,30 +113,40 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        sync_service = JusticeSyncService()
+        sync_service = JusticeSyncService(
+            batch_size=options["batch_size"],
+            loader=options["loader"],
+            parse_workers=options["parse_workers"],
+        )
 
         if options["dataset"]:
             self._sync_single(sync_service, options)
         elif options["dry_run"]:
             self._dry_run(sync_service, options)
+            return
         else:
             self._sync_multiple(sync_service, options)
+        self._write_cache_invalidations()
 
     def _sync_single(self, sync_service, options):
         """Sync a single dataset by ID."""
         dataset_id = options["dataset"]
         self.stdout.write(f"Syncing dataset: {dataset_id}")
 
-        result = sync_service.sync_dataset(dataset_id, force=options["force"])
+        result = sync_service.sync_dataset(
+            dataset_id, force=options["force"], from_spool=options["from_spool"]
+        )
 
         if result["status"] == "completed":
             self.stdout.write(
                 self.style.SUCCESS(
                     f"  ✓ {result['datasetId']}: "
                     f"{result['entityCount']} entities "
-                    f"in {result['durationSeconds']}s"
+                    f"in {result['durationSeconds']}s "
+                    f"({result.get('rowsPerSecond', 0)} rows/s)"
                 )
             )
+            self.stdout.write(f"    {self._format_changes(result)}")
         elif result["status"] == "skipped":
             self.stdout.write(f"  – {result['datasetId']}: skipped (unchanged)")
         else:
@@ -96,24 +167,31 @@ class Command(BaseCommand):
             f"{f' year {year}' if year else ''}"
         )
 
+        start = time.monotonic()
         results = sync_service.sync_all_actual(
             legal_forms=legal_forms,
             locations=locations,
             year=year,
             force=options["force"],
+            workers=options["workers"],
+            from_spool=options["from_spool"],
         )
+        wall_seconds = time.monotonic() - start
 
         completed = sum(1 for r in results if r["status"] == "completed")
         skipped = sum(1 for r in results if r["status"] == "skipped")
         failed = sum(1 for r in results if r["status"] == "failed")
         total_entities = sum(r.get("entityCount", 0) for r in results)
+        total_rows = sum(r.get("rowCount", 0) for r in results)
 
         for result in results:
             if result["status"] == "completed":
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"  ✓ {result['datasetId']}: "
-                        f"{result['entityCount']} entities"
+                        f"{result['entityCount']} entities "
+                        f"({result.get('rowsPerSecond', 0)} rows/s) — "
+                        f"{self._format_changes(result)}"
                     )
                 )
             elif result["status"] == "skipped":
@@ -130,10 +208,32 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(
                 f"Done: {completed} completed, {skipped} skipped, {failed} failed. "
-                f"{total_entities} total entities."
+                f"{total_entities} total entities, "
+                f"{round(total_rows / wall_seconds) if wall_seconds else 0} rows/s."
             )
         )
 
+    def _write_cache_invalidations(self):
+        """Running totals of sync-driven cache invalidations."""
+        justice = JusticeService().cache.invalidation_counts("search", "count", "entity")
+        company = CompanyService().cache.invalidation_counts("count", "detail")
+        self.stdout.write(
+            "Cache invalidations (total): "
+            f"justice search {justice['search']}, count {justice['count']}, "
+            f"entity {justice['entity']}; "
+            f"company count {company['count']}, detail {company['detail']}"
+        )
+
+    @staticmethod
+    def _format_changes(result: dict) -> str:
+        """Incremental diff summary: inserted/updated/unchanged/removed."""
+        return (
+            f"{result.get('insertedCount', 0)} inserted, "
+            f"{result.get('updatedCount', 0)} updated, "
+            f"{result.get('unchangedCount', 0)} unchanged, "
+            f"{result.get('removedCount', 0)} removed"
+        )
+
     def _dry_run(self, sync_service, options):
         """List matching datasets without syncing."""
         all_ids = sync_service.client.list_datasets()
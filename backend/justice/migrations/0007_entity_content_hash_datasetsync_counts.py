@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-17 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0006_entity_company'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsync',
+            name='inserted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='removed_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='unchanged_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='updated_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='entity',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0007_entity_content_hash_datasetsync_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsync',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='last_modified',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='resource_hash',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='datasetsync',
+            name='resource_last_modified',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
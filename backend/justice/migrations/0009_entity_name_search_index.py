@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from core.services.search import create_name_search_index, drop_name_search_index
+
+INDEX_NAME = "justice_entity_name_trgm"
+
+
+def create_index(apps, schema_editor):
+    create_name_search_index(schema_editor, "justice_entity", INDEX_NAME)
+
+
+def drop_index(apps, schema_editor):
+    drop_name_search_index(schema_editor, INDEX_NAME)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0008_datasetsync_download_validators'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
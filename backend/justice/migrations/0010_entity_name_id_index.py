@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-17 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0009_entity_name_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='entity',
+            name='justice_ent_name_b4bac5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='entity',
+            index=models.Index(fields=['name', 'id'], name='justice_entity_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-17 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0010_entity_name_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntityDocument',
+            fields=[
+                ('ico', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('document', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('entity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='document', to='justice.entity')),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-17 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0011_entitydocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinancialStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ico', models.CharField(max_length=20)),
+                ('period_to', models.DateField()),
+                ('document_id', models.CharField(max_length=100)),
+                ('period_from', models.DateField(blank=True, null=True)),
+                ('currency', models.CharField(blank=True, default='CZK', max_length=3)),
+                ('unit', models.CharField(blank=True, default='thousands', max_length=20)),
+                ('rozsah_rozvaha', models.CharField(blank=True, default='', max_length=20)),
+                ('rozsah_vzz', models.CharField(blank=True, default='', max_length=20)),
+                ('aktiva', models.JSONField(default=list)),
+                ('pasiva', models.JSONField(default=list)),
+                ('vzz', models.JSONField(default=list)),
+                ('revenue', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('ico', 'period_to', 'document_id'), name='unique_financial_statement')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-17 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('justice', '0012_financialstatement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SbirkaSubject',
+            fields=[
+                ('ico', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('subjekt_id', models.CharField(max_length=20)),
+                ('documents_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SbirkaDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document_id', models.CharField(max_length=50)),
+                ('spis_id', models.CharField(max_length=50)),
+                ('document_number', models.CharField(blank=True, default='', max_length=200)),
+                ('document_type', models.CharField(blank=True, default='', max_length=500)),
+                ('position', models.IntegerField(default=0)),
+                ('files', models.JSONField(blank=True, null=True)),
+                ('financial_checked', models.BooleanField(default=False)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='justice.sbirkasubject')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('subject', 'document_id'), name='unique_sbirka_document')],
+            },
+        ),
+    ]
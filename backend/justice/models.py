@@ -43,12 +43,15 @@ class Entity(models.Model):
     file_reference = models.CharField(max_length=500, blank=True, default="")
     dataset_id = models.CharField(max_length=200, blank=True, default="")
     is_active = models.BooleanField(default=True)
+    # SHA-256 of the parsed Subjekt — lets a re-sync skip unchanged entities.
+    content_hash = models.CharField(max_length=64, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=["name"]),
+            # Search ordering; serves keyset pagination on (name, id).
+            models.Index(fields=["name", "id"], name="justice_entity_name_id_idx"),
             models.Index(fields=["legal_form_code"]),
             models.Index(fields=["court_code"]),
             models.Index(fields=["is_active"]),
@@ -161,6 +164,111 @@ class Address(models.Model):
         return self.full_address or f"{self.street} {self.house_number}, {self.municipality}"
 
 
+class EntityDocument(models.Model):
+    """
+    Pre-rendered detail/history/persons/addresses responses for an ICO.
+
+    Written by the sync pipeline for every inserted or changed entity (see
+    justice.documents); points at the entity it was rendered from, which is
+    the most recently updated entity with that ICO.
+    """
+
+    ico = models.CharField(max_length=20, primary_key=True)
+    entity = models.OneToOneField(
+        Entity, on_delete=models.CASCADE, related_name="document"
+    )
+    document = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"EntityDocument {self.ico}"
+
+
+class SbirkaSubject(models.Model):
+    """
+    An ICO's subject on or.justice.cz and the state of its document index.
+
+    The subjektId of an ICO never changes, so it is looked up once; the
+    document list only grows, so refreshes just add new documents
+    (see justice.sbirka_index).
+    """
+
+    ico = models.CharField(max_length=20, primary_key=True)
+    subjekt_id = models.CharField(max_length=20)
+    # When the document list page was last fetched; null = never.
+    documents_checked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"SbirkaSubject {self.ico} ({self.subjekt_id})"
+
+
+class SbirkaDocument(models.Model):
+    """A document in a subject's Sbírka listin, with its files once fetched."""
+
+    subject = models.ForeignKey(
+        SbirkaSubject, on_delete=models.CASCADE, related_name="documents"
+    )
+    document_id = models.CharField(max_length=50)
+    spis_id = models.CharField(max_length=50)
+    document_number = models.CharField(max_length=200, blank=True, default="")
+    document_type = models.CharField(max_length=500, blank=True, default="")
+    # Position on the list page (0 = first).
+    position = models.IntegerField(default=0)
+    # Download links from the detail page; null until fetched successfully.
+    files = models.JSONField(null=True, blank=True)
+    # Whether the document's XML (if any) has been downloaded and parsed.
+    financial_checked = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "document_id"],
+                name="unique_sbirka_document",
+            )
+        ]
+
+    def __str__(self):
+        return f"SbirkaDocument {self.document_id}"
+
+
+class FinancialStatement(models.Model):
+    """
+    A financial statement (účetní závěrka) parsed from a Sbírka listin XML.
+
+    Stored on first fetch of an entity's documents and by the
+    financial_sync command, so the XML is downloaded and parsed only once.
+    Rows are kept in the parse_financial_xml shape. `revenue` (CZK) feeds
+    Company.latest_revenue (see justice.financials).
+    """
+
+    ico = models.CharField(max_length=20)
+    period_to = models.DateField()
+    document_id = models.CharField(max_length=100)
+    period_from = models.DateField(null=True, blank=True)
+    currency = models.CharField(max_length=3, blank=True, default="CZK")
+    unit = models.CharField(max_length=20, blank=True, default="thousands")
+    rozsah_rozvaha = models.CharField(max_length=20, blank=True, default="")
+    rozsah_vzz = models.CharField(max_length=20, blank=True, default="")
+    aktiva = models.JSONField(default=list)
+    pasiva = models.JSONField(default=list)
+    vzz = models.JSONField(default=list)
+    revenue = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ico", "period_to", "document_id"],
+                name="unique_financial_statement",
+            )
+        ]
+
+    def __str__(self):
+        return f"FinancialStatement {self.ico} {self.period_to}"
+
+
 class DatasetSync(models.Model):
     """Tracks sync status per dataset for incremental updates."""
 
@@ -180,7 +288,18 @@ class DatasetSync(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     last_synced_at = models.DateTimeField(null=True, blank=True)
     file_size = models.BigIntegerField(null=True, blank=True)
+    # Change detection: HTTP validators of the last download and the CKAN
+    # resource metadata it came from.
+    etag = models.CharField(max_length=200, blank=True, default="")
+    last_modified = models.CharField(max_length=100, blank=True, default="")
+    resource_last_modified = models.CharField(max_length=100, blank=True, default="")
+    resource_hash = models.CharField(max_length=200, blank=True, default="")
     entity_count = models.IntegerField(default=0)
+    # Outcome of the last incremental sync run.
+    inserted_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    unchanged_count = models.IntegerField(default=0)
+    removed_count = models.IntegerField(default=0)
     error_message = models.TextField(blank=True, default="")
     duration_seconds = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,180 @@
+"""
+Content-addressed, size-bounded file store on local disk.
+
+Base of the dataset spool (justice.spool) and the Sbírka document cache
+(justice.document_cache). Files are stored once per content and reached
+through named refs:
+
+    <root>/
+        objects/<sha256><suffix>   file contents, named by their SHA-256
+        refs/<ref_id>.json         object of a ref + the subclass's metadata
+        tmp/                       in-progress downloads
+
+The store is bounded by `max_bytes`. Objects are evicted least recently
+used first; "use" is tracked through the object's mtime, which is bumped
+whenever a ref resolves to it. Refs to evicted objects are left behind and
+read as misses.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentAddressedStore:
+    """Files stored by SHA-256, reached through JSON refs, evicted LRU."""
+
+    # Extension of object files, e.g. ".xml.gz".
+    object_suffix = ""
+    # What an object is, for the eviction log.
+    object_label = "file"
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+        self.tmp_dir = self.root / "tmp"
+
+    def get(self, ref_id: str) -> dict | None:
+        """
+        Entry of a ref, or None if it was never stored or its object evicted.
+
+        The entry carries "path", "sha256", "size" and the metadata stored by
+        commit(). Marks the object as used.
+        """
+        try:
+            entry = json.loads(self._ref_path(ref_id).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        path = self._object_path(entry["sha256"])
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        entry["path"] = str(path)
+        return entry
+
+    def ref_ids(self) -> list[str]:
+        """IDs of all refs whose object is still stored."""
+        if not self.refs_dir.is_dir():
+            return []
+        return sorted(
+            ref.stem
+            for ref in self.refs_dir.glob("*.json")
+            if self.get(ref.stem) is not None
+        )
+
+    def reserve(self, prefix: str = "", suffix: str = "") -> str:
+        """Create an empty temporary file for a download inside the store."""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=self.tmp_dir)
+        os.close(fd)
+        return tmp_path
+
+    def commit(self, ref_id: str, tmp_path: str, metadata: dict) -> dict:
+        """
+        Move a finished download into the object store and point the ref at it.
+
+        Args:
+            ref_id: Ref the file is stored under.
+            tmp_path: Path returned by reserve(), fully written.
+            metadata: JSON-serializable fields stored with the ref.
+
+        Returns:
+            The entry, as returned by get().
+        """
+        sha256 = file_sha256(tmp_path)
+        size = os.path.getsize(tmp_path)
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        path = self._object_path(sha256)
+        if path.exists():
+            os.remove(tmp_path)
+            os.utime(path)
+        else:
+            os.replace(tmp_path, path)
+
+        entry = {"sha256": sha256, "size": size, **metadata}
+        self.refs_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self._ref_path(ref_id), json.dumps(entry))
+
+        self.evict(keep=path)
+        return {**entry, "path": str(path)}
+
+    def evict(self, keep: Path | None = None) -> int:
+        """
+        Delete least recently used objects until the store fits max_bytes.
+
+        `keep` (the object just written) is never evicted. Returns the number
+        of bytes freed.
+        """
+        if not self.objects_dir.is_dir():
+            return 0
+
+        objects = []
+        for path in self.objects_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            objects.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _mtime, size, _path in objects)
+        freed = 0
+        for _mtime, size, path in sorted(objects):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            freed += size
+            logger.info("Evicted %s %s (%d bytes)", self.object_label, path.name, size)
+        return freed
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects_dir / f"{sha256}{self.object_suffix}"
+
+    def _ref_path(self, ref_id: str) -> Path:
+        return self.refs_dir / f"{ref_id}.json"
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """
+    Write a small text file via rename so readers never see it half-written.
+
+    The temporary file has a unique name, so concurrent writers of the same
+    path (two workers storing the same ref) never share it; the last rename
+    wins.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}-", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -6,9 +6,24 @@ Output: English dicts matching the TypeScript entity types (camelCase keys).
 """
 from __future__ import annotations
 
+from collections import defaultdict
+
 
 def parse_entity_detail(entity, facts: list) -> dict:
-    """Full entity representation with nested facts, persons, and addresses."""
+    """
+    Full entity representation with nested facts, persons, and addresses.
+
+    `facts` is the entity's whole fact tree as a flat list (sub-facts of every
+    depth included). The tree is rebuilt from parent_fact_id: top-level facts
+    keep the list order, sub-facts follow their id (document) order.
+    """
+    children = defaultdict(list)
+    for fact in facts:
+        if fact.parent_fact_id is not None:
+            children[fact.parent_fact_id].append(fact)
+    for siblings in children.values():
+        siblings.sort(key=lambda f: f.id)
+
     return {
         "ico": entity.ico,
         "name": entity.name,
@@ -22,7 +37,7 @@ def parse_entity_detail(entity, facts: list) -> dict:
         "registrationDate": _date_str(entity.registration_date),
         "deletionDate": _date_str(entity.deletion_date),
         "isActive": entity.is_active,
-        "facts": [_parse_fact(f) for f in facts if f.parent_fact_id is None],
+        "facts": [_parse_fact(f, children) for f in facts if f.parent_fact_id is None],
     }
 
 
@@ -126,7 +141,7 @@ def parse_document_list(documents: list[dict]) -> list[dict]:
             "spisId": doc["spisId"],
             "documentNumber": doc.get("documentNumber", ""),
             "documentType": doc.get("documentType", ""),
-            "files": doc.get("files", []),
+            "files": doc.get("files") or [],
             "financialData": doc.get("financialData"),
         }
         for doc in documents
@@ -136,8 +151,12 @@ def parse_document_list(documents: list[dict]) -> list[dict]:
 # --- Internal helpers ---
 
 
-def _parse_fact(fact) -> dict:
-    """Transform a single EntityFact into an API dict with nested person/addresses."""
+def _parse_fact(fact, children: dict) -> dict:
+    """
+    Transform a single EntityFact into an API dict with nested person/addresses.
+
+    `children` maps a fact id to its sub-facts (see parse_entity_detail).
+    """
     person = None
     try:
         p = fact.person
@@ -161,12 +180,7 @@ def _parse_fact(fact) -> dict:
     except Exception:
         pass
 
-    sub_facts = []
-    try:
-        for sf in fact.sub_facts.all():
-            sub_facts.append(_parse_fact(sf))
-    except Exception:
-        pass
+    sub_facts = [_parse_fact(sf, children) for sf in children.get(fact.id, ())]
 
     return {
         "header": fact.header,
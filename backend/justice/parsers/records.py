@@ -0,0 +1,155 @@
+"""
+Record types produced by the dataset XML parser.
+
+One immutable NamedTuple per XML element kind. They replace the per-element
+dicts the parser used to build: a tuple stores its fields inline instead of
+in a hash table, which matters for large entities with hundreds of facts.
+Absent sub-records are None and absent text is the shared empty string;
+both are also the field defaults.
+
+as_dict() gives the plain-dict form (same keys as the parser's original dict
+output). It is what the incremental sync hashes, so content hashes of stored
+entities do not change.
+"""
+from typing import NamedTuple
+
+
+class UdajTyp(NamedTuple):
+    """<udajTyp> — fact type."""
+
+    code: str = ""
+    name: str = ""
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+class PravniForma(NamedTuple):
+    """<pravniForma> — legal form."""
+
+    code: str = ""
+    name: str = ""
+    abbreviation: str = ""
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+class SpisZn(NamedTuple):
+    """<spisZn> — file reference with court details."""
+
+    court_code: str = ""
+    court_name: str = ""
+    section: str = ""
+    insert: str = ""
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+class Osoba(NamedTuple):
+    """
+    <osoba> — natural person (type "natural") or legal person (type "legal").
+
+    Fields of the other kind are left empty.
+    """
+
+    type: str = ""
+    person_text: str = ""
+    first_name: str = ""
+    last_name: str = ""
+    birth_date: str = ""
+    title_before: str = ""
+    title_after: str = ""
+    entity_name: str = ""
+    ico: str = ""
+    reg_number: str = ""
+    euid: str = ""
+
+    @property
+    def is_natural(self) -> bool:
+        return self.type == "natural"
+
+    def as_dict(self) -> dict:
+        result = {"person_text": self.person_text, "type": self.type}
+        if self.is_natural:
+            result.update({
+                "first_name": self.first_name,
+                "last_name": self.last_name,
+                "birth_date": self.birth_date,
+                "title_before": self.title_before,
+                "title_after": self.title_after,
+            })
+        else:
+            result.update({
+                "entity_name": self.entity_name,
+                "ico": self.ico,
+                "reg_number": self.reg_number,
+                "euid": self.euid,
+            })
+        return result
+
+
+class Adresa(NamedTuple):
+    """<adresa> or <bydliste> — address with all components."""
+
+    country: str = ""
+    municipality: str = ""
+    city_part: str = ""
+    street: str = ""
+    house_number: str = ""
+    orientation_number: str = ""
+    evidence_number: str = ""
+    number_text: str = ""
+    postal_code: str = ""
+    district: str = ""
+    full_address: str = ""
+    supplementary_text: str = ""
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+class Udaj(NamedTuple):
+    """<Udaj> — one registry fact, with nested sub-facts."""
+
+    header: str = ""
+    registration_date: str = ""
+    deletion_date: str = ""
+    value_text: str = ""
+    value_data: dict | None = None
+    membership_from: str = ""
+    membership_to: str = ""
+    function_from: str = ""
+    function_to: str = ""
+    function_name: str = ""
+    fact_type: UdajTyp | None = None
+    legal_form: PravniForma | None = None
+    file_reference: SpisZn | None = None
+    person: Osoba | None = None
+    address: Adresa | None = None
+    residence: Adresa | None = None
+    sub_facts: tuple["Udaj", ...] = ()
+
+    def as_dict(self) -> dict:
+        result = self._asdict()
+        for key in ("fact_type", "legal_form", "file_reference", "person", "address", "residence"):
+            if result[key] is not None:
+                result[key] = result[key].as_dict()
+        result["sub_facts"] = [fact.as_dict() for fact in self.sub_facts]
+        return result
+
+
+class Subjekt(NamedTuple):
+    """<Subjekt> — one registered entity and its facts."""
+
+    name: str = ""
+    ico: str = ""
+    registration_date: str = ""
+    deletion_date: str = ""
+    facts: tuple[Udaj, ...] = ()
+
+    def as_dict(self) -> dict:
+        result = self._asdict()
+        result["facts"] = [fact.as_dict() for fact in self.facts]
+        return result
@@ -0,0 +1,87 @@
+"""
+Single-pass parsers for the or.justice.cz Sbírka listin HTML pages.
+
+Both pages are scanned once with precompiled patterns, in O(page size):
+
+- list page (vypis-sl-firma): one alternation regex tokenizes the page into
+  document detail links (with the document number in their <span>) and
+  `class="symbol"` type spans; a link opens a row and the type spans that
+  follow it, up to the next link, are its document types.
+- detail page (vypis-sl-detail): each download link is a file; its size
+  ("(N kB") and page count ("počet stran: N") are searched for in the
+  FILE_METADATA_WINDOW characters after the link text only.
+
+Every function is pure — no network calls, no side effects.
+"""
+import html as html_module
+import re
+from collections.abc import Iterator
+
+# File metadata is looked for this many characters after the link text.
+FILE_METADATA_WINDOW = 100
+
+_DOCUMENT_TOKENS = re.compile(
+    r"vypis-sl-detail\?dokument=(?P<doc>\d+)&amp;subjektId=\d+&amp;spis=(?P<spis>\d+)"
+    r"(?:[^>]*><span>(?P<number>[^<]+)</span>)?"
+    r'|class="symbol">(?P<type>[^<]+)</span>'
+)
+
+_FILE_LINK = re.compile(
+    r'download\?id=(?P<id>[a-f0-9-]+)"[^>]*>\s*(?:<[^>]+>)?\s*(?P<name>[^<]+)'
+)
+
+_FILE_SIZE = re.compile(r"\((\d+)\s*kB")
+_FILE_PAGES = re.compile(r"počet stran:\s*(\d+)")
+
+
+def iter_document_rows(html: str, subjekt_id: str) -> Iterator[dict]:
+    """Document rows of a list page, in page order."""
+    row = None
+    types = []
+    for token in _DOCUMENT_TOKENS.finditer(html):
+        doc_type = token.group("type")
+        if doc_type is not None:
+            if row is not None:
+                types.append(doc_type)
+            continue
+
+        if row is not None:
+            row["documentType"] = ", ".join(types)
+            yield row
+        number = token.group("number") or ""
+        row = {
+            "documentId": token.group("doc"),
+            "subjektId": subjekt_id,
+            "spisId": token.group("spis"),
+            "documentNumber": html_module.unescape(number).replace("\xa0", " ").strip(),
+            "documentType": "",
+        }
+        types = []
+
+    if row is not None:
+        row["documentType"] = ", ".join(types)
+        yield row
+
+
+def iter_file_links(html: str) -> Iterator[dict]:
+    """Downloadable files of a detail page, in page order."""
+    for link in _FILE_LINK.finditer(html):
+        filename = link.group("name").strip()
+        # Privacy notices and other page furniture, not filed documents.
+        if "GDPR" in filename or "Informace" in filename:
+            continue
+
+        # Searched in place, bounded to the window — no slice per link.
+        end = link.end()
+        size = _FILE_SIZE.search(html, end, end + FILE_METADATA_WINDOW)
+        pages = _FILE_PAGES.search(html, end, end + FILE_METADATA_WINDOW)
+
+        lowered = filename.lower()
+        yield {
+            "downloadId": link.group("id"),
+            "filename": filename,
+            "sizeKb": int(size.group(1)) if size else None,
+            "pageCount": int(pages.group(1)) if pages else None,
+            "isXml": lowered.endswith(".xml"),
+            "isPdf": lowered.endswith(".pdf"),
+        }
@@ -4,44 +4,157 @@ Streaming XML parser for Czech Justice open data files.
 Uses lxml iterparse to process one <Subjekt> at a time, enabling parsing of
 files hundreds of megabytes in size without loading the entire DOM into memory.
 
-Handles gzip-compressed input streams transparently.
+Dataset files are downloaded into the spool first (justice.spool) and parsed
+from disk; the gzip stream is decompressed and parsed incrementally, so memory
+stays flat regardless of file size.
+
+parse_xml_file_parallel spreads the CPU-bound element-to-record work over
+several processes: the calling process splits the decompressed XML at
+<Subjekt> boundaries and workers parse the byte slices, with results yielded
+in file order.
 
 Every function is pure or a generator — no database calls, no side effects
-beyond yielding parsed dicts.
+beyond yielding parsed records (see records.py).
 """
 import gzip
-from io import BytesIO
-from typing import Iterator
+import multiprocessing
+import re
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
 
 from lxml import etree
 
+from .records import Adresa, Osoba, PravniForma, SpisZn, Subjekt, Udaj, UdajTyp
+
+# Subjekts per byte slice shipped to a parser worker.
+PARALLEL_CHUNK_RECORDS = 500
+# Decompressed bytes read per step while splitting.
+_SPLIT_READ_SIZE = 1024 * 1024
+
+_SUBJEKT_START = re.compile(rb"<Subjekt[\s>]")
+_SUBJEKT_END = b"</Subjekt>"
+
+
+def parse_xml_file(path: str) -> Iterator[Subjekt]:
+    """
+    Parse a gzipped XML file on disk, yielding one Subjekt record at a time.
+
+    Args:
+        path: Path to a downloaded .xml.gz file.
+
+    Yields:
+        Subjekt record with all nested udaje, osoba, adresa.
+    """
+    with gzip.open(path, "rb") as gz_file:
+        yield from _iterparse_subjekts(gz_file)
+
 
-def parse_xml_stream(data_stream: Iterator[bytes]) -> Iterator[dict]:
+def _iterparse_subjekts(xml_file) -> Iterator[Subjekt]:
+    """Incrementally parse <Subjekt> elements from a decompressed file object."""
+    context = etree.iterparse(xml_file, events=("end",), tag="Subjekt")
+    for _event, elem in context:
+        yield _parse_subjekt(elem)
+        # Free memory: clear this element and remove preceding siblings.
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def parse_xml_file_parallel(
+    path: str, workers: int, records_per_chunk: int = PARALLEL_CHUNK_RECORDS
+) -> Iterator[Subjekt]:
     """
-    Parse a gzipped XML stream, yielding one Subjekt dict at a time.
+    Parse a gzipped XML file on disk using a pool of parser processes.
+
+    Yields exactly what parse_xml_file yields, in the same order. At most
+    2 × workers slices are in flight, which bounds memory use.
 
     Args:
-        data_stream: Iterator of raw bytes (gzip-compressed XML).
+        path: Path to a downloaded .xml.gz file.
+        workers: Number of parser processes.
+        records_per_chunk: Subjekts per slice sent to a worker.
 
     Yields:
-        Parsed Subjekt record with all nested udaje, osoba, adresa.
+        Subjekt record with all nested udaje, osoba, adresa.
+    """
+    # spawn: the workers only need lxml, and must not inherit the caller's
+    # DB connections or threads.
+    with gzip.open(path, "rb") as gz_file, ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pending = deque()
+        for chunk in split_subjekt_chunks(gz_file, records_per_chunk):
+            pending.append(executor.submit(_parse_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def split_subjekt_chunks(
+    xml_file: BinaryIO, records_per_chunk: int = PARALLEL_CHUNK_RECORDS
+) -> Iterator[bytes]:
     """
-    raw_buffer = BytesIO()
-    for chunk in data_stream:
-        raw_buffer.write(chunk)
-    raw_buffer.seek(0)
-
-    with gzip.GzipFile(fileobj=raw_buffer) as gz_file:
-        context = etree.iterparse(gz_file, events=("end",), tag="Subjekt")
-        for _event, elem in context:
-            yield _parse_subjekt(elem)
-            # Free memory: clear this element and remove preceding siblings.
-            elem.clear()
-            while elem.getprevious() is not None:
-                del elem.getparent()[0]
-
-
-def parse_xml_bytes(xml_bytes: bytes, is_gzipped: bool = False) -> Iterator[dict]:
+    Split a decompressed XML file into standalone documents of whole Subjekts.
+
+    Each yielded document is the original XML declaration (if any) followed by
+    an <xml> root holding up to `records_per_chunk` consecutive <Subjekt>
+    elements, copied byte for byte. Only the tags are scanned; nothing is
+    parsed here.
+    """
+    buffer = b""
+    declaration = None  # None until the prologue before the first Subjekt is seen
+    scan = 0  # buffer offset from which to look for the next </Subjekt>
+    count = 0
+    eof = False
+
+    while not eof:
+        block = xml_file.read(_SPLIT_READ_SIZE)
+        eof = not block
+        buffer += block
+
+        if declaration is None:
+            first = _SUBJEKT_START.search(buffer)
+            if first is None:
+                continue
+            prologue = buffer[: first.start()]
+            declaration = (
+                prologue[: prologue.index(b"?>") + 2]
+                if prologue.lstrip().startswith(b"<?xml")
+                else b""
+            )
+            buffer = buffer[first.start() :]
+
+        while True:
+            end = buffer.find(_SUBJEKT_END, scan)
+            if end == -1:
+                # Rescan the tail next time, in case an end tag was cut off.
+                scan = max(scan, len(buffer) - len(_SUBJEKT_END) + 1)
+                break
+            scan = end + len(_SUBJEKT_END)
+            count += 1
+            if count == records_per_chunk:
+                yield _wrap_chunk(declaration, buffer[:scan])
+                buffer = buffer[scan:]
+                scan = count = 0
+
+    if count:
+        yield _wrap_chunk(declaration, buffer[:scan])
+
+
+def _wrap_chunk(declaration: bytes, subjekts: bytes) -> bytes:
+    return declaration + b"<xml>" + subjekts + b"</xml>"
+
+
+def _parse_chunk(chunk: bytes) -> list[Subjekt]:
+    """Worker entry point: parse one slice produced by split_subjekt_chunks."""
+    return list(parse_xml_bytes(chunk))
+
+
+def parse_xml_bytes(xml_bytes: bytes, is_gzipped: bool = False) -> Iterator[Subjekt]:
     """
     Parse XML from bytes. Convenience for testing or small files.
 
@@ -50,7 +163,7 @@ def parse_xml_bytes(xml_bytes: bytes, is_gzipped: bool = False) -> Iterator[dict
         is_gzipped: Whether the input is gzip-compressed.
 
     Yields:
-        Parsed Subjekt records.
+        Subjekt records.
     """
     if is_gzipped:
         xml_bytes = gzip.decompress(xml_bytes)
@@ -59,117 +172,125 @@ def parse_xml_bytes(xml_bytes: bytes, is_gzipped: bool = False) -> Iterator[dict
         yield _parse_subjekt(subjekt)
 
 
-def _parse_subjekt(elem) -> dict:
-    """Parse a single <Subjekt> element into a dict."""
-    return {
-        "name": _text(elem, "nazev"),
-        "ico": _text(elem, "ico"),
-        "registration_date": _text(elem, "zapisDatum"),
-        "deletion_date": _text(elem, "vymazDatum"),
-        "facts": [_parse_udaj(u) for u in elem.findall("udaje/Udaj")],
-    }
-
-
-def _parse_udaj(elem) -> dict:
-    """Parse a single <Udaj> element into a dict. Recurses for podudaje."""
-    return {
-        "header": _text(elem, "hlavicka"),
-        "registration_date": _text(elem, "zapisDatum"),
-        "deletion_date": _text(elem, "vymazDatum"),
-        "value_text": _text(elem, "hodnotaText"),
-        "value_data": _parse_hodnota_udaje(elem.find("hodnotaUdaje")),
-        "membership_from": _text(elem, "clenstviOd"),
-        "membership_to": _text(elem, "clenstviDo"),
-        "function_from": _text(elem, "funkceOd"),
-        "function_to": _text(elem, "funkceDo"),
-        "function_name": _text(elem, "funkce"),
-        "fact_type": _parse_udaj_typ(elem.find("udajTyp")),
-        "legal_form": _parse_pravni_forma(elem.find("pravniForma")),
-        "file_reference": _parse_spis_zn(elem.find("spisZn")),
-        "person": _parse_osoba(elem.find("osoba")),
-        "address": _parse_adresa(elem.find("adresa")),
-        "residence": _parse_adresa(elem.find("bydliste")),
-        "sub_facts": [_parse_udaj(u) for u in elem.findall("podudaje/Udaj")],
-    }
-
-
-def _parse_udaj_typ(elem) -> dict | None:
+def _parse_subjekt(elem) -> Subjekt:
+    """Parse a single <Subjekt> element into a record."""
+    children = _children(elem)
+    return Subjekt(
+        name=_child_text(children, "nazev"),
+        ico=_child_text(children, "ico"),
+        registration_date=_child_text(children, "zapisDatum"),
+        deletion_date=_child_text(children, "vymazDatum"),
+        facts=tuple(_parse_udaj(u) for u in elem.iterfind("udaje/Udaj")),
+    )
+
+
+def _parse_udaj(elem) -> Udaj:
+    """Parse a single <Udaj> element into a record. Recurses for podudaje."""
+    children = _children(elem)
+    return Udaj(
+        header=_child_code(children, "hlavicka"),
+        registration_date=_child_text(children, "zapisDatum"),
+        deletion_date=_child_text(children, "vymazDatum"),
+        value_text=_child_text(children, "hodnotaText"),
+        value_data=_parse_hodnota_udaje(children.get("hodnotaUdaje")),
+        membership_from=_child_text(children, "clenstviOd"),
+        membership_to=_child_text(children, "clenstviDo"),
+        function_from=_child_text(children, "funkceOd"),
+        function_to=_child_text(children, "funkceDo"),
+        function_name=_child_code(children, "funkce"),
+        fact_type=_parse_udaj_typ(children.get("udajTyp")),
+        legal_form=_parse_pravni_forma(children.get("pravniForma")),
+        file_reference=_parse_spis_zn(children.get("spisZn")),
+        person=_parse_osoba(children.get("osoba")),
+        address=_parse_adresa(children.get("adresa")),
+        residence=_parse_adresa(children.get("bydliste")),
+        sub_facts=tuple(_parse_udaj(u) for u in elem.iterfind("podudaje/Udaj")),
+    )
+
+
+def _parse_udaj_typ(elem) -> UdajTyp | None:
     """Parse <udajTyp> — type code and name for a fact."""
     if elem is None:
         return None
-    return {
-        "code": _text(elem, "kod"),
-        "name": _text(elem, "nazev"),
-    }
+    children = _children(elem)
+    return UdajTyp(
+        code=_child_code(children, "kod"),
+        name=_child_code(children, "nazev"),
+    )
 
 
-def _parse_pravni_forma(elem) -> dict | None:
+def _parse_pravni_forma(elem) -> PravniForma | None:
     """Parse <pravniForma> — legal form code, name, abbreviation."""
     if elem is None:
         return None
-    return {
-        "code": _text(elem, "kod"),
-        "name": _text(elem, "nazev"),
-        "abbreviation": _text(elem, "zkratka"),
-    }
+    children = _children(elem)
+    return PravniForma(
+        code=_child_code(children, "kod"),
+        name=_child_code(children, "nazev"),
+        abbreviation=_child_code(children, "zkratka"),
+    )
 
 
-def _parse_spis_zn(elem) -> dict | None:
+def _parse_spis_zn(elem) -> SpisZn | None:
     """Parse <spisZn> — file reference with court details."""
     if elem is None:
         return None
-    soud = elem.find("soud")
-    return {
-        "court_code": _text(soud, "kod") if soud is not None else "",
-        "court_name": _text(soud, "nazev") if soud is not None else "",
-        "section": _text(elem, "oddil"),
-        "insert": _text(elem, "vlozka"),
-    }
+    children = _children(elem)
+    soud = children.get("soud")
+    soud_children = _children(soud) if soud is not None else {}
+    return SpisZn(
+        court_code=_child_code(soud_children, "kod"),
+        court_name=_child_code(soud_children, "nazev"),
+        section=_child_code(children, "oddil"),
+        insert=_child_text(children, "vlozka"),
+    )
 
 
-def _parse_osoba(elem) -> dict | None:
+def _parse_osoba(elem) -> Osoba | None:
     """Parse <osoba> — natural person (has prijmeni) or legal person (has nazev)."""
     if elem is None:
         return None
-    result = {"person_text": _text(elem, "osobaText")}
-    if elem.find("prijmeni") is not None:
-        result.update({
-            "type": "natural",
-            "first_name": _text(elem, "jmeno"),
-            "last_name": _text(elem, "prijmeni"),
-            "birth_date": _text(elem, "narozDatum"),
-            "title_before": _text(elem, "titulPred"),
-            "title_after": _text(elem, "titulZa"),
-        })
-    else:
-        result.update({
-            "type": "legal",
-            "entity_name": _text(elem, "nazev"),
-            "ico": _text(elem, "ico"),
-            "reg_number": _text(elem, "regCislo"),
-            "euid": _text(elem, "euid"),
-        })
-    return result
-
-
-def _parse_adresa(elem) -> dict | None:
+    children = _children(elem)
+    person_text = _child_text(children, "osobaText")
+    if "prijmeni" in children:
+        return Osoba(
+            type="natural",
+            person_text=person_text,
+            first_name=_child_code(children, "jmeno"),
+            last_name=_child_text(children, "prijmeni"),
+            birth_date=_child_text(children, "narozDatum"),
+            title_before=_child_code(children, "titulPred"),
+            title_after=_child_code(children, "titulZa"),
+        )
+    return Osoba(
+        type="legal",
+        person_text=person_text,
+        entity_name=_child_text(children, "nazev"),
+        ico=_child_text(children, "ico"),
+        reg_number=_child_text(children, "regCislo"),
+        euid=_child_text(children, "euid"),
+    )
+
+
+def _parse_adresa(elem) -> Adresa | None:
     """Parse <adresa> or <bydliste> — full address with all components."""
     if elem is None:
         return None
-    return {
-        "country": _text(elem, "statNazev"),
-        "municipality": _text(elem, "obec"),
-        "city_part": _text(elem, "castObce"),
-        "street": _text(elem, "ulice"),
-        "house_number": _text(elem, "cisloPo"),
-        "orientation_number": _text(elem, "cisloOr"),
-        "evidence_number": _text(elem, "cisloEv"),
-        "number_text": _text(elem, "cisloText"),
-        "postal_code": _text(elem, "psc"),
-        "district": _text(elem, "okres"),
-        "full_address": _text(elem, "adresaText"),
-        "supplementary_text": _text(elem, "doplnujiciText"),
-    }
+    children = _children(elem)
+    return Adresa(
+        country=_child_code(children, "statNazev"),
+        municipality=_child_code(children, "obec"),
+        city_part=_child_code(children, "castObce"),
+        street=_child_code(children, "ulice"),
+        house_number=_child_text(children, "cisloPo"),
+        orientation_number=_child_text(children, "cisloOr"),
+        evidence_number=_child_text(children, "cisloEv"),
+        number_text=_child_text(children, "cisloText"),
+        postal_code=_child_code(children, "psc"),
+        district=_child_code(children, "okres"),
+        full_address=_child_text(children, "adresaText"),
+        supplementary_text=_child_text(children, "doplnujiciText"),
+    )
 
 
 def _parse_hodnota_udaje(elem) -> dict | None:
@@ -189,9 +310,30 @@ def _parse_hodnota_udaje(elem) -> dict | None:
     return result or None
 
 
-def _text(elem, tag: str) -> str:
-    """Safely get text content of a child element."""
-    if elem is None:
-        return ""
-    child = elem.find(tag)
+def _children(elem) -> dict:
+    """
+    Map each child tag to its first child element, in a single pass.
+
+    Equivalent to calling elem.find(tag) per tag, but each find() rescans the
+    children from the start; the parsers above look up ~17 tags per Udaj.
+    """
+    children = {}
+    for child in elem:
+        if child.tag not in children:
+            children[child.tag] = child
+    return children
+
+
+def _child_text(children: dict, tag: str) -> str:
+    """Stripped text of the first child with `tag`, or "" if absent."""
+    child = children.get(tag)
     return (child.text or "").strip() if child is not None else ""
+
+
+def _child_code(children: dict, tag: str) -> str:
+    """
+    Like _child_text, for low-cardinality values (codes, headers, municipality
+    names): the result is interned so repeated values share one string.
+    """
+    child = children.get(tag)
+    return sys.intern((child.text or "").strip()) if child is not None else ""
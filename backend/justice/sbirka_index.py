@@ -0,0 +1,127 @@
+"""
+Persistent index of or.justice.cz subjects and their Sbírka listin.
+
+Serving an entity's documents used to take 2 + N page fetches: the ICO
+search page for the subjektId, the document list, and a detail page per
+document. The index keeps what does not change:
+
+- SbirkaSubject: ICO → subjektId, looked up once;
+- SbirkaDocument: the documents of a subject with their download links,
+  fetched once per document.
+
+A refresh fetches only the list page (at most every
+SBIRKA_INDEX_RECHECK_INTERVAL seconds) and adds the documents that are new,
+so in the steady state a documents request costs one upstream call, or none.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.exceptions import ExternalAPIError
+
+from .constants import SBIRKA_INDEX_RECHECK_INTERVAL
+from .models import SbirkaDocument, SbirkaSubject
+
+
+def get_subject(ico: str, client) -> SbirkaSubject | None:
+    """The indexed subject of an ICO, looked up on or.justice.cz on first use."""
+    subject = SbirkaSubject.objects.filter(ico=ico).first()
+    if subject is not None:
+        return subject
+    subjekt_id = client.get_subjekt_id(ico)
+    if not subjekt_id:
+        return None
+    subject, _ = SbirkaSubject.objects.get_or_create(
+        ico=ico, defaults={"subjekt_id": subjekt_id}
+    )
+    return subject
+
+
+def list_documents(subject: SbirkaSubject, client) -> tuple[list[dict], bool]:
+    """
+    The subject's documents in list page order, refreshed if due.
+
+    Returns:
+        (documents, listed). Documents are dicts in the scraper's shape, with
+        "files" None where the detail page has not been fetched yet.
+        `listed` is False if a due refresh failed and the stored index was
+        served instead.
+
+    Raises:
+        ExternalAPIError: If the list page cannot be fetched and nothing is
+            stored for the subject yet.
+    """
+    listed = True
+    if _refresh_due(subject):
+        try:
+            _merge(subject, client.get_document_list(subject.subjekt_id))
+        except ExternalAPIError:
+            if subject.documents_checked_at is None:
+                raise
+            listed = False
+
+    documents = [
+        {
+            "documentId": doc.document_id,
+            "subjektId": subject.subjekt_id,
+            "spisId": doc.spis_id,
+            "documentNumber": doc.document_number,
+            "documentType": doc.document_type,
+            "files": doc.files,
+            "financialChecked": doc.financial_checked,
+        }
+        for doc in subject.documents.order_by("position", "id")
+    ]
+    return documents, listed
+
+
+def save_fetched(subject: SbirkaSubject, documents: list[dict], before: list[dict]) -> None:
+    """Store the files and XML state fetched for documents since `before`."""
+    previous = {doc["documentId"]: doc for doc in before}
+    changed = {
+        doc["documentId"]: doc
+        for doc in documents
+        if (doc["files"], doc["financialChecked"])
+        != (previous[doc["documentId"]]["files"], previous[doc["documentId"]]["financialChecked"])
+    }
+    if not changed:
+        return
+    rows = list(subject.documents.filter(document_id__in=changed))
+    for row in rows:
+        row.files = changed[row.document_id]["files"]
+        row.financial_checked = changed[row.document_id]["financialChecked"]
+    SbirkaDocument.objects.bulk_update(rows, ["files", "financial_checked"])
+
+
+def _refresh_due(subject: SbirkaSubject) -> bool:
+    checked_at = subject.documents_checked_at
+    return checked_at is None or timezone.now() - checked_at >= timedelta(
+        seconds=SBIRKA_INDEX_RECHECK_INTERVAL
+    )
+
+
+def _merge(subject: SbirkaSubject, listed: list[dict]) -> None:
+    """Add new documents from the list page and record their positions."""
+    existing = {doc.document_id: doc for doc in subject.documents.all()}
+    new, moved = [], []
+    for position, doc in enumerate(listed):
+        row = existing.get(doc["documentId"])
+        if row is None:
+            new.append(
+                SbirkaDocument(
+                    subject=subject,
+                    document_id=doc["documentId"],
+                    spis_id=doc["spisId"],
+                    document_number=doc.get("documentNumber", ""),
+                    document_type=doc.get("documentType", ""),
+                    position=position,
+                )
+            )
+        elif row.position != position:
+            row.position = position
+            moved.append(row)
+
+    SbirkaDocument.objects.bulk_create(new, ignore_conflicts=True)
+    SbirkaDocument.objects.bulk_update(moved, ["position"])
+    subject.documents_checked_at = timezone.now()
+    subject.save(update_fields=["documents_checked_at"])
@@ -4,6 +4,8 @@ Field names use camelCase to match TypeScript entity types.
 """
 from rest_framework import serializers
 
+from core.services.search import MATCH_MODES
+
 
 # --- Input serializers (request validation) ---
 
@@ -14,6 +16,10 @@ class EntityLookupSerializer(serializers.Serializer):
 
 class EntitySearchSerializer(serializers.Serializer):
     name = serializers.CharField(required=False, allow_blank=True)
+    match = serializers.ChoiceField(
+        choices=MATCH_MODES, required=False, default="contains"
+    )
+    unaccent = serializers.BooleanField(required=False, default=False)
     legalForm = serializers.CharField(required=False, allow_blank=True)
     location = serializers.CharField(required=False, allow_blank=True)
     status = serializers.ChoiceField(
@@ -23,6 +29,7 @@ class EntitySearchSerializer(serializers.Serializer):
     limit = serializers.IntegerField(
         required=False, default=20, min_value=1, max_value=100
     )
+    cursor = serializers.CharField(required=False)
 
 
 # --- Output serializers (response shape) ---
@@ -116,8 +123,10 @@ class EntityDetailSerializer(serializers.Serializer):
 
 class JusticeSearchResultSerializer(serializers.Serializer):
     totalCount = serializers.IntegerField()
+    totalCountExact = serializers.BooleanField(default=True)
     offset = serializers.IntegerField()
     limit = serializers.IntegerField()
+    nextCursor = serializers.CharField(allow_null=True)
     entities = EntitySummarySerializer(many=True)
 
 
@@ -201,4 +210,5 @@ class DocumentSerializer(serializers.Serializer):
 
 class DocumentListSerializer(serializers.Serializer):
     subjektId = serializers.CharField()
+    incomplete = serializers.BooleanField(default=False)
     documents = DocumentSerializer(many=True)
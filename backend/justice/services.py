@@ -6,44 +6,74 @@ JusticeSyncService: Ingestion pipeline — downloads, parses, and upserts open d
 
 Pattern (same as AresService): validate → cache check → query/fetch → parse → cache → return.
 """
+import copy
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date
 
-from django.db import transaction
-from django.db.models import Sum
+from django.db import IntegrityError, OperationalError, connections, transaction
+from django.db.models import Case, F, Sum, Value, When
 from django.utils import timezone
 
 from core.exceptions import ExternalAPIError
 from core.services.cache import CacheService
+from core.services.counting import count_results
+from core.services.pagination import InvalidCursor, SortKey, keyset_page
+from core.services.search import filter_by_name, relevance_keys
 from core.throttles import GlobalOutboundThrottle
 from .client import JusticeCKANClient, justice_ckan_client, justice_sbirka_client
+from . import loaders, sbirka_index
 from .constants import (
     DATASET_LIST_CACHE_TTL,
     ENTITY_DETAIL_CACHE_TTL,
     ENTITY_SEARCH_CACHE_TTL,
     OUTBOUND_MAX_REQUESTS,
     OUTBOUND_WINDOW,
+    SBIRKA_FETCH_WORKERS,
     SBIRKA_LISTIN_CACHE_TTL,
+    SBIRKA_PARTIAL_CACHE_TTL,
+    SYNC_BATCH_SIZE,
+    SYNC_DEADLOCK_BACKOFF,
+    SYNC_DEADLOCK_RETRIES,
 )
 from company.models import Company
-from .models import Address, DatasetSync, Entity, EntityFact, Person
+from company.services import CompanyService
+from .documents import build_documents, write_documents
+from .financials import build_statement, store_statements, to_financial_data
+from .models import (
+    Address,
+    DatasetSync,
+    Entity,
+    EntityDocument,
+    EntityFact,
+    FinancialStatement,
+    Person,
+)
 from .parser import (
-    parse_address,
     parse_dataset_info,
     parse_document_list,
-    parse_entity_detail,
     parse_entity_summary,
-    parse_history_entry,
-    parse_person_with_fact,
     parse_sync_status,
 )
 from .parsers.financial_xml_parser import parse_financial_xml
-from .parsers.xml_parser import parse_xml_stream
+from .parsers.records import PravniForma, SpisZn, Subjekt, Udaj
+from .parsers.xml_parser import parse_xml_file, parse_xml_file_parallel
+from .spool import DatasetSpool
 
 logger = logging.getLogger(__name__)
 
+# Cache namespaces invalidated as a whole when a sync changes any entity.
+CACHE_VERSIONED_NAMESPACES = ("search", "count")
+
+# Search result order; keyset pagination continues from the last (name, id).
+ENTITY_SEARCH_ORDERING = (SortKey("name"), SortKey("id"))
+
 
 # ---------------------------------------------------------------------------
 # JusticeService — API query layer
@@ -54,7 +84,11 @@ class JusticeService:
     """Business logic for querying stored Justice registry data."""
 
     def __init__(self):
-        self.cache = CacheService(prefix="justice", default_ttl=ENTITY_SEARCH_CACHE_TTL)
+        self.cache = CacheService(
+            prefix="justice",
+            default_ttl=ENTITY_SEARCH_CACHE_TTL,
+            versioned=CACHE_VERSIONED_NAMESPACES,
+        )
 
     def get_entity_by_ico(self, ico: str) -> dict:
         """Lookup entity by ICO with full detail (facts, persons, addresses)."""
@@ -64,9 +98,27 @@ class JusticeService:
                 "ICO must be numeric.", status_code=400, service_name="justice"
             )
 
-        cached = self.cache.get("entity", normalized)
-        if cached is not None:
-            return cached
+        return self.cache.get_or_compute(
+            lambda: self._get_document(normalized)["detail"],
+            "entity",
+            normalized,
+            ttl=ENTITY_DETAIL_CACHE_TTL,
+        )
+
+    def _get_document(self, normalized: str) -> dict:
+        """
+        Pre-rendered responses for an ICO (see justice.documents).
+
+        A primary-key read when the sync already rendered them; otherwise they
+        are rendered from the latest entity with that ICO and stored.
+        """
+        document = (
+            EntityDocument.objects.filter(ico=normalized)
+            .values_list("document", flat=True)
+            .first()
+        )
+        if document is not None:
+            return document
 
         entity = Entity.objects.filter(ico=normalized).order_by("-updated_at").first()
         if entity is None:
@@ -74,29 +126,35 @@ class JusticeService:
                 "Entity not found.", status_code=404, service_name="justice"
             )
 
-        facts = (
-            EntityFact.objects.filter(entity=entity)
-            .select_related("person")
-            .prefetch_related("addresses", "sub_facts")
-            .order_by("registration_date")
-        )
-        result = parse_entity_detail(entity, list(facts))
-
-        self.cache.set(result, "entity", normalized, ttl=ENTITY_DETAIL_CACHE_TTL)
-        return result
+        (rendered,) = build_documents([entity])
+        try:
+            with transaction.atomic():
+                rendered.save(force_insert=True)
+        except IntegrityError:
+            # The entity was replaced by a concurrent sync; serve what we have.
+            logger.info("Entity %s changed while rendering its document", normalized)
+        return rendered.document
 
     def search_entities(self, params: dict) -> dict:
         """Search entities by name, legal_form, location, status with pagination."""
-        cache_hash = self.cache.hash_params(params)
-        cached = self.cache.get("search", cache_hash)
-        if cached is not None:
-            return cached
+        return self.cache.get_or_compute(
+            lambda: self._search_entities(params),
+            "search",
+            self.cache.hash_params(params),
+            ttl=ENTITY_SEARCH_CACHE_TTL,
+        )
 
+    def _search_entities(self, params: dict) -> dict:
         qs = Entity.objects.all()
 
         name = params.get("name")
         if name:
-            qs = qs.filter(name__icontains=name)
+            qs = filter_by_name(
+                qs,
+                name,
+                match=params.get("match", "contains"),
+                unaccent=params.get("unaccent", False),
+            )
 
         legal_form = params.get("legalForm")
         if legal_form:
@@ -112,125 +170,125 @@ class JusticeService:
         elif status == "deleted":
             qs = qs.filter(is_active=False)
 
-        total_count = qs.count()
+        total_count, total_exact = count_results(qs, self.cache, params)
         offset = params.get("offset", 0)
         limit = params.get("limit", 20)
-        entities = qs.order_by("name")[offset : offset + limit]
+        try:
+            entities, next_cursor = keyset_page(
+                qs,
+                relevance_keys(qs, *ENTITY_SEARCH_ORDERING),
+                limit,
+                cursor=params.get("cursor"),
+                offset=offset,
+            )
+        except InvalidCursor as e:
+            raise ExternalAPIError(str(e), status_code=400, service_name="justice")
 
-        result = {
+        return {
             "totalCount": total_count,
+            "totalCountExact": total_exact,
             "offset": offset,
             "limit": limit,
+            "nextCursor": next_cursor,
             "entities": [parse_entity_summary(e) for e in entities],
         }
 
-        self.cache.set(result, "search", cache_hash, ttl=ENTITY_SEARCH_CACHE_TTL)
-        return result
-
     def get_entity_history(self, ico: str) -> list[dict]:
         """Get change timeline for an entity — all facts sorted by date."""
-        normalized = ico.zfill(8)
-        entity = Entity.objects.filter(ico=normalized).order_by("-updated_at").first()
-        if entity is None:
-            raise ExternalAPIError(
-                "Entity not found.", status_code=404, service_name="justice"
-            )
-
-        facts = (
-            EntityFact.objects.filter(entity=entity)
-            .order_by("registration_date", "deletion_date")
-        )
-        return [parse_history_entry(f) for f in facts]
+        return self._get_document(ico.zfill(8))["history"]
 
     def get_entity_persons(self, ico: str) -> list[dict]:
         """Get all persons associated with an entity."""
-        normalized = ico.zfill(8)
-        entity = Entity.objects.filter(ico=normalized).order_by("-updated_at").first()
-        if entity is None:
-            raise ExternalAPIError(
-                "Entity not found.", status_code=404, service_name="justice"
-            )
-
-        facts_with_persons = (
-            EntityFact.objects.filter(entity=entity, person__isnull=False)
-            .select_related("person")
-            .order_by("registration_date")
-        )
-        return [parse_person_with_fact(f) for f in facts_with_persons]
+        return self._get_document(ico.zfill(8))["persons"]
 
     def get_entity_addresses(self, ico: str) -> list[dict]:
         """Get all addresses associated with an entity."""
-        normalized = ico.zfill(8)
-        entity = Entity.objects.filter(ico=normalized).order_by("-updated_at").first()
-        if entity is None:
-            raise ExternalAPIError(
-                "Entity not found.", status_code=404, service_name="justice"
-            )
-
-        addresses = Address.objects.filter(fact__entity=entity).select_related("fact")
-        return [parse_address(a) for a in addresses]
+        return self._get_document(ico.zfill(8))["addresses"]
 
     def get_entity_documents(self, ico: str) -> dict:
         """
         Get sbírka listin documents for an entity.
 
         Scrapes or.justice.cz HTML pages, parses document lists,
-        and extracts financial XML data when available.
+        and extracts financial XML data when available. Results with failed
+        fetches (incomplete: true) are cached for SBIRKA_PARTIAL_CACHE_TTL only.
         """
         normalized = ico.zfill(8)
+        return self.cache.get_or_compute(
+            lambda: self._scrape_documents(normalized),
+            "documents",
+            normalized,
+            ttl=lambda result: (
+                SBIRKA_PARTIAL_CACHE_TTL if result["incomplete"] else SBIRKA_LISTIN_CACHE_TTL
+            ),
+        )
 
-        cached = self.cache.get("documents", normalized)
-        if cached is not None:
-            return cached
-
+    def _scrape_documents(self, normalized: str) -> dict:
         client = justice_sbirka_client
 
-        # Step 1: ICO → subjektId
-        subjekt_id = client.get_subjekt_id(normalized)
-        if not subjekt_id:
+        # Step 1: ICO → subjektId (stored after the first lookup)
+        subject = sbirka_index.get_subject(normalized, client)
+        if subject is None:
             raise ExternalAPIError(
                 "Entity not found on or.justice.cz",
                 status_code=404,
                 service_name="justice",
             )
 
-        # Step 2: subjektId → document list
-        documents = client.get_document_list(subjekt_id)
-
-        # Step 3: For each document, get file details and parse XML if present
-        for doc in documents:
-            files = client.get_document_files(
-                doc["documentId"], doc["subjektId"], doc["spisId"]
+        # Step 2: subjektId → document list (stored; new documents added)
+        documents, listed = sbirka_index.list_documents(subject, client)
+        indexed = copy.deepcopy(documents)
+
+        # Step 3: For documents not fetched before, get file details and
+        # parse XML if present (unless its financial statement is already
+        # stored). Documents are independent; fetch them concurrently (map
+        # keeps order).
+        stored = {
+            statement.document_id: statement
+            for statement in FinancialStatement.objects.filter(
+                ico=normalized, document_id__in=[doc["documentId"] for doc in documents]
             )
-            doc["files"] = files
-
-            # Try to find and parse XML financial data
-            xml_file = next((f for f in files if f["isXml"]), None)
-            if xml_file:
-                try:
-                    content, content_type, filename = client.download_file(
-                        xml_file["downloadId"]
+        }
+        fetched = []
+        if documents:
+            with ThreadPoolExecutor(
+                max_workers=min(SBIRKA_FETCH_WORKERS, len(documents)),
+                thread_name_prefix="sbirka",
+            ) as executor:
+                fetched = list(
+                    executor.map(
+                        lambda doc: _fetch_document_files(
+                            client, doc, stored.get(doc["documentId"])
+                        ),
+                        documents,
                     )
-                    if content and b"<UcetniZaverka" in content:
-                        doc["financialData"] = parse_financial_xml(content)
-                    else:
-                        doc["financialData"] = None
-                except Exception:
-                    doc["financialData"] = None
-            else:
-                doc["financialData"] = None
+                )
+
+        # Step 4: Persist newly parsed financial statements and fetched files.
+        statements = []
+        for doc in documents:
+            if doc["financialData"] and doc["documentId"] not in stored:
+                statement = build_statement(normalized, doc["documentId"], doc["financialData"])
+                if statement is None:
+                    # Not storable (no period end): parse the XML again next time.
+                    doc["financialChecked"] = False
+                else:
+                    statements.append(statement)
+        try:
+            store_statements(statements)
+        except Exception:
+            logger.warning("Failed to store financial statements of %s", normalized, exc_info=True)
+            for doc in documents:
+                if doc["financialData"] and doc["documentId"] not in stored:
+                    doc["financialChecked"] = False
+        sbirka_index.save_fetched(subject, documents, indexed)
 
-        result = {
-            "subjektId": subjekt_id,
+        return {
+            "subjektId": subject.subjekt_id,
+            "incomplete": not listed or not all(fetched),
             "documents": parse_document_list(documents),
         }
 
-        self.cache.set(
-            result, "documents", normalized,
-            ttl=SBIRKA_LISTIN_CACHE_TTL,
-        )
-        return result
-
     def list_datasets(self) -> list[dict]:
         """Return dataset catalog from DatasetSync table."""
         cached = self.cache.get("datasets")
@@ -275,16 +333,37 @@ class JusticeService:
 class JusticeSyncService:
     """Business logic for syncing data from dataor.justice.cz into PostgreSQL."""
 
-    def __init__(self, client: JusticeCKANClient | None = None):
+    def __init__(
+        self,
+        client: JusticeCKANClient | None = None,
+        batch_size: int = SYNC_BATCH_SIZE,
+        loader: str = "orm",
+        spool: DatasetSpool | None = None,
+        parse_workers: int = 1,
+    ):
         self.client = client or justice_ckan_client
+        self.spool = spool or DatasetSpool()
+        self.batch_size = batch_size
+        self.parse_workers = parse_workers
+        self.loader = loader
+        if loader == "copy" and not loaders.is_supported():
+            logger.warning("COPY loader requires PostgreSQL; using the ORM loader")
+            self.loader = "orm"
         self.outbound_throttle = GlobalOutboundThrottle(
             key="justice",
             max_requests=OUTBOUND_MAX_REQUESTS,
             window=OUTBOUND_WINDOW,
         )
 
-    def sync_dataset(self, dataset_id: str, force: bool = False) -> dict:
-        """Download, parse, and upsert a single dataset into the database."""
+    def sync_dataset(
+        self, dataset_id: str, force: bool = False, from_spool: bool = False
+    ) -> dict:
+        """
+        Download, parse, and upsert a single dataset into the database.
+
+        With from_spool=True the dataset's spooled file is re-parsed without
+        any network access.
+        """
         start = time.monotonic()
 
         ds, _ = DatasetSync.objects.update_or_create(
@@ -292,6 +371,15 @@ class JusticeSyncService:
             defaults=self._parse_dataset_id(dataset_id),
         )
 
+        if from_spool:
+            spooled = self.spool.get(dataset_id)
+            if spooled is None:
+                ds.status = "failed"
+                ds.error_message = "Dataset file not found in spool"
+                ds.save()
+                return self._sync_result(ds, start)
+            return self._load_file(ds, spooled, start)
+
         # Get metadata and find the .xml.gz resource.
         metadata = self.client.get_dataset(dataset_id)
         xml_gz_resource = self._find_xml_gz_resource(metadata)
@@ -302,25 +390,25 @@ class JusticeSyncService:
             return self._sync_result(ds, start)
 
         filename = xml_gz_resource["url"].rsplit("/", 1)[-1]
-        remote_size = self.client.get_file_size(filename)
+        resource_last_modified = xml_gz_resource.get("last_modified") or ""
+        resource_hash = xml_gz_resource.get("hash") or ""
 
         # Skip unchanged datasets unless forced.
-        if (
-            not force
-            and ds.status == "completed"
-            and remote_size
-            and ds.file_size == remote_size
+        incremental = not force and ds.status == "completed"
+        if incremental and self._is_unchanged(
+            ds, filename, resource_last_modified, resource_hash
         ):
-            return {
-                "datasetId": dataset_id,
-                "status": "skipped",
-                "entityCount": ds.entity_count,
-                "durationSeconds": 0,
-            }
+            return self._skipped_result(ds)
 
-        # Download phase.
-        ds.status = "downloading"
-        ds.save()
+        # Forced re-sync of a file we already hold: re-parse the spooled copy.
+        spooled = self.spool.get(dataset_id)
+        if (
+            spooled is not None
+            and (resource_last_modified or resource_hash)
+            and (spooled["resourceLastModified"], spooled["resourceHash"])
+            == (resource_last_modified, resource_hash)
+        ):
+            return self._load_file(ds, spooled, start)
 
         if not self.outbound_throttle.allow():
             raise ExternalAPIError(
@@ -329,36 +417,211 @@ class JusticeSyncService:
                 service_name="justice",
             )
 
-        data_stream = self.client.download_file_stream(filename)
+        # Download phase: conditional, resumable GET into the spool. The
+        # validators come from the last sync when incremental, otherwise from
+        # the spooled copy so that a 304 lets us re-parse it.
+        ds.status = "downloading"
+        ds.save()
+
+        if incremental:
+            etag, last_modified = ds.etag, ds.last_modified
+        elif spooled is not None:
+            etag, last_modified = spooled["etag"], spooled["lastModified"]
+        else:
+            etag, last_modified = "", ""
+
+        tmp_path = self.spool.reserve(dataset_id)
+        try:
+            download = self.client.download_file(
+                filename, tmp_path, etag=etag, last_modified=last_modified
+            )
+            if download is not None:
+                spooled = self.spool.commit(
+                    dataset_id,
+                    tmp_path,
+                    {
+                        **download,
+                        "resourceLastModified": resource_last_modified,
+                        "resourceHash": resource_hash,
+                    },
+                )
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if download is None and incremental:
+            # 304 Not Modified — the stored data is still current.
+            ds.status = "completed"
+            ds.resource_last_modified = resource_last_modified
+            ds.resource_hash = resource_hash
+            ds.save()
+            return self._skipped_result(ds)
+
+        if download is None:
+            # 304 against the spooled copy: it is still the current file.
+            spooled = {
+                **spooled,
+                "resourceLastModified": resource_last_modified,
+                "resourceHash": resource_hash,
+            }
+        return self._load_file(ds, spooled, start)
 
-        # Parse and upsert phase.
+    def _load_file(self, ds: DatasetSync, spooled: dict, start: float) -> dict:
+        """Parse a spooled dataset file and diff-load it into the database."""
         ds.status = "parsing"
         ds.save()
 
-        entity_count = 0
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0, "duplicates": 0}
+        changed_icos = set()
+        row_count = 0
         try:
-            with transaction.atomic():
-                # Full replace: delete existing entities for this dataset.
-                Entity.objects.filter(dataset_id=dataset_id).delete()
-
-                for subjekt in parse_xml_stream(data_stream):
-                    self._upsert_entity(subjekt, dataset_id)
-                    entity_count += 1
+            row_count = self._ingest_file(ds.dataset_id, spooled["path"], stats, changed_icos)
 
             ds.status = "completed"
-            ds.entity_count = entity_count
-            ds.file_size = remote_size
+            ds.entity_count = stats["inserted"] + stats["updated"] + stats["unchanged"]
+            ds.inserted_count = stats["inserted"]
+            ds.updated_count = stats["updated"]
+            ds.unchanged_count = stats["unchanged"]
+            ds.removed_count = stats["removed"]
+            ds.file_size = spooled["size"]
+            ds.etag = spooled["etag"]
+            ds.last_modified = spooled["lastModified"]
+            ds.resource_last_modified = spooled["resourceLastModified"]
+            ds.resource_hash = spooled["resourceHash"]
             ds.last_synced_at = timezone.now()
             ds.error_message = ""
         except Exception as e:
-            logger.exception("Failed to sync dataset %s", dataset_id)
+            logger.exception("Failed to sync dataset %s", ds.dataset_id)
             ds.status = "failed"
             ds.error_message = str(e)[:2000]
 
         ds.duration_seconds = time.monotonic() - start
         ds.save()
 
-        return self._sync_result(ds, start)
+        # The data is committed at this point; a cache error must not mark the
+        # sync failed; stale entries then expire with their TTL.
+        if ds.status == "completed" and changed_icos:
+            try:
+                _invalidate_caches(changed_icos)
+            except Exception:
+                logger.exception("Cache invalidation failed after syncing %s", ds.dataset_id)
+
+        result = self._sync_result(ds, start)
+        result["rowCount"] = row_count
+        result["rowsPerSecond"] = (
+            round(row_count / ds.duration_seconds) if ds.duration_seconds else 0
+        )
+        return result
+
+    def _ingest_file(
+        self, dataset_id: str, path: str, stats: dict[str, int], changed_icos: set[str]
+    ) -> int:
+        """
+        Parse a dataset file and diff-load it (see _ingest_dataset).
+
+        Parallel workers whose datasets share ICOs write the same Company and
+        EntityDocument rows, each holding its locks until its whole dataset
+        commits; the other worker waits, or, if they reached the shared ICOs in
+        opposite orders, PostgreSQL aborts one with a deadlock. The aborted
+        load was rolled back entirely, so it is re-parsed and retried, up to
+        SYNC_DEADLOCK_RETRIES attempts.
+        """
+        attempt = 1
+        while True:
+            if self.parse_workers > 1:
+                subjekts = parse_xml_file_parallel(path, self.parse_workers)
+            else:
+                subjekts = parse_xml_file(path)
+            try:
+                return self._ingest_dataset(dataset_id, subjekts, stats, changed_icos)
+            except OperationalError as e:
+                if not _is_deadlock(e) or attempt >= SYNC_DEADLOCK_RETRIES:
+                    raise
+                logger.warning(
+                    "Deadlock loading dataset %s, retrying (attempt %d)", dataset_id, attempt
+                )
+                stats.update(dict.fromkeys(stats, 0))
+                changed_icos.clear()
+                time.sleep(SYNC_DEADLOCK_BACKOFF * attempt)
+                attempt += 1
+
+    def _ingest_dataset(
+        self, dataset_id: str, subjekts, stats: dict[str, int], changed_icos: set[str]
+    ) -> int:
+        """
+        Diff-load a stream of parsed Subjekts into the dataset, atomically.
+
+        Returns the number of rows written; `stats` receives the
+        inserted/updated/unchanged/removed/duplicates counts and
+        `changed_icos` the ICOs of inserted, updated and removed entities.
+
+        An ICO is stored once per dataset (unique_entity_per_dataset): repeats
+        in the file are skipped and counted as duplicates, so the diff map
+        keyed by ICO stays exact.
+        """
+        row_count = 0
+        with transaction.atomic():
+            # Incremental diff: ICO → (pk, content_hash) of stored entities.
+            existing = {
+                ico: (pk, content_hash)
+                for ico, pk, content_hash in Entity.objects.filter(
+                    dataset_id=dataset_id
+                ).values_list("ico", "id", "content_hash")
+            }
+            seen = set()
+
+            batch = []
+            for subjekt in subjekts:
+                batch.append(subjekt)
+                if len(batch) >= self.batch_size:
+                    row_count += self._apply_batch(
+                        batch, dataset_id, existing, seen, stats, changed_icos
+                    )
+                    batch = []
+            if batch:
+                row_count += self._apply_batch(
+                    batch, dataset_id, existing, seen, stats, changed_icos
+                )
+
+            # Entities that disappeared from the dataset.
+            removed = {
+                ico: pk for ico, (pk, _hash) in existing.items() if ico not in seen
+            }
+            changed_icos.update(removed)
+            removed_pks = list(removed.values())
+            for i in range(0, len(removed_pks), self.batch_size):
+                Entity.objects.filter(
+                    pk__in=removed_pks[i : i + self.batch_size]
+                ).delete()
+            stats["removed"] = len(removed_pks)
+
+        if stats["duplicates"]:
+            logger.warning(
+                "Dataset %s lists %d ICOs more than once; kept the first occurrence",
+                dataset_id, stats["duplicates"],
+            )
+        return row_count
+
+    def _is_unchanged(
+        self,
+        ds: DatasetSync,
+        filename: str,
+        resource_last_modified: str,
+        resource_hash: str,
+    ) -> bool:
+        """
+        Whether the remote file matches the last completed sync.
+
+        CKAN resource metadata (last_modified / hash) is authoritative when the
+        portal provides it; otherwise fall back to comparing Content-Length.
+        """
+        if resource_last_modified or resource_hash:
+            return (resource_last_modified, resource_hash) == (
+                ds.resource_last_modified,
+                ds.resource_hash,
+            )
+        remote_size = self.client.get_file_size(filename)
+        return bool(remote_size) and ds.file_size == remote_size
 
     def sync_all_actual(
         self,
@@ -366,9 +629,27 @@ class JusticeSyncService:
         locations: list[str] | None = None,
         year: int | None = None,
         force: bool = False,
+        workers: int = 1,
+        from_spool: bool = False,
     ) -> list[dict]:
-        """Sync all 'actual' datasets matching the given filters."""
-        all_ids = self.client.list_datasets()
+        """
+        Sync all 'actual' datasets matching the given filters.
+
+        With workers > 1, datasets are fanned out to a process pool; each
+        worker downloads, parses and loads its dataset over its own DB
+        connection. Outbound requests stay capped by the cache-backed
+        GlobalOutboundThrottle, which all workers share. Results are returned
+        in dataset order. Each dataset loads in one transaction, so workers
+        whose datasets share ICOs wait on each other's Company and document
+        rows; a deadlock between them is retried (see _ingest_file).
+
+        With from_spool=True the candidate datasets are the spooled ones and
+        nothing is fetched from the network.
+        """
+        if from_spool:
+            all_ids = self.spool.dataset_ids()
+        else:
+            all_ids = self.client.list_datasets()
 
         matching = []
         for ds_id in all_ids:
@@ -383,104 +664,231 @@ class JusticeSyncService:
                 continue
             matching.append(ds_id)
 
+        if workers > 1 and len(matching) > 1:
+            return self._sync_parallel(matching, force, workers, from_spool)
+
         results = []
         for ds_id in matching:
             try:
-                result = self.sync_dataset(ds_id, force=force)
+                result = self.sync_dataset(ds_id, force=force, from_spool=from_spool)
                 results.append(result)
             except Exception as e:
                 logger.exception("Failed to sync %s", ds_id)
-                results.append({
-                    "datasetId": ds_id,
-                    "status": "failed",
-                    "entityCount": 0,
-                    "durationSeconds": 0,
-                    "error": str(e)[:500],
-                })
+                results.append(_failed_result(ds_id, e))
 
         return results
 
-    def _upsert_entity(self, subjekt: dict, dataset_id: str) -> Entity | None:
-        """Create an Entity and all related records from a parsed Subjekt dict."""
-        ico = subjekt.get("ico", "").zfill(8)
-        if not ico or ico == "00000000":
-            return None
-
-        file_ref = self._extract_file_reference(subjekt.get("facts", []))
-        legal_form = self._extract_legal_form(subjekt.get("facts", []))
-
-        # Create or get Company hub record.
-        company, _ = Company.objects.get_or_create(
-            ico=ico,
-            defaults={
-                "name": subjekt.get("name", ""),
-                "is_active": not bool(subjekt.get("deletion_date")),
-            },
-        )
+    def _sync_parallel(
+        self, dataset_ids: list[str], force: bool, workers: int, from_spool: bool
+    ) -> list[dict]:
+        """Run sync_dataset for each dataset in a pool of worker processes."""
+        # Forked workers inherit the configured Django app registry, but must
+        # not share the parent's DB sockets; each opens its own connection
+        # lazily on first query.
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(dataset_ids)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _sync_dataset_worker,
+                    ds_id,
+                    force,
+                    self.batch_size,
+                    self.loader,
+                    from_spool,
+                    self.parse_workers,
+                )
+                for ds_id in dataset_ids
+            ]
+            results = []
+            for ds_id, future in zip(dataset_ids, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.exception("Failed to sync %s", ds_id)
+                    results.append(_failed_result(ds_id, e))
 
-        # Phase 2: Populate search fields from Justice if not already set by ARES.
-        update_fields = {}
-        legal_form_code = legal_form.get("code", "") if legal_form else ""
-        if legal_form_code and not company.legal_form:
-            update_fields["legal_form"] = legal_form_code
-        if update_fields:
-            Company.objects.filter(pk=company.pk).update(**update_fields)
-
-        entity = Entity.objects.create(
-            company=company,
-            ico=ico,
-            name=subjekt.get("name", ""),
-            registration_date=_parse_date(subjekt.get("registration_date")),
-            deletion_date=_parse_date(subjekt.get("deletion_date")),
-            legal_form_code=legal_form.get("code", "") if legal_form else "",
-            legal_form_name=legal_form.get("name", "") if legal_form else "",
-            court_code=file_ref.get("court_code", "") if file_ref else "",
-            court_name=file_ref.get("court_name", "") if file_ref else "",
-            file_section=file_ref.get("section", "") if file_ref else "",
-            file_number=_safe_int(file_ref.get("insert")) if file_ref else None,
-            file_reference=(
-                f"{file_ref['section']} {file_ref['insert']}/{file_ref['court_code']}"
-                if file_ref and file_ref.get("section")
-                else ""
-            ),
-            dataset_id=dataset_id,
-            is_active=not bool(subjekt.get("deletion_date")),
-        )
+        return results
+
+    def _upsert_entity(self, subjekt: Subjekt, dataset_id: str) -> Entity | None:
+        """Create an Entity and all related records from a parsed Subjekt record."""
+        entities, _rows = self._ingest_batch([subjekt], dataset_id)
+        return entities[0] if entities else None
+
+    def _apply_batch(
+        self,
+        batch: list[Subjekt],
+        dataset_id: str,
+        existing: dict[str, tuple[int, str]],
+        seen: set[str],
+        stats: dict[str, int],
+        changed_icos: set[str],
+    ) -> int:
+        """
+        Diff a batch of parsed Subjekts against the stored content hashes.
+
+        New ICOs are inserted, changed ones are deleted and re-inserted with
+        their whole fact tree, unchanged ones are not touched, and ICOs already
+        seen earlier in the dataset are skipped. Updates `seen`, `stats` and
+        `changed_icos` in place and returns the number of rows written.
+        """
+        changed = []
+        content_hashes = []
+        stale_pks = []
+        for subjekt in batch:
+            ico = _subjekt_ico(subjekt)
+            if ico is None:
+                continue
+            if ico in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(ico)
+            content_hash = _content_hash(subjekt)
+            stored = existing.get(ico)
+            if stored is None:
+                stats["inserted"] += 1
+            elif stored[1] == content_hash:
+                stats["unchanged"] += 1
+                continue
+            else:
+                stats["updated"] += 1
+                stale_pks.append(stored[0])
+            changed.append(subjekt)
+            changed_icos.add(ico)
+            content_hashes.append(content_hash)
+
+        if stale_pks:
+            Entity.objects.filter(pk__in=stale_pks).delete()
+        if not changed:
+            return 0
+
+        _entities, row_count = self._ingest_batch(changed, dataset_id, content_hashes)
+        return row_count
+
+    def _ingest_batch(
+        self,
+        subjekts: list[Subjekt],
+        dataset_id: str,
+        content_hashes: list[str] | None = None,
+    ) -> tuple[list[Entity], int]:
+        """
+        Create Entities and all related records for a batch of parsed Subjekts.
+
+        Runs a fixed number of statements per batch regardless of its size:
+        Companies in bulk, one Entity INSERT, then facts, Persons and Addresses
+        through the configured loader ("orm" bulk_create or PostgreSQL "copy").
 
-        # Collect all facts as a flat list (DFS order), persons, and addresses.
-        # Each entry: (fact_kwargs, depth, parent_collect_index)
+        Returns (created entities, total rows inserted).
+        """
+        if content_hashes is None:
+            content_hashes = [_content_hash(s) for s in subjekts]
+
+        records = []
+        hashes = []
+        for subjekt, content_hash in zip(subjekts, content_hashes):
+            ico = _subjekt_ico(subjekt)
+            if ico is None:
+                continue
+            records.append((
+                ico,
+                subjekt,
+                self._extract_file_reference(subjekt.facts),
+                self._extract_legal_form(subjekt.facts),
+            ))
+            hashes.append(content_hash)
+        if not records:
+            return [], 0
+
+        companies = self._resolve_companies(records)
+
+        entities = Entity.objects.bulk_create([
+            Entity(
+                company=companies[ico],
+                ico=ico,
+                name=subjekt.name,
+                registration_date=_parse_date(subjekt.registration_date),
+                deletion_date=_parse_date(subjekt.deletion_date),
+                legal_form_code=legal_form.code if legal_form else "",
+                legal_form_name=legal_form.name if legal_form else "",
+                court_code=file_ref.court_code if file_ref else "",
+                court_name=file_ref.court_name if file_ref else "",
+                file_section=file_ref.section if file_ref else "",
+                file_number=_safe_int(file_ref.insert) if file_ref else None,
+                file_reference=(
+                    f"{file_ref.section} {file_ref.insert}/{file_ref.court_code}"
+                    if file_ref and file_ref.section
+                    else ""
+                ),
+                dataset_id=dataset_id,
+                is_active=not subjekt.deletion_date,
+                content_hash=content_hash,
+            )
+            for (ico, subjekt, file_ref, legal_form), content_hash in zip(
+                records, hashes
+            )
+        ])
+
+        # Collect all facts of the batch as a flat list (DFS order), persons,
+        # and addresses. Each entry: (fact_kwargs, depth, parent_collect_index)
         fact_entries = []
         persons_to_create = []
         addresses_to_create = []
 
-        _collect_facts(
-            entity,
-            subjekt.get("facts", []),
-            fact_entries,
-            persons_to_create,
-            addresses_to_create,
-            depth=0,
-            parent_collect_index=None,
+        for entity, (_ico, subjekt, _file_ref, _legal_form) in zip(entities, records):
+            _collect_facts(
+                entity,
+                subjekt.facts,
+                fact_entries,
+                persons_to_create,
+                addresses_to_create,
+                depth=0,
+                parent_collect_index=None,
+            )
+
+        if self.loader == "copy":
+            loaders.copy_facts(fact_entries, persons_to_create, addresses_to_create)
+        else:
+            self._bulk_create_facts(fact_entries, persons_to_create, addresses_to_create)
+
+        # Only new and changed entities reach this point, so unchanged
+        # entities keep their documents.
+        write_documents(entities)
+
+        row_count = (
+            len(entities)
+            + len(fact_entries)
+            + len(persons_to_create)
+            + len(addresses_to_create)
         )
+        return entities, row_count
+
+    @staticmethod
+    def _bulk_create_facts(
+        fact_entries: list, persons_to_create: list, addresses_to_create: list
+    ) -> None:
+        """ORM loader: one bulk_create per fact depth, then Persons and Addresses."""
+        # Group by depth for level-by-level bulk_create across the whole batch.
+        indices_by_depth: dict[int, list[int]] = {}
+        for ci, (_fact_kwargs, depth, _parent_ci) in enumerate(fact_entries):
+            indices_by_depth.setdefault(depth, []).append(ci)
 
-        # Group by depth for level-by-level bulk_create.
-        max_depth = max((e[1] for e in fact_entries), default=-1)
         # Map from collect_index → created EntityFact pk
         pk_by_collect_index = {}
 
-        for depth in range(max_depth + 1):
+        for depth in sorted(indices_by_depth):
+            collect_indices = indices_by_depth[depth]
             objs = []
-            collect_indices = []
-            for ci, (fact_kwargs, d, parent_ci) in enumerate(fact_entries):
-                if d != depth:
-                    continue
+            for ci in collect_indices:
+                fact_kwargs, _d, parent_ci = fact_entries[ci]
                 parent_pk = (
                     pk_by_collect_index[parent_ci]
                     if parent_ci is not None
                     else None
                 )
                 objs.append(EntityFact(**fact_kwargs, parent_fact_id=parent_pk))
-                collect_indices.append(ci)
             created = EntityFact.objects.bulk_create(objs)
             for ci, fact_obj in zip(collect_indices, created):
                 pk_by_collect_index[ci] = fact_obj.pk
@@ -498,26 +906,64 @@ class JusticeSyncService:
         if addresses_to_create:
             Address.objects.bulk_create([Address(**a) for a in addresses_to_create])
 
-        return entity
+    def _resolve_companies(self, records: list[tuple]) -> dict[str, Company]:
+        """
+        Get-or-create the Company hub records for a batch, keyed by ICO.
+
+        Existing companies keep their name and status (first Subjekt wins for
+        new ones), matching get_or_create semantics without a query per ICO.
+        """
+        new_companies = {}
+        legal_form_by_ico = {}
+        for ico, subjekt, _file_ref, legal_form in records:
+            if ico not in new_companies:
+                new_companies[ico] = Company(
+                    ico=ico,
+                    name=subjekt.name,
+                    is_active=not subjekt.deletion_date,
+                )
+            if legal_form and legal_form.code:
+                legal_form_by_ico.setdefault(ico, legal_form.code)
+
+        # In ICO order, like the document upsert, so that parallel workers
+        # lock shared rows in the same order within a batch.
+        Company.objects.bulk_create(
+            sorted(new_companies.values(), key=lambda company: company.ico),
+            ignore_conflicts=True,
+        )
+
+        # Phase 2: Populate search fields from Justice if not already set by ARES.
+        if legal_form_by_ico:
+            Company.objects.filter(ico__in=legal_form_by_ico, legal_form="").update(
+                legal_form=Case(
+                    *[
+                        When(ico=ico, then=Value(code))
+                        for ico, code in legal_form_by_ico.items()
+                    ],
+                    default=F("legal_form"),
+                )
+            )
+
+        return Company.objects.in_bulk(list(new_companies), field_name="ico")
 
-    def _extract_file_reference(self, facts: list[dict]) -> dict | None:
+    def _extract_file_reference(self, facts: tuple[Udaj, ...]) -> SpisZn | None:
         """Find the spisZn (file reference) from the fact tree."""
         for fact in facts:
-            ref = fact.get("file_reference")
-            if ref and ref.get("section"):
+            ref = fact.file_reference
+            if ref and ref.section:
                 return ref
-            sub_ref = self._extract_file_reference(fact.get("sub_facts", []))
+            sub_ref = self._extract_file_reference(fact.sub_facts)
             if sub_ref:
                 return sub_ref
         return None
 
-    def _extract_legal_form(self, facts: list[dict]) -> dict | None:
+    def _extract_legal_form(self, facts: tuple[Udaj, ...]) -> PravniForma | None:
         """Find the pravniForma (legal form) from the fact tree."""
         for fact in facts:
-            lf = fact.get("legal_form")
-            if lf and lf.get("code"):
+            lf = fact.legal_form
+            if lf and lf.code:
                 return lf
-            sub_lf = self._extract_legal_form(fact.get("sub_facts", []))
+            sub_lf = self._extract_legal_form(fact.sub_facts)
             if sub_lf:
                 return sub_lf
         return None
@@ -563,12 +1009,25 @@ class JusticeSyncService:
             "year": year,
         }
 
+    @staticmethod
+    def _skipped_result(ds: DatasetSync) -> dict:
+        return {
+            "datasetId": ds.dataset_id,
+            "status": "skipped",
+            "entityCount": ds.entity_count,
+            "durationSeconds": 0,
+        }
+
     @staticmethod
     def _sync_result(ds: DatasetSync, start: float) -> dict:
         return {
             "datasetId": ds.dataset_id,
             "status": ds.status,
             "entityCount": ds.entity_count,
+            "insertedCount": ds.inserted_count,
+            "updatedCount": ds.updated_count,
+            "unchangedCount": ds.unchanged_count,
+            "removedCount": ds.removed_count,
             "durationSeconds": round(time.monotonic() - start, 2),
         }
 
@@ -580,7 +1039,7 @@ class JusticeSyncService:
 
 def _collect_facts(
     entity: Entity,
-    facts: list[dict],
+    facts: tuple[Udaj, ...],
     fact_entries: list,
     persons_list: list,
     addresses_list: list,
@@ -594,78 +1053,177 @@ def _collect_facts(
     The collect_index is the position in fact_entries, used later to
     resolve parent PKs after level-by-level creation.
     """
-    for fact_dict in facts:
-        fact_type = fact_dict.get("fact_type") or {}
+    for fact in facts:
+        fact_type = fact.fact_type
         collect_index = len(fact_entries)
 
         fact_kwargs = {
             "entity": entity,
-            "header": fact_dict.get("header", ""),
-            "fact_type_code": fact_type.get("code", ""),
-            "fact_type_name": fact_type.get("name", ""),
-            "value_text": fact_dict.get("value_text", ""),
-            "value_data": fact_dict.get("value_data"),
-            "registration_date": _parse_date(fact_dict.get("registration_date")),
-            "deletion_date": _parse_date(fact_dict.get("deletion_date")),
-            "function_name": fact_dict.get("function_name", ""),
-            "function_from": _parse_date(fact_dict.get("function_from")),
-            "function_to": _parse_date(fact_dict.get("function_to")),
-            "membership_from": _parse_date(fact_dict.get("membership_from")),
-            "membership_to": _parse_date(fact_dict.get("membership_to")),
+            "header": fact.header,
+            "fact_type_code": fact_type.code if fact_type else "",
+            "fact_type_name": fact_type.name if fact_type else "",
+            "value_text": fact.value_text,
+            "value_data": fact.value_data,
+            "registration_date": _parse_date(fact.registration_date),
+            "deletion_date": _parse_date(fact.deletion_date),
+            "function_name": fact.function_name,
+            "function_from": _parse_date(fact.function_from),
+            "function_to": _parse_date(fact.function_to),
+            "membership_from": _parse_date(fact.membership_from),
+            "membership_to": _parse_date(fact.membership_to),
         }
         fact_entries.append((fact_kwargs, depth, parent_collect_index))
 
         # Person
-        person_dict = fact_dict.get("person")
-        if person_dict:
-            is_natural = person_dict.get("type") == "natural"
+        person = fact.person
+        if person:
             persons_list.append({
                 "_fact_idx": collect_index,
-                "first_name": person_dict.get("first_name", ""),
-                "last_name": person_dict.get("last_name", ""),
-                "birth_date": _parse_date(person_dict.get("birth_date")),
-                "title_before": person_dict.get("title_before", ""),
-                "title_after": person_dict.get("title_after", ""),
-                "entity_name": person_dict.get("entity_name", ""),
-                "entity_ico": person_dict.get("ico", ""),
-                "reg_number": person_dict.get("reg_number", ""),
-                "euid": person_dict.get("euid", ""),
-                "person_text": person_dict.get("person_text", ""),
-                "is_natural_person": is_natural,
+                "first_name": person.first_name,
+                "last_name": person.last_name,
+                "birth_date": _parse_date(person.birth_date),
+                "title_before": person.title_before,
+                "title_after": person.title_after,
+                "entity_name": person.entity_name,
+                "entity_ico": person.ico,
+                "reg_number": person.reg_number,
+                "euid": person.euid,
+                "person_text": person.person_text,
+                "is_natural_person": person.is_natural,
             })
 
         # Addresses
-        for addr_key, addr_type in [("address", "address"), ("residence", "residence")]:
-            addr_dict = fact_dict.get(addr_key)
-            if addr_dict:
+        for address, address_type in ((fact.address, "address"), (fact.residence, "residence")):
+            if address:
                 addresses_list.append({
                     "_fact_idx": collect_index,
-                    "address_type": addr_type,
-                    "country": addr_dict.get("country", ""),
-                    "municipality": addr_dict.get("municipality", ""),
-                    "city_part": addr_dict.get("city_part", ""),
-                    "street": addr_dict.get("street", ""),
-                    "house_number": addr_dict.get("house_number", ""),
-                    "orientation_number": addr_dict.get("orientation_number", ""),
-                    "evidence_number": addr_dict.get("evidence_number", ""),
-                    "number_text": addr_dict.get("number_text", ""),
-                    "postal_code": addr_dict.get("postal_code", ""),
-                    "district": addr_dict.get("district", ""),
-                    "full_address": addr_dict.get("full_address", ""),
-                    "supplementary_text": addr_dict.get("supplementary_text", ""),
+                    "address_type": address_type,
+                    **address._asdict(),
                 })
 
         # Recurse into sub-facts.
-        sub_facts = fact_dict.get("sub_facts", [])
-        if sub_facts:
+        if fact.sub_facts:
             _collect_facts(
-                entity, sub_facts, fact_entries,
+                entity, fact.sub_facts, fact_entries,
                 persons_list, addresses_list,
                 depth=depth + 1,
                 parent_collect_index=collect_index,
             )
 
 
+def _sync_dataset_worker(
+    dataset_id: str,
+    force: bool,
+    batch_size: int,
+    loader: str,
+    from_spool: bool,
+    parse_workers: int,
+) -> dict:
+    """Process-pool entry point: sync one dataset with a fresh HTTP session."""
+    service = JusticeSyncService(
+        client=JusticeCKANClient(),
+        batch_size=batch_size,
+        loader=loader,
+        parse_workers=parse_workers,
+    )
+    try:
+        return service.sync_dataset(dataset_id, force=force, from_spool=from_spool)
+    finally:
+        connections.close_all()
+
+
+def _is_deadlock(error: OperationalError) -> bool:
+    """Whether a database error is PostgreSQL's deadlock_detected (40P01)."""
+    return getattr(error.__cause__, "sqlstate", None) == "40P01"
+
+
+def _failed_result(dataset_id: str, error: Exception) -> dict:
+    """Sync result for a dataset whose sync raised before completing."""
+    return {
+        "datasetId": dataset_id,
+        "status": "failed",
+        "entityCount": 0,
+        "durationSeconds": 0,
+        "error": str(error)[:500],
+    }
+
+
+def _fetch_document_files(client, doc: dict, statement: FinancialStatement | None) -> bool:
+    """
+    Fill in a document's files and financial data.
+
+    The detail page is fetched only while the document's files are unknown
+    (None), and the XML only while it has not been processed
+    (financialChecked); the financial data of processed XMLs comes from
+    `statement`.
+
+    Returns False if a page or file could not be fetched; the document then
+    has no files (detail page failed) or no financial data (XML failed).
+    """
+    doc["financialData"] = None
+    if doc["files"] is None:
+        try:
+            doc["files"] = client.get_document_files(
+                doc["documentId"], doc["subjektId"], doc["spisId"]
+            )
+        except ExternalAPIError:
+            logger.warning("Sbirka detail fetch failed for document %s", doc["documentId"])
+            return False
+
+    if statement is not None:
+        doc["financialData"] = to_financial_data(statement)
+        doc["financialChecked"] = True
+        return True
+
+    # Try to find and parse XML financial data
+    xml_file = next((f for f in doc["files"] if f["isXml"]), None)
+    if not xml_file or doc["financialChecked"]:
+        doc["financialChecked"] = True
+        return True
+    try:
+        content, content_type, filename = client.download_file(xml_file["downloadId"])
+    except ExternalAPIError:
+        logger.warning("Sbirka XML download failed for document %s", doc["documentId"])
+        return False
+    if content and b"<UcetniZaverka" in content:
+        try:
+            doc["financialData"] = parse_financial_xml(content)
+        except Exception:
+            logger.warning(
+                "Unparseable financial XML in document %s", doc["documentId"], exc_info=True
+            )
+    doc["financialChecked"] = True
+    return True
+
+
+def _invalidate_caches(changed_icos: set[str]) -> None:
+    """
+    Drop cached API data made stale by a sync: the per-ICO entity and company
+    details of changed entities, and all Justice searches and search counts.
+    """
+    justice_cache = JusticeService().cache
+    justice_cache.bump(*CACHE_VERSIONED_NAMESPACES)
+    justice_cache.delete_many("entity", changed_icos)
+
+    company_cache = CompanyService().cache
+    company_cache.bump("count")
+    company_cache.delete_many("detail", changed_icos)
+
+
+def _subjekt_ico(subjekt: Subjekt) -> str | None:
+    """Zero-padded ICO of a parsed Subjekt, or None if it has no usable ICO."""
+    ico = subjekt.ico.zfill(8)
+    if ico == "00000000":
+        return None
+    return ico
+
+
+def _content_hash(subjekt: Subjekt) -> str:
+    """Stable SHA-256 of a parsed Subjekt, used to detect changed entities."""
+    serialized = json.dumps(subjekt.as_dict(), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
 def _parse_date(value: str | None):
     """Parse a date string (YYYY-MM-DD) or return None."""
     if not value:
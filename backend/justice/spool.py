@@ -0,0 +1,75 @@
+"""
+On-disk spool for downloaded dataor.justice.cz files.
+
+Downloaded .xml.gz files are kept in a content-addressed store so that a
+forced re-sync or a parser fix can re-parse them without going back through
+the outbound throttle:
+
+    <JUSTICE_SPOOL_DIR>/
+        objects/<sha256>.xml.gz    file contents, named by their SHA-256
+        refs/<dataset_id>.json     latest object for a dataset + HTTP validators
+        tmp/                       in-progress downloads
+
+The store is bounded by JUSTICE_SPOOL_MAX_BYTES (see justice.object_store for
+eviction).
+"""
+from pathlib import Path
+
+from django.conf import settings
+
+from .object_store import ContentAddressedStore
+
+
+class DatasetSpool(ContentAddressedStore):
+    """Content-addressed, size-bounded store of downloaded dataset files."""
+
+    object_suffix = ".xml.gz"
+    object_label = "spooled file"
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None):
+        super().__init__(
+            root or settings.JUSTICE_SPOOL_DIR,
+            max_bytes if max_bytes is not None else settings.JUSTICE_SPOOL_MAX_BYTES,
+        )
+
+    def get(self, dataset_id: str) -> dict | None:
+        """
+        Spool entry for a dataset, or None if it was never spooled or evicted.
+
+        The entry carries "path", "sha256", "size", "etag", "lastModified",
+        "resourceLastModified" and "resourceHash". Marks the object as used.
+        """
+        return super().get(dataset_id)
+
+    def dataset_ids(self) -> list[str]:
+        """IDs of all datasets with a spooled file."""
+        return self.ref_ids()
+
+    def reserve(self, dataset_id: str) -> str:
+        """Create an empty temporary file for a download inside the spool."""
+        return super().reserve(prefix=f"{dataset_id}-", suffix=".xml.gz")
+
+    def commit(self, dataset_id: str, tmp_path: str, metadata: dict) -> dict:
+        """
+        Move a finished download into the object store and point the
+        dataset's ref at it.
+
+        Args:
+            dataset_id: Dataset the file belongs to.
+            tmp_path: Path returned by reserve(), fully written.
+            metadata: etag / lastModified / resourceLastModified / resourceHash
+                to store with the ref.
+
+        Returns:
+            The spool entry, as returned by get().
+        """
+        return super().commit(
+            dataset_id,
+            tmp_path,
+            {
+                "etag": metadata.get("etag", ""),
+                "lastModified": metadata.get("lastModified", ""),
+                "resourceLastModified": metadata.get("resourceLastModified", ""),
+                "resourceHash": metadata.get("resourceHash", ""),
+            },
+        )
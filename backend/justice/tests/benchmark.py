@@ -0,0 +1,28 @@
+"""
+Shared helpers for parser micro-benchmarks.
+
+Wall-clock comparisons are noisy on loaded CI runners, so timing assertions
+are opt-in: tests marked with `benchmark` only run with RUN_BENCHMARKS=1.
+Correctness checks of the benchmarked code paths run unconditionally.
+"""
+import os
+import time
+
+import pytest
+
+ROUNDS = 5
+
+benchmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="timing benchmark; set RUN_BENCHMARKS=1 to run",
+)
+
+
+def best_time(fn, rounds: int = ROUNDS) -> float:
+    """Fastest of `rounds` runs of fn(), in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -1,6 +1,8 @@
 import pytest
 from django.core.cache import cache
 
+from core.tests.cache_backends import serialized_cache  # noqa: F401
+
 SAMPLE_SUBJEKT_XML = """<xml>
 <Subjekt>
   <nazev>Test Company s.r.o.</nazev>
@@ -98,6 +100,18 @@ def clear_cache():
     yield
     cache.clear()
 
+@pytest.fixture(autouse=True)
+def spool_dir(settings, tmp_path):
+    """Keep spooled dataset files in a per-test directory."""
+    settings.JUSTICE_SPOOL_DIR = str(tmp_path / "spool")
+    return tmp_path / "spool"
+
+@pytest.fixture(autouse=True)
+def document_cache_dir(settings, tmp_path):
+    """Keep proxied document files in a per-test directory."""
+    settings.JUSTICE_DOCUMENT_CACHE_DIR = str(tmp_path / "documents")
+    return tmp_path / "documents"
+
 @pytest.fixture
 def sample_xml_bytes():
     return SAMPLE_SUBJEKT_XML.encode("utf-8")
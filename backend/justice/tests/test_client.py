@@ -0,0 +1,232 @@
+"""
+Tests for the Justice HTTP clients.
+
+The requests session is replaced with a MagicMock so that dropped
+connections and partial bodies can be simulated deterministically.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from core.exceptions import ExternalAPIError
+from justice.client import JusticeCKANClient
+from justice.constants import DOWNLOAD_MAX_RETRIES
+
+
+def _response(status_code=200, chunks=(), headers=None, fail_after=False):
+    """Fake streamed response; optionally drops the connection after `chunks`."""
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+
+    def iter_content(chunk_size):
+        yield from chunks
+        if fail_after:
+            raise requests.ConnectionError("connection reset")
+
+    resp.iter_content.side_effect = iter_content
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
+    return resp
+
+
+@pytest.fixture
+def ckan_client():
+    client = JusticeCKANClient()
+    client.session = MagicMock()
+    return client
+
+
+@patch("justice.client.time.sleep")
+class TestDownloadFile:
+    def test_download_writes_file_and_returns_validators(self, _sleep, ckan_client, tmp_path):
+        """A plain 200 writes the body and reports ETag / Last-Modified / size."""
+        ckan_client.session.get.return_value = _response(
+            chunks=[b"abc", b"def"],
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"},
+        )
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abcdef"
+        assert meta == {
+            "etag": '"v1"',
+            "lastModified": "Mon, 01 Jan 2026 00:00:00 GMT",
+            "size": 6,
+        }
+
+    def test_conditional_get_not_modified(self, _sleep, ckan_client, tmp_path):
+        """Stored validators are sent; a 304 returns None."""
+        ckan_client.session.get.return_value = _response(status_code=304)
+
+        meta = ckan_client.download_file(
+            "data.xml.gz", str(tmp_path / "f"), etag='"v1"', last_modified="yesterday"
+        )
+
+        assert meta is None
+        headers = ckan_client.session.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}
+
+    def test_dropped_connection_resumes_with_range(self, _sleep, ckan_client, tmp_path):
+        """After a drop, the download continues from the written offset."""
+        ckan_client.session.get.side_effect = [
+            _response(chunks=[b"abc"], headers={"ETag": '"v1"'}, fail_after=True),
+            _response(status_code=206, chunks=[b"def"], headers={"Content-Range": "bytes 3-5/6"}),
+        ]
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abcdef"
+        assert meta["size"] == 6
+        resume_headers = ckan_client.session.get.call_args_list[1].kwargs["headers"]
+        assert resume_headers == {"Range": "bytes=3-", "If-Range": '"v1"'}
+
+    def test_partial_content_at_wrong_offset_restarts(self, _sleep, ckan_client, tmp_path):
+        """A 206 that does not continue at the written offset is never appended."""
+        responses = [
+            _response(chunks=[b"abc"], headers={"ETag": '"v1"'}, fail_after=True),
+            _response(status_code=206, chunks=[b"abcdef"], headers={"Content-Range": "bytes 0-5/6"}),
+            _response(chunks=[b"abcdef"], headers={"ETag": '"v1"'}),
+        ]
+        ckan_client.session.get.side_effect = responses
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abcdef"
+        assert meta["size"] == 6
+        assert "Range" not in ckan_client.session.get.call_args_list[2].kwargs["headers"]
+        for resp in responses:
+            resp.close.assert_called_once()
+
+    def test_range_not_satisfiable_for_complete_file(self, _sleep, ckan_client, tmp_path):
+        """A 416 reporting the written length means nothing was missing."""
+        ckan_client.session.get.side_effect = [
+            _response(chunks=[b"abcdef"], headers={"ETag": '"v1"'}, fail_after=True),
+            _response(status_code=416, headers={"Content-Range": "bytes */6"}),
+        ]
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abcdef"
+        assert meta == {"etag": '"v1"', "lastModified": "", "size": 6}
+
+    def test_range_ignored_restarts_from_zero(self, _sleep, ckan_client, tmp_path):
+        """A 200 answer to a Range request (file changed) rewrites the file."""
+        ckan_client.session.get.side_effect = [
+            _response(chunks=[b"old"], headers={"ETag": '"v1"'}, fail_after=True),
+            _response(chunks=[b"new-body"], headers={"ETag": '"v2"'}),
+        ]
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"new-body"
+        assert meta["etag"] == '"v2"'
+
+    def test_gives_up_after_max_retries(self, _sleep, ckan_client, tmp_path):
+        """Persistent failures surface as ExternalAPIError."""
+        ckan_client.session.get.side_effect = requests.ConnectionError("down")
+
+        with pytest.raises(ExternalAPIError):
+            ckan_client.download_file("data.xml.gz", str(tmp_path / "f"))
+
+    def test_server_error_during_resume_is_retried(self, _sleep, ckan_client, tmp_path):
+        """A 503 keeps the partial file; the next attempt resumes it."""
+        ckan_client.session.get.side_effect = [
+            _response(chunks=[b"abc"], headers={"ETag": '"v1"'}, fail_after=True),
+            _response(status_code=503),
+            _response(status_code=206, chunks=[b"def"], headers={"Content-Range": "bytes 3-5/6"}),
+        ]
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abcdef"
+        assert meta["size"] == 6
+        resume_headers = ckan_client.session.get.call_args_list[2].kwargs["headers"]
+        assert resume_headers == {"Range": "bytes=3-", "If-Range": '"v1"'}
+
+    def test_too_many_requests_waits_for_retry_after(self, sleep, ckan_client, tmp_path):
+        """A 429 is retried after the server's Retry-After."""
+        ckan_client.session.get.side_effect = [
+            _response(status_code=429, headers={"Retry-After": "7"}),
+            _response(chunks=[b"abc"]),
+        ]
+        dest = tmp_path / "data.xml.gz"
+
+        meta = ckan_client.download_file("data.xml.gz", str(dest))
+
+        assert dest.read_bytes() == b"abc"
+        assert meta["size"] == 3
+        sleep.assert_called_once_with(7.0)
+
+    def test_persistent_server_error_gives_up(self, _sleep, ckan_client, tmp_path):
+        ckan_client.session.get.return_value = _response(status_code=502)
+
+        with pytest.raises(ExternalAPIError):
+            ckan_client.download_file("data.xml.gz", str(tmp_path / "f"))
+        assert ckan_client.session.get.call_count == DOWNLOAD_MAX_RETRIES + 1
+
+    def test_http_error_is_mapped(self, _sleep, ckan_client, tmp_path):
+        """Client errors are not retried and map to ExternalAPIError."""
+        ckan_client.session.get.return_value = _response(status_code=404)
+
+        with pytest.raises(ExternalAPIError) as exc_info:
+            ckan_client.download_file("data.xml.gz", str(tmp_path / "f"))
+        assert exc_info.value.status_code == 404
+        assert ckan_client.session.get.call_count == 1
+
+
+class TestSbirkaClient:
+    def test_connection_pool_is_capped_per_host(self):
+        from justice.client import JusticeSbirkaClient
+        from justice.constants import JUSTICE_BASE_URL, SBIRKA_MAX_CONNECTIONS
+
+        adapter = JusticeSbirkaClient().session.get_adapter(f"{JUSTICE_BASE_URL}/ias/ui/x")
+
+        assert adapter._pool_maxsize == SBIRKA_MAX_CONNECTIONS
+        assert adapter._pool_block is True
+
+    def test_document_files_fetch_error_is_raised(self):
+        from justice.client import JusticeSbirkaClient
+
+        client = JusticeSbirkaClient()
+        client.session = MagicMock()
+        client.session.get.return_value = _response(status_code=503)
+
+        with pytest.raises(ExternalAPIError):
+            client.get_document_files("1", "2", "3")
+
+    def test_download_to_file_streams_to_disk(self, tmp_path):
+        from justice.client import JusticeSbirkaClient
+
+        client = JusticeSbirkaClient()
+        client.session = MagicMock()
+        resp = _response(
+            chunks=[b"%PDF", b"-1.4"],
+            headers={
+                "content-type": "application/pdf",
+                "content-disposition": 'attachment; filename="vz.pdf"',
+            },
+        )
+        client.session.get.return_value.__enter__.return_value = resp
+        dest = tmp_path / "doc"
+
+        assert client.download_to_file("abc", str(dest)) == ("application/pdf", "vz.pdf")
+        assert dest.read_bytes() == b"%PDF-1.4"
+        assert client.session.get.call_args.kwargs["stream"] is True
+
+    def test_document_list_fetch_error_is_raised(self):
+        from justice.client import JusticeSbirkaClient
+
+        client = JusticeSbirkaClient()
+        client.session = MagicMock()
+        client.session.get.return_value = _response(status_code=503)
+
+        with pytest.raises(ExternalAPIError):
+            client.get_document_list("555")
@@ -0,0 +1,192 @@
+"""
+Tests for the on-disk document cache and the streaming DocumentProxyView.
+"""
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from core.exceptions import ExternalAPIError
+from justice.document_cache import DocumentCache
+
+DOWNLOAD_ID = "0f2c6b7e-1d2a-4c3b-9e8f-001122334455"
+URL = f"/api/v1/justice/documents/{DOWNLOAD_ID}/"
+CONTENT = bytes(range(256)) * 40  # 10 240 bytes
+
+
+def _store(document_cache, download_id, content):
+    tmp_path = document_cache.reserve()
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    return document_cache.commit(download_id, tmp_path, "application/pdf", "vz.pdf")
+
+
+class TestDocumentCache:
+    def test_commit_and_get(self, tmp_path):
+        document_cache = DocumentCache(tmp_path, max_bytes=1000)
+
+        entry = _store(document_cache, "a-1", b"data")
+
+        assert document_cache.get("a-1") == entry
+        assert entry["size"] == 4
+        assert entry["contentType"] == "application/pdf"
+        assert os.listdir(document_cache.tmp_dir) == []
+
+    def test_concurrent_first_fetches_of_one_id(self, tmp_path):
+        """Workers storing the same download id at once must not collide."""
+        document_cache = DocumentCache(tmp_path, max_bytes=10_000)
+        errors = []
+
+        def fetch():
+            try:
+                for _ in range(50):
+                    _store(document_cache, "a-1", b"data")
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert document_cache.get("a-1")["size"] == 4
+        assert os.listdir(document_cache.refs_dir) == ["a-1.json"]
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        document_cache = DocumentCache(tmp_path, max_bytes=10)
+        old = _store(document_cache, "a-1", b"123456")
+        os.utime(old["path"], (time.time() - 60, time.time() - 60))
+
+        _store(document_cache, "a-2", b"abcdef")
+
+        assert document_cache.get("a-1") is None
+        assert document_cache.get("a-2") is not None
+
+    @pytest.mark.parametrize("download_id", ["../etc", "a/b", "", "x" * 65])
+    def test_rejects_unsafe_ids(self, download_id):
+        assert not DocumentCache.is_valid_id(download_id)
+
+
+def _client(content=CONTENT):
+    client = MagicMock()
+
+    def download_to_file(download_id, dest_path):
+        with open(dest_path, "wb") as f:
+            f.write(content)
+        return "application/pdf", "vz.pdf"
+
+    client.download_to_file.side_effect = download_to_file
+    return client
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestDocumentProxyView:
+    def setup_method(self):
+        self.api = APIClient()
+
+    def test_first_request_downloads_then_serves_from_disk(self):
+        client = _client()
+        with patch("justice.views.justice_sbirka_client", client):
+            first = self.api.get(URL)
+            second = self.api.get(URL)
+
+        assert client.download_to_file.call_count == 1
+        for response in (first, second):
+            assert response.status_code == 200
+            assert _body(response) == CONTENT
+            assert response["Content-Type"] == "application/pdf"
+            assert response["Content-Length"] == str(len(CONTENT))
+            assert response["Accept-Ranges"] == "bytes"
+            assert 'filename="vz.pdf"' in response["Content-Disposition"]
+            assert response["Content-Disposition"].startswith("inline")
+
+    def test_range_request(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            response = self.api.get(URL, HTTP_RANGE="bytes=100-299")
+
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes 100-299/{len(CONTENT)}"
+        assert response["Content-Length"] == "200"
+        assert _body(response) == CONTENT[100:300]
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [("bytes=10000-", CONTENT[10000:]), ("bytes=-40", CONTENT[-40:]), ("bytes=10200-99999", CONTENT[10200:])],
+    )
+    def test_open_and_suffix_ranges(self, header, expected):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            response = self.api.get(URL, HTTP_RANGE=header)
+
+        assert response.status_code == 206
+        assert _body(response) == expected
+
+    def test_unsatisfiable_range(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            response = self.api.get(URL, HTTP_RANGE="bytes=20000-")
+
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    def test_multiple_ranges_get_whole_file(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            response = self.api.get(URL, HTTP_RANGE="bytes=0-1,5-6")
+
+        assert response.status_code == 200
+        assert _body(response) == CONTENT
+
+    def test_if_none_match_returns_304(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            etag = self.api.get(URL)["ETag"]
+            response = self.api.get(URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_if_modified_since_returns_304(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            last_modified = self.api.get(URL)["Last-Modified"]
+            response = self.api.get(URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_stale_if_range_gets_whole_file(self):
+        with patch("justice.views.justice_sbirka_client", _client()):
+            etag = self.api.get(URL)["ETag"]
+            fresh = self.api.get(URL, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+            stale = self.api.get(URL, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"other"')
+            dated = self.api.get(
+                URL, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=http_date(time.time() - 86400)
+            )
+
+        assert fresh.status_code == 206
+        assert stale.status_code == 200
+        assert dated.status_code == 200
+
+    def test_upstream_failure_returns_502_and_caches_nothing(self, document_cache_dir):
+        client = MagicMock()
+        client.download_to_file.side_effect = ExternalAPIError("down", service_name="justice")
+
+        with patch("justice.views.justice_sbirka_client", client):
+            response = self.api.get(URL)
+
+        assert response.status_code == 502
+        assert DocumentCache().get(DOWNLOAD_ID) is None
+        assert os.listdir(document_cache_dir / "tmp") == []
+
+    def test_invalid_id(self):
+        client = _client()
+        with patch("justice.views.justice_sbirka_client", client):
+            response = self.api.get("/api/v1/justice/documents/bad.id/")
+
+        assert response.status_code == 400
+        client.download_to_file.assert_not_called()
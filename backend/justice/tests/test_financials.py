@@ -0,0 +1,207 @@
+"""
+Tests for the financial statement store (justice.financials) and its use by
+the Sbírka document endpoint and the financial_sync command.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+
+from company.models import Company
+from company.services import CompanyService
+from justice.financials import (
+    build_statement,
+    parse_period_date,
+    refresh_latest_revenue,
+    store_statements,
+)
+from justice.models import Entity, FinancialStatement
+from justice.parsers.financial_xml_parser import parse_financial_xml
+from justice.services import JusticeService
+
+
+def _xml(period_to="31.12.2023", sales=500, goods=20, currency=None):
+    mena = f' uv_mena="{currency}"' if currency else ""
+    return (
+        f'<UcetniZaverka><VetaD zdobd_od="01.01.2023" d_uv="{period_to}"'
+        f' uv_rozsah_rozv="Z" uv_rozsah_vzz="Z"{mena}/>'
+        '<VetaUA c_radku="1" kc_brutto="100" kc_korekce="0" kc_netto="100" kc_netto_min="90"/>'
+        '<VetaUD c_radku="1" kc_sled="100" kc_min="90"/>'
+        f'<VetaUB c_radku="1" kc_sled="{sales}" kc_min="400"/>'
+        f'<VetaUB c_radku="2" kc_sled="{goods}" kc_min="10"/>'
+        '<VetaUB c_radku="55" kc_sled="42" kc_min="30"/>'
+        "</UcetniZaverka>"
+    ).encode()
+
+
+def _statement(ico="12345678", document_id="1", **kwargs):
+    return build_statement(ico, document_id, parse_financial_xml(_xml(**kwargs)))
+
+
+class TestBuildStatement:
+    def test_revenue_is_sales_in_czk(self):
+        statement = _statement()
+
+        assert statement.period_to == date(2023, 12, 31)
+        assert statement.period_from == date(2023, 1, 1)
+        assert statement.revenue == Decimal(520_000)
+        assert statement.rozsah_vzz == "zkrácený"
+        assert [row["row"] for row in statement.vzz] == [1, 2, 55]
+
+    def test_fractional_amounts_sum_exactly(self):
+        parsed = parse_financial_xml(_xml())
+        parsed["vzz"][0]["current"] = 0.1
+        parsed["vzz"][1]["current"] = 0.2
+
+        statement = build_statement("12345678", "1", parsed)
+
+        assert statement.revenue == Decimal("300.0")
+
+    def test_foreign_currency_has_no_revenue(self):
+        assert _statement(currency="EUR").revenue is None
+
+    def test_missing_period_end_is_not_stored(self):
+        assert _statement(period_to="") is None
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("31.12.2023", date(2023, 12, 31)), ("2023-12-31", date(2023, 12, 31)), ("", None), (None, None)],
+    )
+    def test_parse_period_date(self, value, expected):
+        assert parse_period_date(value) == expected
+
+
+@pytest.mark.django_db
+class TestLatestRevenue:
+    def test_newest_statement_sets_latest_revenue(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+
+        changed = store_statements([
+            _statement(document_id="1", period_to="31.12.2022", sales=100),
+            _statement(document_id="2", period_to="31.12.2023", sales=300),
+        ])
+
+        assert changed == 1
+        assert Company.objects.get().latest_revenue == Decimal(320_000)
+
+    def test_newest_statement_without_revenue_is_skipped(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+
+        store_statements([
+            _statement(document_id="1", period_to="31.12.2022", sales=100),
+            _statement(document_id="2", period_to="31.12.2023", currency="EUR"),
+        ])
+
+        assert Company.objects.get().latest_revenue == Decimal(120_000)
+
+    def test_restore_is_idempotent(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+        store_statements([_statement()])
+
+        assert store_statements([_statement()]) == 0
+        assert FinancialStatement.objects.count() == 1
+
+    def test_revenue_change_invalidates_search_counts(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+        cache = CompanyService().cache
+        generation = cache.generation("count")
+
+        store_statements([_statement()])
+
+        assert cache.generation("count") != generation
+
+    def test_revenue_search_finds_company(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+        Company.objects.create(ico="87654321", name="Other s.r.o.")
+        store_statements([_statement()])
+
+        result = CompanyService().search({"revenueMin": Decimal(500_000)})
+
+        assert [c["ico"] for c in result["companies"]] == ["12345678"]
+
+    def test_refresh_all(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+        FinancialStatement.objects.bulk_create([_statement()])
+
+        assert refresh_latest_revenue() == 1
+        assert Company.objects.get().latest_revenue == Decimal(520_000)
+
+
+def _sbirka_client():
+    client = MagicMock()
+    client.get_subjekt_id.return_value = "555"
+    client.get_document_list.return_value = [
+        {"documentId": "1", "subjektId": "555", "spisId": "9"},
+        {"documentId": "2", "subjektId": "555", "spisId": "9"},
+    ]
+    client.get_document_files.side_effect = lambda document_id, *_: [{
+        "downloadId": f"x{document_id}", "filename": f"{document_id}.xml",
+        "isXml": True, "isPdf": False,
+    }]
+    client.download_file.return_value = (_xml(), "application/xml", "f.xml")
+    return client
+
+
+@pytest.mark.django_db
+class TestDocumentsUseStore:
+    def test_first_fetch_stores_statements(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+
+        with patch("justice.services.justice_sbirka_client", _sbirka_client()):
+            result = JusticeService().get_entity_documents("12345678")
+
+        assert FinancialStatement.objects.filter(ico="12345678").count() == 2
+        assert Company.objects.get().latest_revenue == Decimal(520_000)
+        assert result["documents"][0]["financialData"]["vzz"][0]["current"] == 500
+
+    def test_stored_statements_are_not_downloaded_again(self):
+        client = _sbirka_client()
+        with patch("justice.services.justice_sbirka_client", client):
+            first = JusticeService()._scrape_documents("12345678")
+            client.download_file.reset_mock()
+            second = JusticeService()._scrape_documents("12345678")
+
+        client.download_file.assert_not_called()
+        assert second["documents"] == first["documents"]
+
+
+@pytest.mark.django_db
+class TestFinancialSyncCommand:
+    def test_fetches_given_icos(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+
+        with patch("justice.services.justice_sbirka_client", _sbirka_client()):
+            call_command("financial_sync", "--ico", "12345678", "--delay", "0")
+
+        assert Company.objects.get().latest_revenue == Decimal(520_000)
+
+    def test_missing_advances_past_checked_companies(self):
+        for i in range(3):
+            company = Company.objects.create(ico=f"1000000{i}", name=f"Company {i}")
+            Entity.objects.create(
+                ico=company.ico, name=company.name, company=company, dataset_id="sro-actual-praha-2024"
+            )
+        client = _sbirka_client()
+        client.get_document_files.side_effect = lambda document_id, *_: [{
+            "downloadId": f"x{document_id}", "filename": f"{document_id}.pdf",
+            "isXml": False, "isPdf": True,
+        }]
+
+        seen = []
+        with patch("justice.services.justice_sbirka_client", client):
+            for _ in range(3):
+                client.get_subjekt_id.reset_mock()
+                call_command("financial_sync", "--missing", "--limit", "1", "--delay", "0")
+                seen.append(client.get_subjekt_id.call_args.args[0])
+
+        assert seen == ["10000000", "10000001", "10000002"]
+
+    def test_refresh_revenue(self):
+        Company.objects.create(ico="12345678", name="Test s.r.o.")
+        FinancialStatement.objects.bulk_create([_statement()])
+
+        call_command("financial_sync", "--refresh-revenue")
+
+        assert Company.objects.get().latest_revenue == Decimal(520_000)
@@ -248,20 +248,19 @@ class TestParseEntityDetail:
         entity = _mock_entity()
 
         sub_fact = _mock_fact(
+            id=2,
             header="Sub header",
             fact_type_code="SUB_TYPE",
             parent_fact_id=1,
         )
         sub_fact.person = _mock_person(first_name="Eva", last_name="Kralova")
         sub_fact.addresses.all.return_value = []
-        sub_fact.sub_facts.all.return_value = []
 
-        parent_fact = _mock_fact(parent_fact_id=None)
+        parent_fact = _mock_fact(id=1, parent_fact_id=None)
         parent_fact.person = _mock_person()
         parent_fact.addresses.all.return_value = []
-        parent_fact.sub_facts.all.return_value = [sub_fact]
 
-        result = parse_entity_detail(entity, [parent_fact])
+        result = parse_entity_detail(entity, [parent_fact, sub_fact])
 
         assert len(result["facts"]) == 1
         parent = result["facts"][0]
@@ -269,6 +268,25 @@ class TestParseEntityDetail:
         assert parent["subFacts"][0]["header"] == "Sub header"
         assert parent["subFacts"][0]["person"]["firstName"] == "Eva"
 
+    def test_deep_sub_facts_are_nested_in_id_order(self):
+        """The flat fact list is rebuilt into a tree of any depth."""
+        entity = _mock_entity()
+        facts = [
+            _mock_fact(id=1, parent_fact_id=None, header="root"),
+            _mock_fact(id=4, parent_fact_id=2, header="grandchild"),
+            _mock_fact(id=3, parent_fact_id=1, header="second child"),
+            _mock_fact(id=2, parent_fact_id=1, header="first child"),
+        ]
+        for fact in facts:
+            fact.addresses.all.return_value = []
+
+        result = parse_entity_detail(entity, facts)
+
+        root = result["facts"][0]
+        assert [f["header"] for f in root["subFacts"]] == ["first child", "second child"]
+        assert root["subFacts"][0]["subFacts"][0]["header"] == "grandchild"
+        assert root["subFacts"][1]["subFacts"] == []
+
 
 # ---------------------------------------------------------------------------
 # parse_history_entry
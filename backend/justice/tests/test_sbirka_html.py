@@ -0,0 +1,105 @@
+from pathlib import Path
+
+from justice.parsers.sbirka_html import iter_document_rows, iter_file_links
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class TestIterDocumentRows:
+    def test_list_page(self):
+        rows = list(iter_document_rows(load_fixture("sbirka_list.html"), "654321"))
+
+        assert [row["documentId"] for row in rows] == [
+            "71234561", "70234562", "69234563", "68234564", "67234565",
+        ]
+        assert rows[0] == {
+            "documentId": "71234561",
+            "subjektId": "654321",
+            "spisId": "88001",
+            "documentNumber": "C 12345/SL 45/MSPH",
+            "documentType": "účetní závěrka [2023], zpráva auditora [2023]",
+        }
+        assert rows[1]["documentType"] == (
+            "výroční zpráva [2022], účetní závěrka [2022], zpráva o vztazích [2022]"
+        )
+        assert rows[4]["documentType"] == "podpisový vzor"
+
+    def test_types_belong_to_the_preceding_link(self):
+        html = (
+            '<a href="./vypis-sl-detail?dokument=1&amp;subjektId=9&amp;spis=5"><span>A</span></a>'
+            '<a href="./vypis-sl-detail?dokument=2&amp;subjektId=9&amp;spis=5"><span>B</span></a>'
+            '<span class="symbol">stanovy</span>'
+        )
+        rows = list(iter_document_rows(html, "9"))
+
+        assert [(row["documentNumber"], row["documentType"]) for row in rows] == [
+            ("A", ""),
+            ("B", "stanovy"),
+        ]
+
+    def test_types_before_the_first_link_are_ignored(self):
+        html = (
+            '<span class="symbol">legenda</span>'
+            '<a href="./vypis-sl-detail?dokument=1&amp;subjektId=9&amp;spis=5"><span>A</span></a>'
+        )
+        rows = list(iter_document_rows(html, "9"))
+
+        assert rows[0]["documentType"] == ""
+
+    def test_link_without_number(self):
+        html = '<a href="./vypis-sl-detail?dokument=1&amp;subjektId=9&amp;spis=5">detail</a>'
+        rows = list(iter_document_rows(html, "9"))
+
+        assert rows[0]["documentNumber"] == ""
+
+    def test_empty_page(self):
+        assert list(iter_document_rows("<html><body></body></html>", "9")) == []
+
+
+class TestIterFileLinks:
+    def test_detail_page(self):
+        files = list(iter_file_links(load_fixture("sbirka_detail.html")))
+
+        assert files == [
+            {
+                "downloadId": "3f2a9c1e-7b4d-4e8a-9c21-5d6e7f8a9b01",
+                "filename": "C 12345_SL45_uz_2023.pdf",
+                "sizeKb": 1843,
+                "pageCount": 22,
+                "isXml": False,
+                "isPdf": True,
+            },
+            {
+                "downloadId": "4a1b2c3d-5e6f-4a7b-8c9d-0e1f2a3b4c02",
+                "filename": "C 12345_SL45_uz_2023.xml",
+                "sizeKb": 96,
+                "pageCount": None,
+                "isXml": True,
+                "isPdf": False,
+            },
+            {
+                "downloadId": "5b2c3d4e-6f7a-4b8c-9d0e-1f2a3b4c5d03",
+                "filename": "zprava_auditora_2023.pdf",
+                "sizeKb": 412,
+                "pageCount": 2,
+                "isXml": False,
+                "isPdf": True,
+            },
+        ]
+
+    def test_skipped_files(self):
+        html = (
+            '<a href="/download?id=aa"><span>Informace pro veřejnost.pdf</span></a>'
+            '<a href="/download?id=bb"><span>GDPR.pdf</span></a> (12 kB)'
+        )
+        assert list(iter_file_links(html)) == []
+
+    def test_metadata_outside_the_window_is_ignored(self):
+        html = '<a href="/download?id=aa">a.pdf</a>' + " " * 120 + "(12 kB)"
+        files = list(iter_file_links(html))
+
+        assert files[0]["sizeKb"] is None
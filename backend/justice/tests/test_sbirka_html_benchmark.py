@@ -0,0 +1,112 @@
+"""
+Sbírka HTML parser micro-benchmarks.
+
+The single-pass tokenizer in justice.parsers.sbirka_html vs. the regex
+scrapers it replaced (kept below as the reference): the list page parser
+matched every type span against every detail link, O(documents × types),
+and the detail page parser ran two extra searches per link on a fresh slice.
+Both must produce identical output on the fixture pages scaled up to a large
+company's Sbírka listin. The list page parser must also be faster (timed
+only with RUN_BENCHMARKS=1, see .benchmark); the detail page gain is within
+timing noise, so it is not timed.
+"""
+import html as html_module
+import re
+
+from justice.parsers.sbirka_html import iter_document_rows, iter_file_links
+
+from .benchmark import benchmark, best_time
+from .test_sbirka_html import load_fixture
+
+
+def _reference_document_table(html: str, subjekt_id: str) -> list[dict]:
+    docs = []
+    detail_pattern = re.compile(
+        r'vypis-sl-detail\?dokument=(\d+)&amp;subjektId=\d+&amp;spis=(\d+)'
+    )
+    type_pattern = re.compile(r'class="symbol">([^<]+)</span>')
+    number_pattern = re.compile(r'vypis-sl-detail[^>]*><span>([^<]+)</span>')
+
+    detail_matches = list(detail_pattern.finditer(html))
+    type_matches = list(type_pattern.finditer(html))
+    number_matches = list(number_pattern.finditer(html))
+
+    for i, detail_match in enumerate(detail_matches):
+        doc_types = []
+        if i < len(type_matches):
+            start_pos = detail_match.end()
+            end_pos = (
+                detail_matches[i + 1].start() if i + 1 < len(detail_matches) else len(html)
+            )
+            for tm in type_matches:
+                if start_pos <= tm.start() < end_pos:
+                    doc_types.append(tm.group(1))
+
+        doc_number = ""
+        if i < len(number_matches):
+            raw = number_matches[i].group(1)
+            doc_number = html_module.unescape(raw).replace("\xa0", " ").strip()
+
+        docs.append({
+            "documentId": detail_match.group(1),
+            "subjektId": subjekt_id,
+            "spisId": detail_match.group(2),
+            "documentNumber": doc_number,
+            "documentType": ", ".join(doc_types) if doc_types else "",
+        })
+    return docs
+
+
+def _reference_file_links(html: str) -> list[dict]:
+    files = []
+    link_pattern = re.compile(r'download\?id=([a-f0-9-]+)"[^>]*>\s*(?:<[^>]+>)?\s*([^<]+)')
+    for match in link_pattern.finditer(html):
+        filename = match.group(2).strip()
+        if "GDPR" in filename or "Informace" in filename:
+            continue
+        context = html[match.end():match.end() + 100]
+        size_match = re.search(r"\((\d+)\s*kB", context)
+        pages_match = re.search(r"počet stran:\s*(\d+)", context)
+        files.append({
+            "downloadId": match.group(1),
+            "filename": filename,
+            "sizeKb": int(size_match.group(1)) if size_match else None,
+            "pageCount": int(pages_match.group(1)) if pages_match else None,
+            "isXml": filename.lower().endswith(".xml"),
+            "isPdf": filename.lower().endswith(".pdf"),
+        })
+    return files
+
+
+def _scaled_page(name: str, start: str, end: str, copies: int) -> str:
+    """The fixture page with the part between `start` and `end` repeated."""
+    page = load_fixture(name)
+    head, rest = page.split(start, 1)
+    body, tail = rest.split(end, 1)
+    return head + start + body * copies + end + tail
+
+
+def _list_page() -> str:
+    return _scaled_page("sbirka_list.html", "<tbody>", "</tbody>", copies=100)  # 500 rows
+
+
+def test_document_table_matches_reference():
+    page = _list_page()
+
+    assert list(iter_document_rows(page, "654321")) == _reference_document_table(page, "654321")
+
+
+def test_file_links_match_reference():
+    page = _scaled_page("sbirka_detail.html", '<ul class="documents">', "</ul>", copies=100)
+
+    assert list(iter_file_links(page)) == _reference_file_links(page)
+
+
+@benchmark
+def test_document_table_is_faster_than_reference():
+    page = _list_page()
+
+    single_pass_time = best_time(lambda: list(iter_document_rows(page, "654321")))
+    reference_time = best_time(lambda: _reference_document_table(page, "654321"))
+
+    assert single_pass_time < reference_time
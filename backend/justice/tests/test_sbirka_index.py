@@ -0,0 +1,124 @@
+"""
+Tests for the stored or.justice.cz subject/document index (justice.sbirka_index)
+as used by JusticeService.get_entity_documents.
+"""
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.utils import timezone
+
+from core.exceptions import ExternalAPIError
+from justice.models import SbirkaDocument, SbirkaSubject
+from justice.services import JusticeService
+
+
+def _listed(*ids):
+    return [
+        {"documentId": i, "subjektId": "555", "spisId": "9", "documentNumber": f"C {i}"}
+        for i in ids
+    ]
+
+
+def _client(listed=("1", "2")):
+    client = MagicMock()
+    client.get_subjekt_id.return_value = "555"
+    client.get_document_list.return_value = _listed(*listed)
+    client.get_document_files.side_effect = lambda document_id, *_: [{
+        "downloadId": f"x{document_id}", "filename": f"{document_id}.xml",
+        "isXml": True, "isPdf": False,
+    }]
+    client.download_file.return_value = (b"<Other/>", "application/xml", "f.xml")
+    return client
+
+
+def _upstream_calls(client):
+    return (
+        client.get_subjekt_id.call_count
+        + client.get_document_list.call_count
+        + client.get_document_files.call_count
+        + client.download_file.call_count
+    )
+
+
+def _scrape(client):
+    with patch("justice.services.justice_sbirka_client", client):
+        return JusticeService()._scrape_documents("12345678")
+
+
+@pytest.mark.django_db
+class TestSbirkaIndex:
+    def test_first_request_builds_index(self):
+        client = _client()
+
+        result = _scrape(client)
+
+        assert _upstream_calls(client) == 1 + 1 + 2 + 2
+        assert result["subjektId"] == "555"
+        assert [d["documentId"] for d in result["documents"]] == ["1", "2"]
+        assert SbirkaSubject.objects.get().subjekt_id == "555"
+        docs = SbirkaDocument.objects.order_by("position")
+        assert [d.files[0]["downloadId"] for d in docs] == ["x1", "x2"]
+        assert all(d.financial_checked for d in docs)
+
+    def test_indexed_documents_need_no_upstream_calls(self):
+        first = _scrape(_client())
+        client = _client()
+
+        second = _scrape(client)
+
+        assert _upstream_calls(client) == 0
+        assert second == first
+
+    def test_recheck_fetches_list_page_and_new_documents_only(self):
+        _scrape(_client())
+        SbirkaSubject.objects.update(documents_checked_at=timezone.now() - timedelta(days=1))
+        client = _client(listed=("3", "1", "2"))
+
+        result = _scrape(client)
+
+        assert client.get_subjekt_id.call_count == 0
+        assert client.get_document_list.call_count == 1
+        assert [c.args[0] for c in client.get_document_files.call_args_list] == ["3"]
+        assert client.download_file.call_count == 1
+        assert [d["documentId"] for d in result["documents"]] == ["3", "1", "2"]
+        assert all(d["files"] for d in result["documents"])
+
+    def test_failed_detail_page_is_retried_next_time(self):
+        client = _client()
+        client.get_document_files.side_effect = ExternalAPIError("down", service_name="justice")
+        assert _scrape(client)["incomplete"] is True
+
+        client = _client()
+        result = _scrape(client)
+
+        assert client.get_document_files.call_count == 2
+        assert result["incomplete"] is False
+
+    def test_failed_recheck_serves_stored_index(self):
+        _scrape(_client())
+        SbirkaSubject.objects.update(documents_checked_at=timezone.now() - timedelta(days=1))
+        client = _client()
+        client.get_document_list.side_effect = ExternalAPIError("down", service_name="justice")
+
+        result = _scrape(client)
+
+        assert result["incomplete"] is True
+        assert [d["documentId"] for d in result["documents"]] == ["1", "2"]
+
+    def test_failed_first_listing_raises(self):
+        client = _client()
+        client.get_document_list.side_effect = ExternalAPIError("down", service_name="justice")
+
+        with pytest.raises(ExternalAPIError):
+            _scrape(client)
+
+    def test_unknown_ico_is_not_stored(self):
+        client = _client()
+        client.get_subjekt_id.return_value = None
+
+        with pytest.raises(ExternalAPIError) as exc_info:
+            _scrape(client)
+
+        assert exc_info.value.status_code == 404
+        assert not SbirkaSubject.objects.exists()
@@ -4,14 +4,31 @@ Tests for JusticeService and JusticeSyncService business logic.
 Uses pytest + pytest-django. All DB tests decorated with @pytest.mark.django_db.
 Models created directly via Model.objects.create() — no factories.
 """
+import os
+
+import psycopg
 import pytest
 from datetime import date
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
 from unittest.mock import patch, MagicMock
 
 from company.models import Company
-from justice.services import JusticeService, JusticeSyncService
-from justice.models import Address, DatasetSync, Entity, EntityFact, Person
+from justice import loaders
+from justice.documents import write_documents
+from justice.parsers.xml_parser import parse_xml_bytes
+from justice.services import JusticeService, JusticeSyncService, _content_hash
+from justice.models import Address, DatasetSync, Entity, EntityDocument, EntityFact, Person
+from justice.parsers.records import Adresa, Osoba, PravniForma, Subjekt, Udaj, UdajTyp
 from core.exceptions import ExternalAPIError
+from core.services.cache import CacheService
+from justice.constants import (
+    SBIRKA_FETCH_WORKERS,
+    SBIRKA_LISTIN_CACHE_TTL,
+    SBIRKA_PARTIAL_CACHE_TTL,
+    SYNC_DEADLOCK_RETRIES,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -80,6 +97,61 @@ def test_get_entity_by_ico_found():
     assert "facts" in result
 
 
+def _create_fact_chain(entity, depth: int) -> None:
+    """A shareholder-style chain of `depth` nested facts, each with a person and address."""
+    parent = None
+    for level in range(depth):
+        fact = _create_fact(
+            entity,
+            header=f"level {level}",
+            fact_type_code="SPOLECNIK",
+            parent_fact=parent,
+        )
+        Person.objects.create(fact=fact, first_name=f"Person {level}", is_natural_person=True)
+        Address.objects.create(fact=fact, address_type="bydliste", municipality="Praha")
+        parent = fact
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("depth", [1, 3, 8])
+def test_get_entity_by_ico_query_count_independent_of_depth(depth, django_assert_num_queries):
+    """Facts, persons and addresses of any depth load in a fixed number of queries."""
+    entity = _create_entity(ico="12345678")
+    _create_fact_chain(entity, depth)
+
+    # document lookup (miss), entity, facts + persons, addresses, and the
+    # document INSERT inside a savepoint (3)
+    with django_assert_num_queries(7):
+        result = JusticeService().get_entity_by_ico("12345678")
+
+    fact = result["facts"][0]
+    for level in range(depth):
+        assert fact["header"] == f"level {level}"
+        assert fact["person"]["firstName"] == f"Person {level}"
+        assert fact["addresses"][0]["municipality"] == "Praha"
+        fact = fact["subFacts"][0] if level < depth - 1 else fact
+    assert fact["subFacts"] == []
+
+
+@pytest.mark.django_db
+def test_entity_endpoints_read_the_stored_document(django_assert_num_queries):
+    """Once rendered, detail/history/persons/addresses are one primary-key read each."""
+    entity = _create_entity(ico="12345678")
+    _create_fact_chain(entity, 3)
+    service = JusticeService()
+    detail = service.get_entity_by_ico("12345678")
+    cache.clear()
+
+    with django_assert_num_queries(1):
+        assert service.get_entity_by_ico("12345678") == detail
+    with django_assert_num_queries(1):
+        assert len(service.get_entity_history("12345678")) == 3
+    with django_assert_num_queries(1):
+        assert len(service.get_entity_persons("12345678")) == 3
+    with django_assert_num_queries(1):
+        assert len(service.get_entity_addresses("12345678")) == 3
+
+
 @pytest.mark.django_db
 def test_get_entity_by_ico_not_found():
     """No matching entity -> ExternalAPIError with status_code 404."""
@@ -139,6 +211,18 @@ def test_search_entities_by_name():
     assert "Beta Corp" in names
 
 
+@pytest.mark.django_db
+def test_search_entities_by_name_prefix():
+    """match=prefix only returns names starting with the query."""
+    _create_entity(ico="11111111", name="Alpha Corp", dataset_id="sro-actual-praha-2024")
+    _create_entity(ico="22222222", name="Beta Alpha", dataset_id="sro-actual-brno-2024")
+
+    service = JusticeService()
+    result = service.search_entities({"name": "alp", "match": "prefix", "status": "all"})
+
+    assert [e["name"] for e in result["entities"]] == ["Alpha Corp"]
+
+
 @pytest.mark.django_db
 def test_search_entities_pagination():
     """Offset and limit control which slice of results is returned."""
@@ -158,6 +242,59 @@ def test_search_entities_pagination():
     assert len(result["entities"]) == 2
 
 
+@pytest.mark.django_db
+@pytest.mark.usefixtures("serialized_cache")
+def test_search_entities_cursor_pagination():
+    """Following nextCursor walks all results in order, including name ties."""
+    for i, name in enumerate(["Delta", "Alpha", "Beta", "Beta", "Gamma"]):
+        _create_entity(ico=f"1000000{i}", name=name, dataset_id=f"sro-actual-praha-{2020 + i}")
+
+    service = JusticeService()
+    seen = []
+    cursor = None
+    while True:
+        params = {"status": "all", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        result = service.search_entities(params)
+        seen.extend((e["name"], e["ico"]) for e in result["entities"])
+        cursor = result["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == [
+        ("Alpha", "10000001"),
+        ("Beta", "10000002"),
+        ("Beta", "10000003"),
+        ("Delta", "10000000"),
+        ("Gamma", "10000004"),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("serialized_cache")
+def test_search_entities_offset_page_has_next_cursor():
+    """An offset page also returns a cursor continuing right after it."""
+    for i in range(5):
+        _create_entity(ico=f"1000000{i}", name=f"Company {i:02d}", dataset_id=f"sro-actual-praha-{2020 + i}")
+
+    service = JusticeService()
+    first = service.search_entities({"status": "all", "offset": 1, "limit": 2})
+    rest = service.search_entities({"status": "all", "limit": 10, "cursor": first["nextCursor"]})
+
+    assert [e["name"] for e in first["entities"]] == ["Company 01", "Company 02"]
+    assert [e["name"] for e in rest["entities"]] == ["Company 03", "Company 04"]
+    assert rest["nextCursor"] is None
+
+
+@pytest.mark.django_db
+def test_search_entities_invalid_cursor():
+    with pytest.raises(ExternalAPIError) as exc_info:
+        JusticeService().search_entities({"status": "all", "cursor": "not-a-cursor"})
+
+    assert exc_info.value.status_code == 400
+
+
 @pytest.mark.django_db
 def test_search_entities_active_filter():
     """status=active excludes inactive entities; status=deleted shows only deleted."""
@@ -491,7 +628,7 @@ def test_sync_dataset_skipped():
     assert result["entityCount"] == 100
     assert result["durationSeconds"] == 0
     # Verify no download occurred.
-    mock_client.download_file_stream.assert_not_called()
+    mock_client.download_file.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -500,13 +637,7 @@ class TestJusticeSyncCreatesCompany:
         """_upsert_entity creates a Company hub record and links the Entity."""
         sync_service = JusticeSyncService(client=MagicMock())
 
-        subjekt = {
-            "ico": "12345678",
-            "name": "Test s.r.o.",
-            "registration_date": "2020-01-15",
-            "deletion_date": None,
-            "facts": [],
-        }
+        subjekt = Subjekt(ico="12345678", name="Test s.r.o.", registration_date="2020-01-15")
         entity = sync_service._upsert_entity(subjekt, "sro-actual-praha-2024")
 
         assert entity is not None
@@ -520,11 +651,7 @@ class TestJusticeSyncCreatesCompany:
         company = Company.objects.create(ico="12345678", name="Old Name")
         sync_service = JusticeSyncService(client=MagicMock())
 
-        subjekt = {
-            "ico": "12345678",
-            "name": "New Name",
-            "facts": [],
-        }
+        subjekt = Subjekt(ico="12345678", name="New Name")
         entity = sync_service._upsert_entity(subjekt, "sro-actual-praha-2024")
 
         assert entity.company_id == company.id
@@ -537,19 +664,18 @@ class TestJusticeSyncPopulatesSearchFields:
         """Justice sync writes legal_form to Company if not already set."""
         sync_service = JusticeSyncService(client=MagicMock())
 
-        subjekt = {
-            "ico": "12345678",
-            "name": "Test s.r.o.",
-            "facts": [
-                {
-                    "header": "Právní forma",
-                    "fact_type": {"code": "PRAVNI_FORMA", "name": "Právní forma"},
-                    "value_text": "Společnost s ručením omezeným",
-                    "legal_form": {"code": "112", "name": "Společnost s ručením omezeným"},
-                    "sub_facts": [],
-                }
-            ],
-        }
+        subjekt = Subjekt(
+            ico="12345678",
+            name="Test s.r.o.",
+            facts=(
+                Udaj(
+                    header="Právní forma",
+                    fact_type=UdajTyp(code="PRAVNI_FORMA", name="Právní forma"),
+                    value_text="Společnost s ručením omezeným",
+                    legal_form=PravniForma(code="112", name="Společnost s ručením omezeným"),
+                ),
+            ),
+        )
         sync_service._upsert_entity(subjekt, "sro-actual-praha-2024")
 
         company = Company.objects.get(ico="12345678")
@@ -560,12 +686,783 @@ class TestJusticeSyncPopulatesSearchFields:
         Company.objects.create(ico="12345678", name="Test", legal_form="112")
 
         sync_service = JusticeSyncService(client=MagicMock())
-        subjekt = {
-            "ico": "12345678",
-            "name": "Test s.r.o.",
-            "facts": [],
-        }
+        subjekt = Subjekt(ico="12345678", name="Test s.r.o.")
         sync_service._upsert_entity(subjekt, "sro-actual-praha-2024")
 
         company = Company.objects.get(ico="12345678")
         assert company.legal_form == "112"  # Unchanged
+
+
+# ---------------------------------------------------------------------------
+# JusticeSyncService — batched ingestion
+# ---------------------------------------------------------------------------
+
+
+def _make_subjekt(ico: str, name: str = "Test s.r.o.") -> Subjekt:
+    """Parsed Subjekt with a nested officer (person + residence) and a seat."""
+    return Subjekt(
+        ico=ico,
+        name=name,
+        registration_date="2020-01-15",
+        facts=(
+            Udaj(
+                header="Sídlo",
+                fact_type=UdajTyp(code="SIDLO", name="Sídlo"),
+                address=Adresa(municipality="Praha", postal_code="11000"),
+            ),
+            Udaj(
+                header="Právní forma",
+                fact_type=UdajTyp(code="PRAVNI_FORMA", name="Právní forma"),
+                legal_form=PravniForma(code="112", name="s.r.o."),
+            ),
+            Udaj(
+                header="Statutární orgán",
+                fact_type=UdajTyp(code="STATUTARNI_ORGAN", name="Statutární orgán"),
+                sub_facts=(
+                    Udaj(
+                        header="Jednatel",
+                        fact_type=UdajTyp(code="STATUTARNI_ORGAN_CLEN", name="Člen"),
+                        person=Osoba(type="natural", first_name="Jan", last_name="Novák"),
+                        residence=Adresa(municipality="Brno"),
+                    ),
+                ),
+            ),
+        ),
+    )
+
+
+@pytest.mark.django_db
+class TestJusticeSyncBatchIngestion:
+    def test_ingest_batch_creates_full_tree(self):
+        """Every Subjekt in a batch gets its Entity, facts, persons and addresses."""
+        sync_service = JusticeSyncService(client=MagicMock())
+        subjekts = [_make_subjekt(f"1000000{i}", f"Firma {i}") for i in range(3)]
+
+        entities, row_count = sync_service._ingest_batch(subjekts, "sro-actual-praha-2024")
+
+        assert [e.ico for e in entities] == ["10000000", "10000001", "10000002"]
+        assert Company.objects.count() == 3
+        assert EntityFact.objects.count() == 12
+        assert Person.objects.count() == 3
+        assert Address.objects.count() == 6
+        assert row_count == 3 + 12 + 3 + 6
+
+        member = EntityFact.objects.get(entity=entities[1], fact_type_code="STATUTARNI_ORGAN_CLEN")
+        assert member.parent_fact.fact_type_code == "STATUTARNI_ORGAN"
+        assert member.parent_fact.entity_id == entities[1].pk
+        assert member.person.last_name == "Novák"
+        assert member.addresses.get().address_type == "residence"
+        assert Company.objects.get(ico="10000001").legal_form == "112"
+
+    def test_ingest_batch_query_count_is_constant(self, django_assert_num_queries):
+        """Round trips per batch do not grow with the number of Subjekts."""
+        sync_service = JusticeSyncService(client=MagicMock())
+
+        # Companies: INSERT, UPDATE legal_form, SELECT; then Entity INSERT,
+        # one EntityFact INSERT per depth (2), Person INSERT, Address INSERT;
+        # documents: SELECT latest entities, SELECT facts, SELECT addresses,
+        # upsert.
+        with django_assert_num_queries(12):
+            sync_service._ingest_batch([_make_subjekt("10000000")], "ds-1")
+        with django_assert_num_queries(12):
+            sync_service._ingest_batch(
+                [_make_subjekt(f"2{i:07d}") for i in range(12)], "ds-1"
+            )
+
+    def test_ingest_batch_skips_missing_ico_and_dedupes_companies(self):
+        """Subjekts without ICO are dropped; one Company per ICO across datasets."""
+        Company.objects.create(ico="10000000", name="Existing", legal_form="121")
+        sync_service = JusticeSyncService(client=MagicMock())
+
+        entities, _rows = sync_service._ingest_batch(
+            [_make_subjekt("10000000", "Renamed"), _make_subjekt("")], "ds-1"
+        )
+
+        assert len(entities) == 1
+        company = Company.objects.get(ico="10000000")
+        assert company.name == "Existing"
+        assert company.legal_form == "121"
+        assert entities[0].company_id == company.pk
+
+    @patch("justice.services.parse_xml_file")
+    def test_sync_dataset_flushes_in_batches(self, mock_parse):
+        """sync_dataset ingests in batch_size chunks and reports rows/sec."""
+        mock_parse.return_value = iter(
+            [_make_subjekt(f"1000000{i}") for i in range(5)]
+        )
+        mock_client = MagicMock()
+        mock_client.get_dataset.return_value = {
+            "resources": [{"url": "https://example.com/data.xml.gz", "format": "XML_GZ"}],
+        }
+        mock_client.download_file.return_value = {
+            "etag": '"abc"', "lastModified": "", "size": 5000,
+        }
+
+        sync_service = JusticeSyncService(client=mock_client, batch_size=2)
+        with patch.object(
+            sync_service, "_ingest_batch", wraps=sync_service._ingest_batch
+        ) as spy:
+            result = sync_service.sync_dataset("sro-actual-praha-2024")
+
+        assert [len(call.args[0]) for call in spy.call_args_list] == [2, 2, 1]
+        assert result["status"] == "completed"
+        assert result["entityCount"] == 5
+        assert result["rowCount"] == 5 * 8
+        assert result["rowsPerSecond"] > 0
+        assert Entity.objects.filter(dataset_id="sro-actual-praha-2024").count() == 5
+
+
+@pytest.mark.django_db
+class TestJusticeSyncCopyLoader:
+    def _fact_tree(self, entity):
+        """Comparable snapshot of an entity's facts, persons and addresses."""
+        return sorted(
+            (
+                f.fact_type_code,
+                f.parent_fact.fact_type_code if f.parent_fact_id else None,
+                f.person.last_name if hasattr(f, "person") else None,
+                tuple(sorted((a.address_type, a.municipality) for a in f.addresses.all())),
+                f.registration_date,
+            )
+            for f in EntityFact.objects.filter(entity=entity)
+        )
+
+    def test_copy_loader_matches_orm_loader(self):
+        """--loader=copy produces the same rows as the ORM path."""
+        orm_service = JusticeSyncService(client=MagicMock())
+        copy_service = JusticeSyncService(client=MagicMock(), loader="copy")
+        subjekt = _make_subjekt("10000000")
+        seat, legal_form, officers = subjekt.facts
+        subjekt = subjekt._replace(facts=(
+            seat._replace(registration_date="2020-01-15"),
+            legal_form._replace(value_data={"vklad": {"typ": "KORUNY"}}),
+            officers,
+        ))
+
+        (orm_entity,), orm_rows = orm_service._ingest_batch([subjekt], "ds-orm")
+        (copy_entity,), copy_rows = copy_service._ingest_batch([subjekt], "ds-copy")
+
+        assert copy_rows == orm_rows
+        assert self._fact_tree(copy_entity) == self._fact_tree(orm_entity)
+        assert EntityFact.objects.get(
+            entity=copy_entity, fact_type_code="PRAVNI_FORMA"
+        ).value_data == {"vklad": {"typ": "KORUNY"}}
+
+    @pytest.mark.skipif(not loaders.is_supported(), reason="COPY requires PostgreSQL")
+    def test_copy_loader_ids_follow_collect_order(self):
+        """Fact ids increase in DFS order, which sibling ordering relies on."""
+        copy_service = JusticeSyncService(client=MagicMock(), loader="copy")
+        subjekts = []
+        for i in range(3):
+            subjekt = _make_subjekt(f"1000000{i}")
+            seat, legal_form, officers = subjekt.facts
+            member = officers.sub_facts[0]
+            officers = officers._replace(sub_facts=tuple(
+                member._replace(header=f"Jednatel {n}") for n in range(3)
+            ))
+            subjekts.append(subjekt._replace(facts=(seat, officers, legal_form)))
+
+        def dfs(facts, parent=None):
+            for fact in facts:
+                yield fact.header, parent
+                yield from dfs(fact.sub_facts, fact.header)
+
+        copy_service._ingest_batch(subjekts, "ds-copy")
+
+        assert list(
+            EntityFact.objects.order_by("id").values_list("header", "parent_fact__header")
+        ) == [row for subjekt in subjekts for row in dfs(subjekt.facts)]
+
+    def test_copy_loader_falls_back_to_orm(self):
+        """Non-PostgreSQL backends silently use the ORM loader."""
+        with patch("justice.services.loaders.is_supported", return_value=False):
+            sync_service = JusticeSyncService(client=MagicMock(), loader="copy")
+        assert sync_service.loader == "orm"
+
+    @pytest.mark.skipif(not loaders.is_supported(), reason="COPY requires PostgreSQL")
+    def test_copy_loader_uses_copy_on_postgres(self):
+        """On PostgreSQL the batch is loaded through loaders.copy_facts."""
+        sync_service = JusticeSyncService(client=MagicMock(), loader="copy")
+        with patch(
+            "justice.services.loaders.copy_facts", wraps=loaders.copy_facts
+        ) as spy:
+            sync_service._ingest_batch([_make_subjekt("10000000")], "ds-1")
+        assert spy.call_count == 1
+        assert Person.objects.get().fact.parent_fact.fact_type_code == "STATUTARNI_ORGAN"
+
+
+@pytest.mark.django_db
+class TestJusticeSyncIncremental:
+    def _sync(self, subjekts, force=True, dataset_id="sro-actual-praha-2024"):
+        mock_client = MagicMock()
+        mock_client.get_dataset.return_value = {
+            "resources": [{"url": "https://example.com/data.xml.gz", "format": "XML_GZ"}],
+        }
+        mock_client.download_file.return_value = {
+            "etag": '"abc"', "lastModified": "", "size": 5000,
+        }
+        sync_service = JusticeSyncService(client=mock_client, batch_size=2)
+        with patch("justice.services.parse_xml_file", return_value=iter(subjekts)):
+            return sync_service.sync_dataset(dataset_id, force=force)
+
+    def test_resync_only_touches_changed_entities(self):
+        """Unchanged entities keep their rows; changed are replaced; gone are removed."""
+        first = self._sync([_make_subjekt(f"1000000{i}", f"Firma {i}") for i in range(3)])
+        assert first["insertedCount"] == 3
+        unchanged_pk = Entity.objects.get(ico="10000000").pk
+        unchanged_fact_pks = set(
+            EntityFact.objects.filter(entity_id=unchanged_pk).values_list("pk", flat=True)
+        )
+
+        second = self._sync([
+            _make_subjekt("10000000", "Firma 0"),
+            _make_subjekt("10000001", "Firma 1 renamed"),
+            _make_subjekt("10000003", "Firma 3"),
+        ])
+
+        assert second["status"] == "completed"
+        assert second["insertedCount"] == 1
+        assert second["updatedCount"] == 1
+        assert second["unchangedCount"] == 1
+        assert second["removedCount"] == 1
+        assert second["entityCount"] == 3
+
+        assert Entity.objects.get(ico="10000000").pk == unchanged_pk
+        assert set(
+            EntityFact.objects.filter(entity_id=unchanged_pk).values_list("pk", flat=True)
+        ) == unchanged_fact_pks
+        assert Entity.objects.get(ico="10000001").name == "Firma 1 renamed"
+        assert not Entity.objects.filter(ico="10000002").exists()
+        assert EntityFact.objects.count() == 3 * 4
+
+        ds = DatasetSync.objects.get(dataset_id="sro-actual-praha-2024")
+        assert (ds.inserted_count, ds.updated_count, ds.unchanged_count, ds.removed_count) == (
+            1, 1, 1, 1,
+        )
+
+    def test_repeated_ico_is_loaded_once(self):
+        """An ICO listed twice in a dataset yields one Entity and stable re-syncs."""
+        subjekts = [
+            _make_subjekt("10000000", "Firma 0"),
+            _make_subjekt("10000001", "Firma 1"),
+            _make_subjekt("10000000", "Firma 0 again"),
+        ]
+
+        first = self._sync(subjekts)
+        second = self._sync(subjekts)
+
+        assert first["insertedCount"] == 2
+        assert Entity.objects.filter(ico="10000000").get().name == "Firma 0"
+        assert (second["insertedCount"], second["updatedCount"], second["unchangedCount"]) == (
+            0, 0, 2,
+        )
+
+    def test_cache_error_does_not_fail_committed_sync(self):
+        """Invalidation runs after the commit; its failure is logged only."""
+        with patch("justice.services._invalidate_caches", side_effect=ConnectionError):
+            result = self._sync([_make_subjekt("10000000", "Firma 0")])
+
+        assert result["status"] == "completed"
+        assert DatasetSync.objects.get().status == "completed"
+        assert Entity.objects.count() == 1
+
+    def test_resync_regenerates_documents_of_changed_entities_only(self):
+        """Sync writes detail documents for new/changed entities; removed ones go away."""
+        self._sync([_make_subjekt(f"1000000{i}", f"Firma {i}") for i in range(3)])
+        before = {doc.ico: doc.updated_at for doc in EntityDocument.objects.all()}
+        assert set(before) == {"10000000", "10000001", "10000002"}
+
+        self._sync([
+            _make_subjekt("10000000", "Firma 0"),
+            _make_subjekt("10000001", "Firma 1 renamed"),
+            _make_subjekt("10000003", "Firma 3"),
+        ])
+
+        docs = {doc.ico: doc for doc in EntityDocument.objects.all()}
+        assert set(docs) == {"10000000", "10000001", "10000003"}
+        assert docs["10000000"].updated_at == before["10000000"]
+        assert docs["10000001"].document["detail"]["name"] == "Firma 1 renamed"
+        assert docs["10000001"].entity_id == Entity.objects.get(ico="10000001").pk
+
+    @pytest.mark.parametrize("order", [(0, 1), (1, 0)])
+    def test_document_follows_latest_entity_across_datasets(self, order):
+        """An ICO in two datasets is served from its most recently updated entity."""
+        datasets = [
+            ("sro-actual-praha-2024", "Firma current"),
+            ("sro-actual-brno-2024", "Firma moved"),
+        ]
+        for i in order:
+            dataset_id, name = datasets[i]
+            self._sync([_make_subjekt("10000000", name)], dataset_id=dataset_id)
+        latest = Entity.objects.filter(ico="10000000").order_by("-updated_at").first()
+
+        # Re-syncing the earlier dataset unchanged does not take the document back.
+        first_dataset, first_name = datasets[order[0]]
+        self._sync([_make_subjekt("10000000", first_name)], dataset_id=first_dataset)
+
+        document = EntityDocument.objects.get(ico="10000000")
+        assert document.entity_id == latest.pk
+        assert document.document["detail"]["name"] == datasets[order[1]][1]
+
+    def test_superseded_entity_does_not_overwrite_document(self):
+        """A batch whose entity was since replaced by a newer one keeps the newer document."""
+        self._sync([_make_subjekt("10000000", "Firma old")], dataset_id="sro-actual-praha-2024")
+        self._sync([_make_subjekt("10000000", "Firma new")], dataset_id="sro-actual-brno-2024")
+        old = Entity.objects.get(dataset_id="sro-actual-praha-2024")
+
+        write_documents([old])
+
+        document = EntityDocument.objects.get(ico="10000000")
+        assert document.document["detail"]["name"] == "Firma new"
+
+    def _sync_with_ingest_errors(self, errors):
+        """Sync one Subjekt, with the first loads failing with `errors`."""
+        sync_service = JusticeSyncService(client=MagicMock(), batch_size=2)
+        sync_service.client.get_dataset.return_value = {
+            "resources": [{"url": "https://example.com/data.xml.gz", "format": "XML_GZ"}],
+        }
+        sync_service.client.download_file.return_value = {
+            "etag": "", "lastModified": "", "size": 5000,
+        }
+        ingest = sync_service._ingest_dataset
+        errors = list(errors)
+
+        def flaky_ingest(*args):
+            if errors:
+                raise errors.pop(0)
+            return ingest(*args)
+
+        with (
+            patch("justice.services.parse_xml_file", side_effect=lambda path: iter(
+                [_make_subjekt("10000000")]
+            )),
+            patch.object(sync_service, "_ingest_dataset", side_effect=flaky_ingest),
+            patch("justice.services.time.sleep"),
+        ):
+            return sync_service.sync_dataset("sro-actual-praha-2024", force=True)
+
+    @staticmethod
+    def _db_error(sqlstate):
+        error = OperationalError("database error")
+        error.__cause__ = psycopg.errors.lookup(sqlstate)()
+        return error
+
+    def test_deadlocked_load_is_retried(self):
+        """A load aborted by a deadlock with another worker is re-parsed and re-run."""
+        result = self._sync_with_ingest_errors([self._db_error("40P01")])
+
+        assert result["status"] == "completed"
+        assert result["insertedCount"] == 1
+        assert Entity.objects.count() == 1
+
+    def test_deadlock_retries_are_bounded(self):
+        result = self._sync_with_ingest_errors(
+            [self._db_error("40P01")] * SYNC_DEADLOCK_RETRIES
+        )
+
+        assert result["status"] == "failed"
+        assert not Entity.objects.exists()
+
+    def test_other_database_errors_are_not_retried(self):
+        result = self._sync_with_ingest_errors([self._db_error("53100")])
+
+        assert result["status"] == "failed"
+        assert not Entity.objects.exists()
+
+    def test_entity_stores_content_hash(self):
+        """Each ingested Entity records the hash of its parsed Subjekt."""
+        self._sync([_make_subjekt("10000000")])
+        entity = Entity.objects.get(ico="10000000")
+        assert len(entity.content_hash) == 64
+
+    def test_content_hash_is_stable(self, sample_xml_bytes):
+        """
+        Hashes are computed over the plain-dict form of a record, so they match
+        what was stored before records replaced dicts (no spurious updates).
+        """
+        subjekt = next(parse_xml_bytes(sample_xml_bytes))
+        assert _content_hash(subjekt) == (
+            "a82c1c3511af22a0528c2892efd6e7e3074b1364c50020636feafe98cf0eb2d3"
+        )
+
+
+# ---------------------------------------------------------------------------
+# JusticeSyncService — parallel sync_all_actual
+# ---------------------------------------------------------------------------
+
+
+def _fake_sync_worker(dataset_id, force, batch_size, loader, from_spool, parse_workers):
+    """Stand-in for _sync_dataset_worker that runs inside the pool process."""
+    if dataset_id.startswith("as-"):
+        raise RuntimeError("boom")
+    return {
+        "datasetId": dataset_id,
+        "status": "completed",
+        "entityCount": batch_size,
+        "durationSeconds": 0,
+        "pid": os.getpid(),
+    }
+
+
+class TestJusticeSyncParallel:
+    def test_sync_all_actual_fans_out_to_processes(self):
+        """workers > 1 runs datasets in child processes, keeping result order."""
+        mock_client = MagicMock()
+        mock_client.list_datasets.return_value = [
+            "sro-actual-praha-2024",
+            "as-actual-brno-2024",
+            "sro-full-praha-2024",
+            "sro-actual-brno-2024",
+        ]
+        sync_service = JusticeSyncService(client=mock_client, batch_size=7)
+
+        with patch("justice.services._sync_dataset_worker", _fake_sync_worker):
+            results = sync_service.sync_all_actual(workers=2)
+
+        assert [r["datasetId"] for r in results] == [
+            "sro-actual-praha-2024",
+            "as-actual-brno-2024",
+            "sro-actual-brno-2024",
+        ]
+        assert [r["status"] for r in results] == ["completed", "failed", "completed"]
+        assert "boom" in results[1]["error"]
+        assert results[0]["entityCount"] == 7
+        assert results[0]["pid"] != os.getpid()
+
+    def test_sync_all_actual_single_worker_stays_in_process(self):
+        """The default of one worker keeps the sequential in-process loop."""
+        mock_client = MagicMock()
+        mock_client.list_datasets.return_value = ["sro-actual-praha-2024", "sro-actual-brno-2024"]
+        sync_service = JusticeSyncService(client=mock_client)
+
+        with patch.object(
+            sync_service, "sync_dataset", return_value={"status": "completed"}
+        ) as mock_sync, patch("justice.services.ProcessPoolExecutor") as mock_pool:
+            sync_service.sync_all_actual()
+
+        assert mock_sync.call_count == 2
+        mock_pool.assert_not_called()
+
+    @pytest.mark.parametrize("option", ["--workers", "--batch-size", "--parse-workers"])
+    @pytest.mark.parametrize("value", ["0", "-2", "x"])
+    def test_command_rejects_counts_below_one(self, option, value):
+        """Invalid counts fail before any dataset is touched."""
+        with (
+            patch("justice.management.commands.justice_sync.JusticeSyncService") as mock_cls,
+            pytest.raises(CommandError),
+        ):
+            call_command("justice_sync", option, value)
+
+        mock_cls.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestJusticeSyncChangeDetection:
+    def _completed_sync(self, **overrides):
+        defaults = {
+            "dataset_id": "sro-actual-praha-2024",
+            "legal_form": "sro",
+            "dataset_type": "actual",
+            "location": "praha",
+            "year": 2024,
+            "status": "completed",
+            "entity_count": 100,
+            "file_size": 5000,
+            "etag": '"v1"',
+            "last_modified": "Mon, 01 Jan 2026 00:00:00 GMT",
+            "resource_last_modified": "2026-01-01T00:00:00",
+            "resource_hash": "",
+        }
+        defaults.update(overrides)
+        return DatasetSync.objects.create(**defaults)
+
+    def _client(self, last_modified="2026-01-01T00:00:00"):
+        mock_client = MagicMock()
+        mock_client.get_dataset.return_value = {
+            "resources": [{
+                "url": "https://example.com/data.xml.gz",
+                "format": "XML_GZ",
+                "last_modified": last_modified,
+            }],
+        }
+        mock_client.get_file_size.return_value = 5000
+        return mock_client
+
+    def test_skips_when_resource_metadata_unchanged(self):
+        """Unchanged CKAN last_modified skips without HEAD or download."""
+        self._completed_sync(file_size=1)
+        mock_client = self._client()
+
+        result = JusticeSyncService(client=mock_client).sync_dataset("sro-actual-praha-2024")
+
+        assert result["status"] == "skipped"
+        mock_client.get_file_size.assert_not_called()
+        mock_client.download_file.assert_not_called()
+
+    def test_changed_resource_metadata_downloads_even_if_size_matches(self):
+        """A new CKAN last_modified triggers a conditional download."""
+        self._completed_sync()
+        mock_client = self._client(last_modified="2026-02-01T00:00:00")
+        mock_client.download_file.return_value = None
+
+        result = JusticeSyncService(client=mock_client).sync_dataset("sro-actual-praha-2024")
+
+        assert result["status"] == "skipped"
+        kwargs = mock_client.download_file.call_args.kwargs
+        assert kwargs["etag"] == '"v1"'
+        assert kwargs["last_modified"] == "Mon, 01 Jan 2026 00:00:00 GMT"
+        ds = DatasetSync.objects.get(dataset_id="sro-actual-praha-2024")
+        assert ds.status == "completed"
+        assert ds.resource_last_modified == "2026-02-01T00:00:00"
+
+    def test_force_sends_no_validators_and_stores_new_ones(self):
+        """--force downloads unconditionally and records the new validators."""
+        self._completed_sync()
+        mock_client = self._client()
+
+        def download_file(filename, dest_path, etag="", last_modified=""):
+            with open(dest_path, "wb") as f:
+                f.write(b"x" * 6000)
+            return {
+                "etag": '"v2"', "lastModified": "Tue, 02 Jan 2026 00:00:00 GMT", "size": 6000,
+            }
+
+        mock_client.download_file.side_effect = download_file
+
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            result = JusticeSyncService(client=mock_client).sync_dataset(
+                "sro-actual-praha-2024", force=True
+            )
+
+        assert result["status"] == "completed"
+        kwargs = mock_client.download_file.call_args.kwargs
+        assert kwargs["etag"] == ""
+        assert kwargs["last_modified"] == ""
+        ds = DatasetSync.objects.get(dataset_id="sro-actual-praha-2024")
+        assert (ds.etag, ds.file_size) == ('"v2"', 6000)
+
+
+# ---------------------------------------------------------------------------
+# JusticeSyncService — spool
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+class TestJusticeSyncSpool:
+    def _client(self, last_modified="2026-01-01T00:00:00"):
+        mock_client = MagicMock()
+        mock_client.get_dataset.return_value = {
+            "resources": [{
+                "url": "https://example.com/data.xml.gz",
+                "format": "XML_GZ",
+                "last_modified": last_modified,
+            }],
+        }
+
+        def download_file(filename, dest_path, etag="", last_modified=""):
+            with open(dest_path, "wb") as f:
+                f.write(b"payload")
+            return {"etag": '"v1"', "lastModified": "", "size": 7}
+
+        mock_client.download_file.side_effect = download_file
+        return mock_client
+
+    def test_download_is_spooled(self):
+        """A synced file stays in the spool with its resource metadata."""
+        mock_client = self._client()
+        sync_service = JusticeSyncService(client=mock_client)
+
+        with patch("justice.services.parse_xml_file", return_value=iter([])) as parse:
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        spooled = sync_service.spool.get("sro-actual-praha-2024")
+        assert spooled["resourceLastModified"] == "2026-01-01T00:00:00"
+        parse.assert_called_once_with(spooled["path"])
+
+    def test_force_resync_reparses_spool_without_download(self):
+        """--force on an unchanged resource re-parses the spooled copy."""
+        mock_client = self._client()
+        sync_service = JusticeSyncService(client=mock_client)
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        with patch("justice.services.parse_xml_file", return_value=iter([])) as parse:
+            result = sync_service.sync_dataset("sro-actual-praha-2024", force=True)
+
+        assert result["status"] == "completed"
+        assert mock_client.download_file.call_count == 1
+        parse.assert_called_once()
+
+    def test_force_resync_with_changed_resource_downloads(self):
+        """A changed resource is downloaded, conditional on the spooled copy."""
+        sync_service = JusticeSyncService(client=self._client())
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        mock_client = self._client(last_modified="2026-02-01T00:00:00")
+        sync_service.client = mock_client
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            sync_service.sync_dataset("sro-actual-praha-2024", force=True)
+
+        assert mock_client.download_file.call_args.kwargs["etag"] == '"v1"'
+
+    def test_completed_sync_invalidates_search_counts(self):
+        """Search counts cached before a sync are not served after it."""
+        _create_entity(ico="11111111", dataset_id="other-dataset")
+        service = JusticeService()
+        assert service.search_entities({"status": "all", "limit": 1})["totalCount"] == 1
+
+        sync_service = JusticeSyncService(client=self._client())
+        with patch(
+            "justice.services.parse_xml_file", return_value=iter([_make_subjekt("22222222")])
+        ):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        assert service.search_entities({"status": "all", "limit": 2})["totalCount"] == 2
+
+    def test_completed_sync_invalidates_changed_details_only(self):
+        """Cached details of synced ICOs are dropped; others stay cached."""
+        for ico in ("10000000", "10000001"):
+            _create_entity(ico=ico, dataset_id="other-dataset")
+        service = JusticeService()
+        service.get_entity_by_ico("10000000")
+        service.get_entity_by_ico("10000001")
+
+        sync_service = JusticeSyncService(client=self._client())
+        with patch(
+            "justice.services.parse_xml_file", return_value=iter([_make_subjekt("10000000")])
+        ):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        assert service.cache.get("entity", "10000000") is None
+        assert service.cache.get("entity", "10000001") is not None
+        assert service.cache.invalidation_counts("entity", "search", "count") == {
+            "entity": 1, "search": 1, "count": 1,
+        }
+
+    def test_unchanged_sync_keeps_caches(self):
+        """A sync that changes no entity invalidates nothing."""
+        sync_service = JusticeSyncService(client=self._client())
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        assert JusticeService().cache.invalidation_counts("search") == {"search": 0}
+
+    def test_from_spool_needs_no_network(self):
+        """--from-spool re-parses the spooled file without touching the client."""
+        sync_service = JusticeSyncService(client=self._client())
+        with patch("justice.services.parse_xml_file", return_value=iter([])):
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        offline_client = MagicMock()
+        sync_service.client = offline_client
+        with patch(
+            "justice.services.parse_xml_file", return_value=iter([_make_subjekt("10000000")])
+        ):
+            results = sync_service.sync_all_actual(from_spool=True)
+
+        assert [r["status"] for r in results] == ["completed"]
+        assert results[0]["insertedCount"] == 1
+        assert offline_client.mock_calls == []
+
+    def test_from_spool_missing_file_fails(self):
+        result = JusticeSyncService(client=MagicMock()).sync_dataset(
+            "sro-actual-praha-2024", from_spool=True
+        )
+
+        assert result["status"] == "failed"
+
+    def test_parse_workers_use_parallel_parser(self):
+        """parse_workers > 1 parses the spooled file in worker processes."""
+        sync_service = JusticeSyncService(client=self._client(), parse_workers=3)
+
+        with patch(
+            "justice.services.parse_xml_file_parallel", return_value=iter([])
+        ) as parse:
+            sync_service.sync_dataset("sro-actual-praha-2024")
+
+        path = sync_service.spool.get("sro-actual-praha-2024")["path"]
+        parse.assert_called_once_with(path, 3)
+
+
+@pytest.mark.django_db
+class TestEntityDocumentsScraping:
+    """get_entity_documents fetches document pages concurrently."""
+
+    def _client(self, count, fail_details=(), fail_xml=(), delay=0.0):
+        import threading
+        import time as time_module
+
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def track():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time_module.sleep(delay)
+            with lock:
+                state["active"] -= 1
+
+        def get_document_files(document_id, subjekt_id, spis_id):
+            track()
+            if document_id in fail_details:
+                raise ExternalAPIError("detail failed", service_name="justice")
+            return [{
+                "downloadId": f"x{document_id}", "filename": f"{document_id}.xml",
+                "isXml": True, "isPdf": False,
+            }]
+
+        def download_file(download_id):
+            track()
+            if download_id[1:] in fail_xml:
+                raise ExternalAPIError("download failed", service_name="justice")
+            return b"<Other/>", "application/xml", "f.xml"
+
+        client = MagicMock()
+        client.get_subjekt_id.return_value = "555"
+        client.get_document_list.return_value = [
+            {"documentId": str(i), "subjektId": "555", "spisId": "9"} for i in range(count)
+        ]
+        client.get_document_files.side_effect = get_document_files
+        client.download_file.side_effect = download_file
+        return client, state
+
+    def test_documents_keep_their_order(self):
+        client, state = self._client(12, delay=0.02)
+
+        with patch("justice.services.justice_sbirka_client", client):
+            result = JusticeService().get_entity_documents("12345678")
+
+        assert [d["documentId"] for d in result["documents"]] == [str(i) for i in range(12)]
+        assert all(d["files"] for d in result["documents"])
+        assert result["incomplete"] is False
+        assert 1 < state["peak"] <= SBIRKA_FETCH_WORKERS
+
+    def test_failed_fetches_return_partial_results(self):
+        client, _ = self._client(4, fail_details={"1"}, fail_xml={"2"})
+
+        with patch("justice.services.justice_sbirka_client", client), \
+                patch.object(CacheService, "_store", autospec=True) as store:
+            result = JusticeService().get_entity_documents("12345678")
+
+        assert result["incomplete"] is True
+        assert [bool(d["files"]) for d in result["documents"]] == [True, False, True, True]
+        assert store.call_args.args[3] == SBIRKA_PARTIAL_CACHE_TTL
+
+    def test_complete_results_are_cached_for_full_ttl(self):
+        client, _ = self._client(2)
+
+        with patch("justice.services.justice_sbirka_client", client), \
+                patch.object(CacheService, "_store", autospec=True) as store:
+            JusticeService().get_entity_documents("12345678")
+
+        assert store.call_args.args[3] == SBIRKA_LISTIN_CACHE_TTL
+
+    def test_no_documents(self):
+        client, _ = self._client(0)
+
+        with patch("justice.services.justice_sbirka_client", client):
+            result = JusticeService().get_entity_documents("12345678")
+
+        assert result == {"subjektId": "555", "incomplete": False, "documents": []}
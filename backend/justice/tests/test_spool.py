@@ -0,0 +1,66 @@
+"""
+Tests for the on-disk dataset spool.
+"""
+import os
+
+from justice.spool import DatasetSpool
+
+
+def _store(spool, dataset_id, content, **metadata):
+    tmp_path = spool.reserve(dataset_id)
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    return spool.commit(dataset_id, tmp_path, metadata)
+
+
+class TestDatasetSpool:
+    def test_commit_and_get(self, tmp_path):
+        """A committed download is retrievable with its validators."""
+        spool = DatasetSpool(tmp_path, max_bytes=1000)
+
+        entry = _store(spool, "sro-actual-praha-2024", b"data", etag='"v1"')
+
+        assert spool.get("sro-actual-praha-2024") == entry
+        assert entry["size"] == 4
+        assert entry["etag"] == '"v1"'
+        with open(entry["path"], "rb") as f:
+            assert f.read() == b"data"
+        assert os.listdir(spool.tmp_dir) == []
+
+    def test_unknown_dataset(self, tmp_path):
+        assert DatasetSpool(tmp_path, max_bytes=1000).get("missing") is None
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        """Objects are content-addressed; two datasets can share one file."""
+        spool = DatasetSpool(tmp_path, max_bytes=1000)
+
+        a = _store(spool, "a-actual-praha-2024", b"same")
+        b = _store(spool, "b-actual-praha-2024", b"same")
+
+        assert a["path"] == b["path"]
+        assert len(os.listdir(spool.objects_dir)) == 1
+        assert spool.dataset_ids() == ["a-actual-praha-2024", "b-actual-praha-2024"]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Once over max_bytes, the least recently used object goes first."""
+        spool = DatasetSpool(tmp_path, max_bytes=25)
+        old = _store(spool, "old", b"x" * 10)
+        used = _store(spool, "used", b"y" * 10)
+        os.utime(old["path"], (1, 1))
+        os.utime(used["path"], (2, 2))
+        spool.get("used")  # bumps "used" to now
+
+        _store(spool, "new", b"z" * 10)
+
+        assert spool.get("old") is None
+        assert spool.get("used") is not None
+        assert spool.get("new") is not None
+        assert spool.dataset_ids() == ["new", "used"]
+
+    def test_never_evicts_the_file_just_written(self, tmp_path):
+        """A file larger than the whole budget is still kept for parsing."""
+        spool = DatasetSpool(tmp_path, max_bytes=5)
+
+        entry = _store(spool, "big", b"x" * 10)
+
+        assert os.path.exists(entry["path"])
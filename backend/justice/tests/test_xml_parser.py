@@ -1,6 +1,37 @@
 import gzip
-
-from justice.parsers.xml_parser import parse_xml_bytes, parse_xml_stream
+import io
+import tracemalloc
+import zlib
+
+from justice.parsers.records import UdajTyp
+from justice.parsers.xml_parser import (
+    parse_xml_bytes,
+    parse_xml_file,
+    parse_xml_file_parallel,
+    split_subjekt_chunks,
+)
+
+
+def _write_synthetic_gzip(path, subjekt_count: int, payload_size: int) -> None:
+    """
+    Write a gzip file of `subjekt_count` Subjekts generated on the fly.
+
+    The payload compresses to almost nothing, so the file decompresses to as
+    much XML as a real nationwide dataset while staying small on disk and
+    never existing in memory as a whole.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    payload = "x" * payload_size
+    with open(path, "wb") as f:
+        f.write(compressor.compress(b"<xml>"))
+        for i in range(subjekt_count):
+            record = (
+                f"<Subjekt><nazev>Firma {i}</nazev><ico>{i:08d}</ico>"
+                f"<udaje><Udaj><hlavicka>Ostatni</hlavicka>"
+                f"<hodnotaText>{payload}</hodnotaText></Udaj></udaje></Subjekt>"
+            ).encode()
+            f.write(compressor.compress(record))
+        f.write(compressor.compress(b"</xml>") + compressor.flush())
 
 
 class TestParseSingleSubjekt:
@@ -8,10 +39,10 @@ class TestParseSingleSubjekt:
         """Parse basic Subjekt with name, ico, dates."""
         results = list(parse_xml_bytes(sample_xml_bytes))
         first = results[0]
-        assert first["name"] == "Test Company s.r.o."
-        assert first["ico"] == "12345678"
-        assert first["registration_date"] == "2020-01-15"
-        assert first["deletion_date"] == ""
+        assert first.name == "Test Company s.r.o."
+        assert first.ico == "12345678"
+        assert first.registration_date == "2020-01-15"
+        assert first.deletion_date == ""
 
 
 class TestParseMultipleSubjekts:
@@ -19,32 +50,32 @@ class TestParseMultipleSubjekts:
         """Parse XML with 2 Subjekts and verify both are yielded."""
         results = list(parse_xml_bytes(sample_xml_bytes))
         assert len(results) == 2
-        assert results[0]["name"] == "Test Company s.r.o."
-        assert results[0]["ico"] == "12345678"
-        assert results[1]["name"] == "Deleted Corp s.r.o."
-        assert results[1]["ico"] == "99887766"
+        assert results[0].name == "Test Company s.r.o."
+        assert results[0].ico == "12345678"
+        assert results[1].name == "Deleted Corp s.r.o."
+        assert results[1].ico == "99887766"
 
 
 class TestParseAddress:
     def test_parse_address(self, sample_xml_bytes):
         """Verify address fields are extracted correctly from the Sídlo udaj."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        sidlo_fact = results[0]["facts"][0]
-        assert sidlo_fact["fact_type"]["code"] == "SIDLO"
-        address = sidlo_fact["address"]
+        sidlo_fact = results[0].facts[0]
+        assert sidlo_fact.fact_type.code == "SIDLO"
+        address = sidlo_fact.address
         assert address is not None
-        assert address["country"] == "Česká republika"
-        assert address["municipality"] == "Praha"
-        assert address["street"] == "Vodičkova"
-        assert address["house_number"] == "123"
-        assert address["postal_code"] == "11000"
-        assert address["city_part"] == ""
-        assert address["orientation_number"] == ""
-        assert address["evidence_number"] == ""
-        assert address["number_text"] == ""
-        assert address["district"] == ""
-        assert address["full_address"] == ""
-        assert address["supplementary_text"] == ""
+        assert address.country == "Česká republika"
+        assert address.municipality == "Praha"
+        assert address.street == "Vodičkova"
+        assert address.house_number == "123"
+        assert address.postal_code == "11000"
+        assert address.city_part == ""
+        assert address.orientation_number == ""
+        assert address.evidence_number == ""
+        assert address.number_text == ""
+        assert address.district == ""
+        assert address.full_address == ""
+        assert address.supplementary_text == ""
 
 
 class TestParseNaturalPerson:
@@ -52,88 +83,88 @@ class TestParseNaturalPerson:
         """Natural person with jmeno, prijmeni, narozDatum, titulPred."""
         results = list(parse_xml_bytes(sample_xml_bytes))
         # The natural person is inside Statutární orgán -> podudaje -> Jednatel
-        statutarni_fact = results[0]["facts"][3]
-        assert statutarni_fact["header"] == "Statutární orgán"
-        jednatel = statutarni_fact["sub_facts"][0]
-        person = jednatel["person"]
+        statutarni_fact = results[0].facts[3]
+        assert statutarni_fact.header == "Statutární orgán"
+        jednatel = statutarni_fact.sub_facts[0]
+        person = jednatel.person
         assert person is not None
-        assert person["type"] == "natural"
-        assert person["first_name"] == "Jan"
-        assert person["last_name"] == "Novák"
-        assert person["birth_date"] == "1985-03-15"
-        assert person["title_before"] == "Ing."
-        assert person["title_after"] == ""
-        assert person["person_text"] == ""
+        assert person.type == "natural"
+        assert person.first_name == "Jan"
+        assert person.last_name == "Novák"
+        assert person.birth_date == "1985-03-15"
+        assert person.title_before == "Ing."
+        assert person.title_after == ""
+        assert person.person_text == ""
 
 
 class TestParseLegalPerson:
     def test_parse_legal_person(self, sample_xml_bytes):
         """Legal person with nazev, ico, regCislo."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        spolecnik_fact = results[0]["facts"][4]
-        assert spolecnik_fact["header"] == "Společník"
-        person = spolecnik_fact["person"]
+        spolecnik_fact = results[0].facts[4]
+        assert spolecnik_fact.header == "Společník"
+        person = spolecnik_fact.person
         assert person is not None
-        assert person["type"] == "legal"
-        assert person["entity_name"] == "Holding Corp a.s."
-        assert person["ico"] == "87654321"
-        assert person["reg_number"] == "REG123"
-        assert person["euid"] == ""
-        assert person["person_text"] == ""
+        assert person.type == "legal"
+        assert person.entity_name == "Holding Corp a.s."
+        assert person.ico == "87654321"
+        assert person.reg_number == "REG123"
+        assert person.euid == ""
+        assert person.person_text == ""
 
 
 class TestParseFileReference:
     def test_parse_file_reference(self, sample_xml_bytes):
         """spisZn with soud (kod, nazev), oddil, vlozka."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        spis_fact = results[0]["facts"][2]
-        assert spis_fact["fact_type"]["code"] == "SPIS_ZN"
-        file_ref = spis_fact["file_reference"]
+        spis_fact = results[0].facts[2]
+        assert spis_fact.fact_type.code == "SPIS_ZN"
+        file_ref = spis_fact.file_reference
         assert file_ref is not None
-        assert file_ref["court_code"] == "MSPH"
-        assert file_ref["court_name"] == "Městský soud v Praze"
-        assert file_ref["section"] == "C"
-        assert file_ref["insert"] == "231666"
+        assert file_ref.court_code == "MSPH"
+        assert file_ref.court_name == "Městský soud v Praze"
+        assert file_ref.section == "C"
+        assert file_ref.insert == "231666"
 
 
 class TestParseLegalForm:
     def test_parse_legal_form(self, sample_xml_bytes):
         """pravniForma with kod, nazev, zkratka."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        pravni_forma_fact = results[0]["facts"][1]
-        assert pravni_forma_fact["fact_type"]["code"] == "PRAVNI_FORMA"
-        legal_form = pravni_forma_fact["legal_form"]
+        pravni_forma_fact = results[0].facts[1]
+        assert pravni_forma_fact.fact_type.code == "PRAVNI_FORMA"
+        legal_form = pravni_forma_fact.legal_form
         assert legal_form is not None
-        assert legal_form["code"] == "112"
-        assert legal_form["name"] == "Společnost s ručením omezeným"
-        assert legal_form["abbreviation"] == "s.r.o."
+        assert legal_form.code == "112"
+        assert legal_form.name == "Společnost s ručením omezeným"
+        assert legal_form.abbreviation == "s.r.o."
 
 
 class TestParseSubFacts:
     def test_parse_sub_facts(self, sample_xml_bytes):
         """Nested podudaje/Udaj recursion — Statutární orgán contains Jednatel."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        statutarni_fact = results[0]["facts"][3]
-        assert statutarni_fact["header"] == "Statutární orgán"
-        assert len(statutarni_fact["sub_facts"]) == 1
-
-        jednatel = statutarni_fact["sub_facts"][0]
-        assert jednatel["header"] == "Jednatel"
-        assert jednatel["function_name"] == "jednatel"
-        assert jednatel["fact_type"]["code"] == "STATUTARNI_ORGAN_CLEN"
-        assert jednatel["person"] is not None
-        assert jednatel["person"]["last_name"] == "Novák"
+        statutarni_fact = results[0].facts[3]
+        assert statutarni_fact.header == "Statutární orgán"
+        assert len(statutarni_fact.sub_facts) == 1
+
+        jednatel = statutarni_fact.sub_facts[0]
+        assert jednatel.header == "Jednatel"
+        assert jednatel.function_name == "jednatel"
+        assert jednatel.fact_type.code == "STATUTARNI_ORGAN_CLEN"
+        assert jednatel.person is not None
+        assert jednatel.person.last_name == "Novák"
         # Sub-facts of the sub-fact should be an empty list
-        assert jednatel["sub_facts"] == []
+        assert jednatel.sub_facts == ()
 
 
 class TestParseHodnotaUdaje:
     def test_parse_hodnota_udaje(self, sample_xml_bytes):
         """Nested value data with child elements (vklad, souhrn)."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        spolecnik_fact = results[0]["facts"][4]
-        assert spolecnik_fact["header"] == "Společník"
-        value_data = spolecnik_fact["value_data"]
+        spolecnik_fact = results[0].facts[4]
+        assert spolecnik_fact.header == "Společník"
+        value_data = spolecnik_fact.value_data
         assert value_data is not None
         assert "vklad" in value_data
         assert value_data["vklad"]["typ"] == "KORUNY"
@@ -147,17 +178,17 @@ class TestParseResidence:
     def test_parse_residence(self, sample_xml_bytes):
         """bydliste address extraction on the Jednatel sub-fact."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        statutarni_fact = results[0]["facts"][3]
-        jednatel = statutarni_fact["sub_facts"][0]
-        residence = jednatel["residence"]
+        statutarni_fact = results[0].facts[3]
+        jednatel = statutarni_fact.sub_facts[0]
+        residence = jednatel.residence
         assert residence is not None
-        assert residence["municipality"] == "Praha"
-        assert residence["street"] == "Národní"
-        assert residence["postal_code"] == "11000"
+        assert residence.municipality == "Praha"
+        assert residence.street == "Národní"
+        assert residence.postal_code == "11000"
         # Fields not present in XML should be empty strings
-        assert residence["country"] == ""
-        assert residence["house_number"] == ""
-        assert residence["city_part"] == ""
+        assert residence.country == ""
+        assert residence.house_number == ""
+        assert residence.city_part == ""
 
 
 class TestParseDeletionDate:
@@ -165,12 +196,12 @@ class TestParseDeletionDate:
         """Entity with vymazDatum on both Subjekt and Udaj level."""
         results = list(parse_xml_bytes(sample_xml_bytes))
         deleted = results[1]
-        assert deleted["name"] == "Deleted Corp s.r.o."
-        assert deleted["deletion_date"] == "2023-12-01"
-        assert deleted["registration_date"] == "2010-05-20"
+        assert deleted.name == "Deleted Corp s.r.o."
+        assert deleted.deletion_date == "2023-12-01"
+        assert deleted.registration_date == "2010-05-20"
         # The Sídlo fact also has a deletion date
-        sidlo_fact = deleted["facts"][0]
-        assert sidlo_fact["deletion_date"] == "2023-12-01"
+        sidlo_fact = deleted.facts[0]
+        assert sidlo_fact.deletion_date == "2023-12-01"
 
 
 class TestParseEmptyFields:
@@ -179,80 +210,111 @@ class TestParseEmptyFields:
         results = list(parse_xml_bytes(sample_xml_bytes))
         first = results[0]
         # deletion_date is missing on the first Subjekt
-        assert first["deletion_date"] == ""
+        assert first.deletion_date == ""
 
         # Sídlo fact has no person, no legal_form, no file_reference, no residence
-        sidlo_fact = first["facts"][0]
-        assert sidlo_fact["person"] is None
-        assert sidlo_fact["legal_form"] is None
-        assert sidlo_fact["file_reference"] is None
-        assert sidlo_fact["residence"] is None
-        assert sidlo_fact["value_text"] == ""
-        assert sidlo_fact["value_data"] is None
-        assert sidlo_fact["membership_from"] == ""
-        assert sidlo_fact["membership_to"] == ""
-        assert sidlo_fact["function_from"] == ""
-        assert sidlo_fact["function_to"] == ""
-        assert sidlo_fact["function_name"] == ""
-        assert sidlo_fact["sub_facts"] == []
+        sidlo_fact = first.facts[0]
+        assert sidlo_fact.person is None
+        assert sidlo_fact.legal_form is None
+        assert sidlo_fact.file_reference is None
+        assert sidlo_fact.residence is None
+        assert sidlo_fact.value_text == ""
+        assert sidlo_fact.value_data is None
+        assert sidlo_fact.membership_from == ""
+        assert sidlo_fact.membership_to == ""
+        assert sidlo_fact.function_from == ""
+        assert sidlo_fact.function_to == ""
+        assert sidlo_fact.function_name == ""
+        assert sidlo_fact.sub_facts == ()
 
 
 class TestParseFunctionDates:
     def test_parse_function_dates(self, sample_xml_bytes):
         """funkceOd, funkceDo, clenstviOd, clenstviDo extraction."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        statutarni_fact = results[0]["facts"][3]
-        jednatel = statutarni_fact["sub_facts"][0]
-        assert jednatel["function_from"] == "2020-01-01"
+        statutarni_fact = results[0].facts[3]
+        jednatel = statutarni_fact.sub_facts[0]
+        assert jednatel.function_from == "2020-01-01"
         # funkceDo is not in the XML, so it should be empty
-        assert jednatel["function_to"] == ""
+        assert jednatel.function_to == ""
         # clenstviOd / clenstviDo are not in the XML
-        assert jednatel["membership_from"] == ""
-        assert jednatel["membership_to"] == ""
+        assert jednatel.membership_from == ""
+        assert jednatel.membership_to == ""
 
 
-class TestParseGzippedStream:
-    def test_parse_gzipped_stream(self, sample_xml_bytes):
-        """Gzip compressed XML via parse_xml_stream."""
-        compressed = gzip.compress(sample_xml_bytes)
-        # parse_xml_stream expects an iterator of bytes chunks
-        chunks = [compressed[i : i + 64] for i in range(0, len(compressed), 64)]
-        results = list(parse_xml_stream(iter(chunks)))
+class TestParseGzippedFile:
+    def test_parse_gzipped_file(self, sample_xml_bytes, tmp_path):
+        """Gzip compressed XML via parse_xml_file."""
+        path = tmp_path / "dataset.xml.gz"
+        path.write_bytes(gzip.compress(sample_xml_bytes))
+        results = list(parse_xml_file(str(path)))
         assert len(results) == 2
-        assert results[0]["name"] == "Test Company s.r.o."
-        assert results[0]["ico"] == "12345678"
-        assert results[1]["name"] == "Deleted Corp s.r.o."
-        assert results[1]["ico"] == "99887766"
+        assert results[0].name == "Test Company s.r.o."
+        assert results[0].ico == "12345678"
+        assert results[1].name == "Deleted Corp s.r.o."
+        assert results[1].ico == "99887766"
+
+    def test_parse_gzipped_file_multi_member(self, sample_xml_bytes, tmp_path):
+        """Concatenated gzip members are decompressed as one document."""
+        half = len(sample_xml_bytes) // 2
+        path = tmp_path / "dataset.xml.gz"
+        path.write_bytes(
+            gzip.compress(sample_xml_bytes[:half]) + gzip.compress(sample_xml_bytes[half:])
+        )
+        results = list(parse_xml_file(str(path)))
+        assert [r.ico for r in results] == ["12345678", "99887766"]
+
+    def test_parse_large_file_memory_bounded(self, tmp_path):
+        """A ~200 MB (decompressed) file parses with flat memory instead of buffering it."""
+        subjekt_count = 2000
+        payload_size = 100_000
+        path = tmp_path / "dataset.xml.gz"
+        _write_synthetic_gzip(path, subjekt_count, payload_size)
+
+        tracemalloc.start()
+        try:
+            count = 0
+            for subjekt in parse_xml_file(str(path)):
+                count += 1
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == subjekt_count
+        assert subjekt.ico == f"{subjekt_count - 1:08d}"
+        assert len(subjekt.facts[0].value_text) == payload_size
+        # The decompressed XML is ~200 MB; only a few records may be live at once.
+        assert peak < 16 * 1024 * 1024
 
     def test_parse_gzipped_bytes(self, sample_xml_bytes):
         """Gzip compressed XML via parse_xml_bytes with is_gzipped=True."""
         compressed = gzip.compress(sample_xml_bytes)
         results = list(parse_xml_bytes(compressed, is_gzipped=True))
         assert len(results) == 2
-        assert results[0]["name"] == "Test Company s.r.o."
-        assert results[1]["name"] == "Deleted Corp s.r.o."
+        assert results[0].name == "Test Company s.r.o."
+        assert results[1].name == "Deleted Corp s.r.o."
 
 
 class TestParseUdajTyp:
     def test_parse_udaj_typ(self, sample_xml_bytes):
         """udajTyp with kod and nazev on each fact."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        facts = results[0]["facts"]
+        facts = results[0].facts
 
-        assert facts[0]["fact_type"] == {"code": "SIDLO", "name": "Sídlo"}
-        assert facts[1]["fact_type"] == {"code": "PRAVNI_FORMA", "name": "Právní forma"}
-        assert facts[2]["fact_type"] == {"code": "SPIS_ZN", "name": "Spisová značka"}
-        assert facts[3]["fact_type"] == {"code": "STATUTARNI_ORGAN", "name": "Statutární orgán"}
-        assert facts[4]["fact_type"] == {"code": "SPOLECNIK_OSOBA", "name": "Společník"}
+        assert facts[0].fact_type == UdajTyp(code="SIDLO", name="Sídlo")
+        assert facts[1].fact_type == UdajTyp(code="PRAVNI_FORMA", name="Právní forma")
+        assert facts[2].fact_type == UdajTyp(code="SPIS_ZN", name="Spisová značka")
+        assert facts[3].fact_type == UdajTyp(code="STATUTARNI_ORGAN", name="Statutární orgán")
+        assert facts[4].fact_type == UdajTyp(code="SPOLECNIK_OSOBA", name="Společník")
 
     def test_parse_udaj_typ_on_sub_fact(self, sample_xml_bytes):
         """udajTyp is also parsed on nested sub-facts."""
         results = list(parse_xml_bytes(sample_xml_bytes))
-        jednatel = results[0]["facts"][3]["sub_facts"][0]
-        assert jednatel["fact_type"] == {
-            "code": "STATUTARNI_ORGAN_CLEN",
-            "name": "Člen statutárního orgánu",
-        }
+        jednatel = results[0].facts[3].sub_facts[0]
+        assert jednatel.fact_type == UdajTyp(
+            code="STATUTARNI_ORGAN_CLEN",
+            name="Člen statutárního orgánu",
+        )
 
 
 class TestParseEmptyXml:
@@ -267,3 +329,52 @@ class TestParseEmptyXml:
         xml = b"<xml>   \n   </xml>"
         results = list(parse_xml_bytes(xml))
         assert results == []
+
+
+class TestParallelParsing:
+    def _write_dataset(self, tmp_path, subjekt_count=50):
+        path = tmp_path / "dataset.xml.gz"
+        _write_synthetic_gzip(path, subjekt_count, payload_size=10)
+        return str(path)
+
+    def test_split_keeps_declaration_and_whole_subjekts(self, sample_xml_bytes):
+        """Every slice is a standalone document of complete Subjekts."""
+        # Two copies of the two-Subjekt sample under one root.
+        xml = (
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            + sample_xml_bytes.removesuffix(b"</xml>")
+            + sample_xml_bytes.removeprefix(b"<xml>")
+        )
+
+        chunks = list(split_subjekt_chunks(io.BytesIO(xml), records_per_chunk=3))
+
+        assert [chunk.count(b"</Subjekt>") for chunk in chunks] == [3, 1]
+        for chunk in chunks:
+            assert chunk.startswith(b'<?xml version="1.0" encoding="UTF-8"?><xml>')
+            assert chunk.endswith(b"</Subjekt></xml>")
+        parsed = [s for chunk in chunks for s in parse_xml_bytes(chunk)]
+        assert parsed == list(parse_xml_bytes(xml))
+
+    def test_split_handles_tags_cut_across_reads(self, sample_xml_bytes, monkeypatch):
+        """End tags straddling read boundaries are neither lost nor double-counted."""
+        monkeypatch.setattr("justice.parsers.xml_parser._SPLIT_READ_SIZE", 7)
+
+        chunks = list(split_subjekt_chunks(io.BytesIO(sample_xml_bytes), records_per_chunk=1))
+
+        assert len(chunks) == 2
+        assert [s.ico for c in chunks for s in parse_xml_bytes(c)] == ["12345678", "99887766"]
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Worker processes yield the same records, in file order."""
+        path = self._write_dataset(tmp_path)
+
+        parallel = list(parse_xml_file_parallel(path, workers=2, records_per_chunk=7))
+
+        assert parallel == list(parse_xml_file(path))
+        assert [s.ico for s in parallel] == [f"{i:08d}" for i in range(50)]
+
+    def test_parallel_empty_file(self, tmp_path):
+        path = tmp_path / "empty.xml.gz"
+        path.write_bytes(gzip.compress(b"<xml></xml>"))
+
+        assert list(parse_xml_file_parallel(str(path), workers=2)) == []
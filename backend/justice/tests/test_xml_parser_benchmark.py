@@ -0,0 +1,94 @@
+"""
+Parser micro-benchmarks.
+
+Single-pass child lookup vs. per-tag find(): the reference mode swaps the
+one-pass child map used by the parser for a lookup that calls elem.find()
+per tag, which is how the parser worked before. Both modes must produce
+identical output; the single-pass mode must be faster on a real-sized
+record set (timed only with RUN_BENCHMARKS=1, see .benchmark).
+
+Record memory: a sync batch held as NamedTuple records vs. the nested dicts
+the parser used to yield (their as_dict() form).
+"""
+import tracemalloc
+from unittest.mock import patch
+
+from lxml import etree
+
+from justice.parsers import xml_parser
+
+from .benchmark import benchmark, best_time
+from .conftest import SAMPLE_SUBJEKT_XML
+
+
+class _FindLookup:
+    """Child lookup that rescans the element on every access, like find()."""
+
+    def __init__(self, elem):
+        self._elem = elem
+
+    def get(self, tag):
+        return self._elem.find(tag)
+
+    def __contains__(self, tag):
+        return self._elem.find(tag) is not None
+
+
+def _real_sized_document(copies: int = 500) -> etree._Element:
+    """The two conftest Subjekts repeated, with every Udaj fully populated."""
+    padding = "".join(
+        f"<{tag}>x</{tag}>"
+        for tag in (
+            "vymazDatum", "hodnotaText", "clenstviOd", "clenstviDo",
+            "funkceOd", "funkceDo", "funkce",
+        )
+    )
+    body = SAMPLE_SUBJEKT_XML.removeprefix("<xml>").removesuffix("</xml>")
+    body = body.replace("</Udaj>", f"{padding}</Udaj>")
+    return etree.fromstring(f"<xml>{body * copies}</xml>".encode())
+
+
+def _parse_all(root) -> list[dict]:
+    return [xml_parser._parse_subjekt(s) for s in root.iterfind("Subjekt")]
+
+
+def test_single_pass_matches_find():
+    root = _real_sized_document(copies=50)
+
+    single_pass = _parse_all(root)
+    with patch.object(xml_parser, "_children", _FindLookup):
+        per_tag_find = _parse_all(root)
+
+    assert single_pass == per_tag_find
+
+
+@benchmark
+def test_single_pass_is_faster_than_find():
+    root = _real_sized_document()
+
+    single_pass_time = best_time(lambda: _parse_all(root))
+    with patch.object(xml_parser, "_children", _FindLookup):
+        per_tag_find_time = best_time(lambda: _parse_all(root))
+
+    assert single_pass_time < per_tag_find_time
+
+
+def _retained_bytes(build) -> int:
+    """Bytes still allocated after build() returns, i.e. held by its result."""
+    tracemalloc.start()
+    try:
+        result = build()
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def test_records_use_less_memory_than_dicts():
+    root = _real_sized_document(copies=250)  # one 500-Subjekt sync batch
+
+    records_bytes = _retained_bytes(lambda: _parse_all(root))
+    dicts_bytes = _retained_bytes(lambda: [s.as_dict() for s in _parse_all(root)])
+
+    assert records_bytes < dicts_bytes
@@ -1,7 +1,12 @@
 """
 Justice API endpoints. Thin handlers: validate -> service -> serialize -> respond.
 """
-from django.http import HttpResponse
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
 from django.utils.decorators import method_decorator
 from django.views.decorators.clickjacking import xframe_options_exempt
 from drf_spectacular.utils import OpenApiParameter, extend_schema
@@ -9,6 +14,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .client import justice_sbirka_client
+from .document_cache import DocumentCache
 from .serializers import (
     AddressSerializer,
     DatasetInfoSerializer,
@@ -23,6 +29,9 @@ from .serializers import (
 )
 from .services import JusticeService
 
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_RANGE_CHUNK_SIZE = 64 * 1024
+
 
 class EntityLookupView(APIView):
     @extend_schema(
@@ -62,6 +71,22 @@ class EntitySearchView(APIView):
         ),
         parameters=[
             OpenApiParameter(name="name", description="Entity name (partial match)", required=False, type=str),
+            OpenApiParameter(
+                name="match",
+                description=(
+                    "Name matching: contains (default), prefix, or similar "
+                    "(trigram similarity, best matches first)"
+                ),
+                required=False,
+                type=str,
+                enum=["contains", "prefix", "similar"],
+            ),
+            OpenApiParameter(
+                name="unaccent",
+                description="Ignore diacritics in name matching (skoda finds Škoda)",
+                required=False,
+                type=bool,
+            ),
             OpenApiParameter(name="legalForm", description="Legal form code (e.g. 112 = s.r.o.)", required=False, type=str),
             OpenApiParameter(name="location", description="Court or location filter", required=False, type=str),
             OpenApiParameter(
@@ -73,6 +98,15 @@ class EntitySearchView(APIView):
             ),
             OpenApiParameter(name="offset", description="Pagination offset (default: 0)", required=False, type=int),
             OpenApiParameter(name="limit", description="Page size, 1-100 (default: 20)", required=False, type=int),
+            OpenApiParameter(
+                name="cursor",
+                description=(
+                    "Keyset pagination: pass nextCursor from the previous page to "
+                    "fetch the next one (offset is then ignored)"
+                ),
+                required=False,
+                type=str,
+            ),
         ],
         responses={200: JusticeSearchResultSerializer},
     )
@@ -169,7 +203,8 @@ class EntityDocumentsView(APIView):
         description=(
             "Retrieve the list of documents from Sbírka listin (Collection of Deeds) "
             "for a Justice entity. Includes financial statements with parsed data "
-            "when available. Data is scraped from or.justice.cz."
+            "when available. Data is scraped from or.justice.cz. If some document "
+            "pages could not be fetched, the rest are returned with incomplete: true."
         ),
         responses={200: DocumentListSerializer},
     )
@@ -188,25 +223,137 @@ class DocumentProxyView(APIView):
         description=(
             "Proxy download of a PDF or XML document from or.justice.cz. "
             "Required because the justice.cz server needs session cookies "
-            "that browsers can't set cross-origin."
+            "that browsers can't set cross-origin. Files are cached on disk "
+            "after the first download and served from there; single byte "
+            "ranges (Range/If-Range) and conditional requests (ETag, "
+            "Last-Modified) are supported."
         ),
         responses={
             (200, "application/pdf"): bytes,
             (200, "application/xml"): bytes,
+            (206, "application/pdf"): bytes,
+            400: {"type": "object", "properties": {"error": {"type": "string"}}},
             502: {"type": "object", "properties": {"error": {"type": "string"}}},
         },
     )
     def get(self, request, download_id):
-        client = justice_sbirka_client
-
-        try:
-            content, content_type, filename = client.download_file(download_id)
-        except Exception:
-            return Response(
-                {"error": "Failed to download document"},
-                status=502,
-            )
-
-        response = HttpResponse(content, content_type=content_type)
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
+        document_cache = DocumentCache()
+        if not document_cache.is_valid_id(download_id):
+            return Response({"error": "Invalid download id"}, status=400)
+
+        opened = _open_cached(document_cache, download_id)
+        if opened is None:
+            tmp_path = document_cache.reserve()
+            try:
+                content_type, filename = justice_sbirka_client.download_to_file(
+                    download_id, tmp_path
+                )
+            except Exception:
+                os.remove(tmp_path)
+                return Response(
+                    {"error": "Failed to download document"},
+                    status=502,
+                )
+            document_cache.commit(download_id, tmp_path, content_type, filename)
+            opened = _open_cached(document_cache, download_id)
+            if opened is None:
+                return Response({"error": "Failed to download document"}, status=502)
+
+        entry, file = opened
+        return _file_response(request, entry, file)
+
+
+def _open_cached(document_cache: DocumentCache, download_id: str):
+    """(entry, open file) for a cached document, or None on a miss."""
+    entry = document_cache.get(download_id)
+    if entry is None:
+        return None
+    try:
+        # Once open, the file stays readable even if it is evicted meanwhile.
+        return entry, open(entry["path"], "rb")
+    except FileNotFoundError:
+        return None
+
+
+def _file_response(request, entry: dict, file):
+    """Full, partial (206), 304/412 or 416 response for a cached document."""
+    size = entry["size"]
+    etag = f'"{entry["sha256"]}"'
+    last_modified = entry["cachedAt"]
+
+    def with_headers(response):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Accept-Ranges"] = "bytes"
+        response["Cache-Control"] = "private, max-age=86400"
         return response
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        file.close()
+        return with_headers(conditional)
+
+    byte_range = _requested_range(request, etag, last_modified, size)
+    if byte_range == "unsatisfiable":
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return with_headers(response)
+
+    if byte_range is None:
+        response = FileResponse(file, content_type=entry["contentType"])
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(file, start, end - start + 1),
+            status=206,
+            content_type=entry["contentType"],
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Disposition"] = content_disposition_header(False, entry["filename"])
+    return with_headers(response)
+
+
+def _requested_range(request, etag: str, last_modified: int, size: int):
+    """
+    (start, end) of a single satisfiable byte range, "unsatisfiable", or None
+    to send the whole file (no Range, a stale If-Range, or a Range we don't
+    serve, such as multiple ranges).
+    """
+    header = request.META.get("HTTP_RANGE", "")
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    elif last:
+        start, end = max(size - int(last), 0), size - 1
+        if int(last) == 0:
+            return "unsatisfiable"
+    else:
+        return None
+    if start >= size:
+        return "unsatisfiable"
+    return start, end
+
+
+def _read_range(file, start: int, length: int):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(_RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()